@@ -33,6 +33,10 @@ from .cup_pattern import (
     detect_cup_and_breakout,
     get_cup_signal_for_scoring,
 )
+from .kernels import (
+    NUMBA_AVAILABLE, acc_dist_index, average_true_range, cci_last, divergence_code, divide_rows, ema_bank,
+    ewm_last, last_emas, macd_last, on_balance_volume, range_potential, true_range, wilder_rsi,
+)
 
 __all__ = [
     'get_cme_direction_for_symbol',
@@ -62,4 +66,18 @@ __all__ = [
     'detect_complex_bottoming_structure',
     'detect_cup_and_breakout',
     'get_cup_signal_for_scoring',
+    'NUMBA_AVAILABLE',
+    'acc_dist_index',
+    'average_true_range',
+    'cci_last',
+    'divergence_code',
+    'divide_rows',
+    'ema_bank',
+    'ewm_last',
+    'last_emas',
+    'macd_last',
+    'on_balance_volume',
+    'range_potential',
+    'true_range',
+    'wilder_rsi',
 ]
@@ -69,13 +69,13 @@ def calculate_moving_averages_ta(close):
         ema200 = close.ewm(span=200, adjust=False).mean()
         result["ema200"] = round(ema200.iloc[-1], 4)
     
+    # Last SMA value is the mean of the trailing window (NaN if the window has a gap, like rolling)
+    close_arr = close.to_numpy(dtype=np.float64)
     if len(close) >= 50:
-        sma50 = close.rolling(window=50).mean()
-        result["sma50"] = round(sma50.iloc[-1], 4)
+        result["sma50"] = round(float(close_arr[-50:].mean()), 4)
     
     if len(close) >= 200:
-        sma200 = close.rolling(window=200).mean()
-        result["sma200"] = round(sma200.iloc[-1], 4)
+        result["sma200"] = round(float(close_arr[-200:].mean()), 4)
     
     return result
 
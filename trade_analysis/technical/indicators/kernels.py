@@ -0,0 +1,400 @@
+"""
+Compiled indicator kernels
+Single-pass loops over NumPy arrays for the hot paths in technical_analysis.py.
+Compiled with numba when it is installed; otherwise the same code runs as plain Python
+(ema_bank switches to a NumPy-vectorized variant instead). The volume indicators
+(on_balance_volume, acc_dist_index) and cci_last are plain vectorized NumPy.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit: returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+@njit
+def macd_last(close, fast=12, slow=26, signal=9):
+    """
+    Last MACD line, signal line and histogram in one pass over close.
+
+    Matches ta.trend.MACD: EMAs are seeded on the first close (adjust=False),
+    the signal EMA starts on the first bar where the slow EMA is defined, and
+    the signal is NaN until it has `signal` observations.
+
+    Returns:
+        (macd, signal, histogram) as floats
+    """
+    n = close.shape[0]
+    if n < slow:
+        return np.nan, np.nan, np.nan
+    a_fast = 2.0 / (fast + 1.0)
+    a_slow = 2.0 / (slow + 1.0)
+    a_sig = 2.0 / (signal + 1.0)
+    ema_fast = close[0]
+    ema_slow = close[0]
+    macd = ema_fast - ema_slow
+    sig = np.nan
+    for i in range(1, n):
+        x = close[i]
+        ema_fast += a_fast * (x - ema_fast)
+        ema_slow += a_slow * (x - ema_slow)
+        macd = ema_fast - ema_slow
+        if i == slow - 1:
+            sig = macd
+        elif i > slow - 1:
+            sig += a_sig * (macd - sig)
+    if n < slow + signal - 1:
+        sig = np.nan
+    return macd, sig, macd - sig
+
+
+@njit
+def range_potential(high, low, close, lookback):
+    """
+    52-week style range figures over the last `lookback` bars in one pass.
+
+    Returns:
+        (recent_high, recent_low, upside_pct, downside_pct, price_position)
+        upside/downside are 0 when price is at or beyond the extreme; position
+        is 0-100 within the range, 50 when the range is flat.
+    """
+    n = close.shape[0]
+    start = n - lookback
+    recent_high = high[start]
+    recent_low = low[start]
+    for i in range(start + 1, n):
+        if high[i] > recent_high:
+            recent_high = high[i]
+        if low[i] < recent_low:
+            recent_low = low[i]
+    price = close[n - 1]
+    upside = (recent_high / price - 1.0) * 100.0 if recent_high > price else 0.0
+    downside = (price / recent_low - 1.0) * 100.0 if recent_low < price else 0.0
+    if recent_high > recent_low:
+        position = (price - recent_low) / (recent_high - recent_low) * 100.0
+    else:
+        position = 50.0
+    return recent_high, recent_low, upside, downside, position
+
+
+def _ema_bank_loop(close, periods):
+    """
+    EMAs for several periods in one pass over close, one lane per period.
+
+    Matches close.ewm(span=p, adjust=False).mean() for NaN-free input: every
+    lane is seeded on the first close.
+
+    Returns:
+        float64 array of shape (len(close), len(periods))
+    """
+    n = close.shape[0]
+    k = periods.shape[0]
+    out = np.empty((n, k))
+    if n == 0:
+        return out
+    alphas = np.empty(k)
+    ema = np.empty(k)
+    for j in range(k):
+        alphas[j] = 2.0 / (periods[j] + 1.0)
+        ema[j] = close[0]
+        out[0, j] = close[0]
+    for i in range(1, n):
+        x = close[i]
+        for j in range(k):
+            ema[j] += alphas[j] * (x - ema[j])
+            out[i, j] = ema[j]
+    return out
+
+
+def _ema_bank_numpy(close, periods):
+    """
+    ema_bank without numba: the per-bar update is one vector op across all lanes,
+    so the interpreter steps once per bar instead of once per bar and period.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    alphas = 2.0 / (np.asarray(periods, dtype=np.float64) + 1.0)
+    out = np.empty((close.shape[0], alphas.shape[0]))
+    if close.shape[0] == 0:
+        return out
+    ema = np.full(alphas.shape[0], close[0])
+    out[0] = ema
+    for i in range(1, close.shape[0]):
+        ema += alphas * (close[i] - ema)
+        out[i] = ema
+    return out
+
+
+ema_bank = njit(_ema_bank_loop) if NUMBA_AVAILABLE else _ema_bank_numpy
+
+
+@njit
+def divide_rows(values, divisor):
+    """
+    values[i, k] / divisor[i] for a 2-D block (e.g. OHLC over a reference close),
+    written into one preallocated array in a single pass.
+    """
+    n, k = values.shape
+    out = np.empty((n, k))
+    for i in range(n):
+        d = divisor[i]
+        for j in range(k):
+            out[i, j] = values[i, j] / d
+    return out
+
+
+@njit
+def last_emas(close, periods):
+    """
+    Final value of a TradingView-style EMA for each period, one pass per lane.
+
+    Matches tradingview_indicators.ema for NaN-free input: each EMA is seeded
+    with the SMA of its first `p` closes and then recursed, so lanes longer
+    than close are NaN. Nothing but the last value is kept.
+
+    Returns:
+        float64 array of len(periods)
+    """
+    n = close.shape[0]
+    k = periods.shape[0]
+    out = np.empty(k)
+    for j in range(k):
+        p = int(periods[j])
+        if n < p:
+            out[j] = np.nan
+            continue
+        alpha = 2.0 / (p + 1.0)
+        s = 0.0
+        for i in range(p):
+            s += close[i]
+        s /= p
+        for i in range(p, n):
+            s = (1.0 - alpha) * s + alpha * close[i]
+        out[j] = s
+    return out
+
+
+@njit
+def ewm_last(close, periods):
+    """
+    Final value of close.ewm(span=p, adjust=False).mean() for each period, one pass
+    over close for all lanes.
+
+    Follows the pandas recurrence step for step (alpha from the span via com, NaN
+    bars keep decaying the old weight) so the results match it exactly.
+
+    Returns:
+        float64 array of len(periods), NaN where close has no observations
+    """
+    n = close.shape[0]
+    k = periods.shape[0]
+    alphas = np.empty(k)
+    weighted = np.full(k, np.nan)
+    old_wt = np.ones(k)
+    for j in range(k):
+        alphas[j] = 1.0 / (1.0 + (periods[j] - 1.0) / 2.0)
+    for i in range(n):
+        x = close[i]
+        is_obs = not np.isnan(x)
+        for j in range(k):
+            w = weighted[j]
+            if np.isnan(w):
+                if is_obs:
+                    weighted[j] = x
+                continue
+            old_wt[j] *= 1.0 - alphas[j]
+            if is_obs:
+                if w != x:
+                    weighted[j] = (old_wt[j] * w + alphas[j] * x) / (old_wt[j] + alphas[j])
+                old_wt[j] = 1.0
+    return weighted
+
+
+@njit
+def divergence_code(price, osc):
+    """
+    Divergence between price and an oscillator (RSI, MACD line) over equal-length windows.
+
+    Pivots are bars strictly above (peak) or below (trough) both neighbours on each
+    side; only the last two pivots of each kind matter. Bearish (price higher high,
+    oscillator lower high) wins over bullish (price lower low, oscillator higher low).
+
+    Returns:
+        1 for bearish divergence, -1 for bullish divergence, 0 for none
+    """
+    n = price.shape[0]
+    # [previous, latest] pivot value and pivot count per series
+    pp = np.empty(2)
+    pt = np.empty(2)
+    op = np.empty(2)
+    ot = np.empty(2)
+    n_pp = n_pt = n_op = n_ot = 0
+    for i in range(2, n - 2):
+        x = price[i]
+        if x > price[i - 1] and x > price[i - 2] and x > price[i + 1] and x > price[i + 2]:
+            pp[0] = pp[1]
+            pp[1] = x
+            n_pp += 1
+        if x < price[i - 1] and x < price[i - 2] and x < price[i + 1] and x < price[i + 2]:
+            pt[0] = pt[1]
+            pt[1] = x
+            n_pt += 1
+        y = osc[i]
+        if y > osc[i - 1] and y > osc[i - 2] and y > osc[i + 1] and y > osc[i + 2]:
+            op[0] = op[1]
+            op[1] = y
+            n_op += 1
+        if y < osc[i - 1] and y < osc[i - 2] and y < osc[i + 1] and y < osc[i + 2]:
+            ot[0] = ot[1]
+            ot[1] = y
+            n_ot += 1
+    if n_pp >= 2 and n_op >= 2 and pp[1] > pp[0] and op[1] < op[0]:
+        return 1
+    if n_pt >= 2 and n_ot >= 2 and pt[1] < pt[0] and ot[1] > ot[0]:
+        return -1
+    return 0
+
+
+def true_range(high, low, close):
+    """
+    True range per bar over NumPy arrays: the largest of high - low and the gaps from the
+    previous close. fmax skips the missing previous close on the first bar (and any NaN
+    leg), like pd.concat([...], axis=1).max(axis=1).
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    prev_close = np.empty_like(close)
+    prev_close[:1] = np.nan
+    prev_close[1:] = close[:-1]
+    return np.fmax.reduce([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+
+
+@njit
+def wilder_rsi(close, window=14):
+    """
+    RSI series over a NumPy close array, matching ta.momentum.RSIIndicator.
+
+    Gains and losses come from close-to-close differences (0 where the difference is
+    undefined) and are smoothed with Wilder's EMA (alpha = 1/window, adjust=False,
+    same update order as pandas ewm). NaN until `window` bars, 100 when there are
+    no losses.
+    """
+    n = close.shape[0]
+    out = np.empty(n)
+    alpha = 1.0 / window
+    old_wt = 1.0 - alpha
+    avg_up = 0.0
+    avg_down = 0.0
+    for i in range(n):
+        up = 0.0
+        down = 0.0
+        if i > 0:
+            d = close[i] - close[i - 1]
+            if d > 0:
+                up = d
+            elif d < 0:
+                down = -d
+            if avg_up != up:
+                avg_up = (old_wt * avg_up + alpha * up) / (old_wt + alpha)
+            if avg_down != down:
+                avg_down = (old_wt * avg_down + alpha * down) / (old_wt + alpha)
+        if i < window - 1:
+            out[i] = np.nan
+        elif avg_down == 0:
+            out[i] = 100.0
+        else:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_up / avg_down)
+    return out
+
+
+@njit
+def _wilder_smooth(values, seed, window):
+    """Wilder's running average seeded at bar window - 1; earlier bars are 0."""
+    n = values.shape[0]
+    out = np.zeros(n)
+    out[window - 1] = seed
+    for i in range(window, n):
+        out[i] = (out[i - 1] * (window - 1) + values[i]) / window
+    return out
+
+
+def average_true_range(high, low, close, window=14):
+    """
+    ATR series over NumPy arrays, matching ta.volatility.AverageTrueRange: the first
+    `window` true ranges are averaged (NaN skipped) and then Wilder-smoothed. Bars before
+    the seed are 0; shorter inputs give all zeros.
+    """
+    tr = true_range(high, low, close)
+    if tr.shape[0] < window:
+        return np.zeros(tr.shape[0])
+    head = tr[:window]
+    count = np.count_nonzero(~np.isnan(head))
+    seed = np.nansum(head) / count if count else np.nan
+    return _wilder_smooth(tr, seed, window)
+
+
+def cci_last(high, low, close, window=20, constant=0.015):
+    """
+    Last Commodity Channel Index value over NumPy arrays, matching
+    ta.trend.CCIIndicator: typical price against its `window` mean, scaled by the
+    mean absolute deviation. Only the final window is touched; NaN when it is short
+    or has gaps.
+    """
+    high = np.asarray(high[-window:], dtype=np.float64)
+    low = np.asarray(low[-window:], dtype=np.float64)
+    close = np.asarray(close[-window:], dtype=np.float64)
+    typical = (high + low + close) / 3.0
+    if typical.shape[0] < window or np.isnan(typical).any():
+        return np.nan
+    mean = typical.mean()
+    mad = np.abs(typical - mean).mean()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return float((typical[-1] - mean) / (constant * mad))
+
+
+def _cumsum_skipna(values):
+    """Series.cumsum(): NaN entries stay NaN and do not reset or poison the running total."""
+    if values.dtype.kind != "f":
+        return np.cumsum(values)
+    out = np.nancumsum(values)
+    out[np.isnan(values)] = np.nan
+    return out
+
+
+def on_balance_volume(close, volume):
+    """
+    On-Balance Volume over NumPy arrays, matching ta.volume.OnBalanceVolumeIndicator:
+    volume is subtracted on bars that close below the previous close and added otherwise
+    (including the first bar and unchanged closes). Integer volume gives integer OBV.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume)
+    if volume.dtype.kind == "u":
+        volume = volume.astype(np.int64)  # negation must not wrap
+    down = np.zeros(close.shape[0], dtype=np.bool_)
+    down[1:] = close[1:] < close[:-1]
+    return _cumsum_skipna(np.where(down, -volume, volume))
+
+
+def acc_dist_index(high, low, close, volume):
+    """
+    Accumulation/Distribution index over NumPy arrays, matching
+    ta.volume.AccDistIndexIndicator: the close location value is 0 on bars where it is
+    undefined (high == low).
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        clv = ((close - low) - (high - close)) / (high - low)
+    clv[np.isnan(clv)] = 0.0
+    return _cumsum_skipna(clv * np.asarray(volume))
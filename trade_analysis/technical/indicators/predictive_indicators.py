@@ -3,9 +3,23 @@ Predictive Technical Indicators
 Functions to detect early signals before big moves
 """
 
+from typing import NamedTuple, Optional
+
 import pandas as pd
 import numpy as np
 
+try:
+    from .kernels import divergence_code
+except ImportError:
+    from kernels import divergence_code
+
+_DIVERGENCE_LABELS = {1: 'bearish_divergence', -1: 'bullish_divergence', 0: None}
+
+
+def _tail(values, lookback):
+    """Last `lookback` values as a float64 array (positional, whatever the index)."""
+    return np.asarray(values, dtype=np.float64)[-lookback:]
+
 
 def detect_rsi_divergence(close, rsi_values, lookback=20):
     """
@@ -19,69 +33,8 @@ def detect_rsi_divergence(close, rsi_values, lookback=20):
     if len(close) < lookback or len(rsi_values) < lookback:
         return None
     
-    # Get recent price and RSI peaks/troughs
-    recent_close = close[-lookback:]
-    recent_rsi = rsi_values[-lookback:]
-    
-    # Find peaks (local maxima) and troughs (local minima)
-    # Simple approach: compare with neighbors
-    price_peaks = []
-    price_troughs = []
-    rsi_peaks = []
-    rsi_troughs = []
-    
-    for i in range(2, len(recent_close) - 2):
-        # Price peak
-        if (recent_close.iloc[i] > recent_close.iloc[i-1] and 
-            recent_close.iloc[i] > recent_close.iloc[i-2] and
-            recent_close.iloc[i] > recent_close.iloc[i+1] and
-            recent_close.iloc[i] > recent_close.iloc[i+2]):
-            price_peaks.append((i, recent_close.iloc[i]))
-        
-        # Price trough
-        if (recent_close.iloc[i] < recent_close.iloc[i-1] and 
-            recent_close.iloc[i] < recent_close.iloc[i-2] and
-            recent_close.iloc[i] < recent_close.iloc[i+1] and
-            recent_close.iloc[i] < recent_close.iloc[i+2]):
-            price_troughs.append((i, recent_close.iloc[i]))
-        
-        # RSI peak
-        if (recent_rsi.iloc[i] > recent_rsi.iloc[i-1] and 
-            recent_rsi.iloc[i] > recent_rsi.iloc[i-2] and
-            recent_rsi.iloc[i] > recent_rsi.iloc[i+1] and
-            recent_rsi.iloc[i] > recent_rsi.iloc[i+2]):
-            rsi_peaks.append((i, recent_rsi.iloc[i]))
-        
-        # RSI trough
-        if (recent_rsi.iloc[i] < recent_rsi.iloc[i-1] and 
-            recent_rsi.iloc[i] < recent_rsi.iloc[i-2] and
-            recent_rsi.iloc[i] < recent_rsi.iloc[i+1] and
-            recent_rsi.iloc[i] < recent_rsi.iloc[i+2]):
-            rsi_troughs.append((i, recent_rsi.iloc[i]))
-    
-    # Check for bearish divergence (price higher high, RSI lower high)
-    if len(price_peaks) >= 2 and len(rsi_peaks) >= 2:
-        latest_price_peak = price_peaks[-1][1]
-        prev_price_peak = price_peaks[-2][1]
-        latest_rsi_peak = rsi_peaks[-1][1]
-        prev_rsi_peak = rsi_peaks[-2][1]
-        
-        if (latest_price_peak > prev_price_peak and 
-            latest_rsi_peak < prev_rsi_peak):
-            return 'bearish_divergence'
-    
-    # Check for bullish divergence (price lower low, RSI higher low)
-    if len(price_troughs) >= 2 and len(rsi_troughs) >= 2:
-        latest_price_trough = price_troughs[-1][1]
-        prev_price_trough = price_troughs[-2][1]
-        latest_rsi_trough = rsi_troughs[-1][1]
-        prev_rsi_trough = rsi_troughs[-2][1]
-        
-        if (latest_price_trough < prev_price_trough and 
-            latest_rsi_trough > prev_rsi_trough):
-            return 'bullish_divergence'
-    
-    return None
+    code = divergence_code(_tail(close, lookback), _tail(rsi_values, lookback))
+    return _DIVERGENCE_LABELS[code]
 
 
 def detect_macd_divergence(close, macd_line, lookback=20):
@@ -96,96 +49,43 @@ def detect_macd_divergence(close, macd_line, lookback=20):
     if len(close) < lookback or len(macd_line) < lookback:
         return None
     
-    recent_close = close[-lookback:]
-    recent_macd = macd_line[-lookback:]
-    
-    # Find peaks and troughs
-    price_peaks = []
-    price_troughs = []
-    macd_peaks = []
-    macd_troughs = []
-    
-    for i in range(2, len(recent_close) - 2):
-        # Price peak
-        if (recent_close.iloc[i] > recent_close.iloc[i-1] and 
-            recent_close.iloc[i] > recent_close.iloc[i-2] and
-            recent_close.iloc[i] > recent_close.iloc[i+1] and
-            recent_close.iloc[i] > recent_close.iloc[i+2]):
-            price_peaks.append((i, recent_close.iloc[i]))
-        
-        # Price trough
-        if (recent_close.iloc[i] < recent_close.iloc[i-1] and 
-            recent_close.iloc[i] < recent_close.iloc[i-2] and
-            recent_close.iloc[i] < recent_close.iloc[i+1] and
-            recent_close.iloc[i] < recent_close.iloc[i+2]):
-            price_troughs.append((i, recent_close.iloc[i]))
-        
-        # MACD peak
-        if (recent_macd.iloc[i] > recent_macd.iloc[i-1] and 
-            recent_macd.iloc[i] > recent_macd.iloc[i-2] and
-            recent_macd.iloc[i] > recent_macd.iloc[i+1] and
-            recent_macd.iloc[i] > recent_macd.iloc[i+2]):
-            macd_peaks.append((i, recent_macd.iloc[i]))
-        
-        # MACD trough
-        if (recent_macd.iloc[i] < recent_macd.iloc[i-1] and 
-            recent_macd.iloc[i] < recent_macd.iloc[i-2] and
-            recent_macd.iloc[i] < recent_macd.iloc[i+1] and
-            recent_macd.iloc[i] < recent_macd.iloc[i+2]):
-            macd_troughs.append((i, recent_macd.iloc[i]))
-    
-    # Check for bearish divergence
-    if len(price_peaks) >= 2 and len(macd_peaks) >= 2:
-        latest_price_peak = price_peaks[-1][1]
-        prev_price_peak = price_peaks[-2][1]
-        latest_macd_peak = macd_peaks[-1][1]
-        prev_macd_peak = macd_peaks[-2][1]
-        
-        if (latest_price_peak > prev_price_peak and 
-            latest_macd_peak < prev_macd_peak):
-            return 'bearish_divergence'
-    
-    # Check for bullish divergence
-    if len(price_troughs) >= 2 and len(macd_troughs) >= 2:
-        latest_price_trough = price_troughs[-1][1]
-        prev_price_trough = price_troughs[-2][1]
-        latest_macd_trough = macd_troughs[-1][1]
-        prev_macd_trough = macd_troughs[-2][1]
-        
-        if (latest_price_trough < prev_price_trough and 
-            latest_macd_trough > prev_macd_trough):
-            return 'bullish_divergence'
-    
-    return None
+    code = divergence_code(_tail(close, lookback), _tail(macd_line, lookback))
+    return _DIVERGENCE_LABELS[code]
 
 
-def detect_volume_surge(volume, lookback=20, surge_threshold=1.5):
-    """
-    Detect volume surge in consolidation - accumulation before breakout
-    
-    Returns:
-        - True if volume surge detected without corresponding price move
-        - False otherwise
-    """
+def _nanmean(values):
+    """Series.mean() on an array: NaN skipped, NaN when nothing is left (no warning)."""
+    values = values[~np.isnan(values)]
+    return values.mean() if values.size else np.nan
+
+
+def _volume_surge(volume, lookback, surge_threshold):
+    """detect_volume_surge on the last lookback + 5 volumes as a float64 array."""
     if len(volume) < lookback:
         return False
-    
-    recent_volume = volume[-lookback:]
-    volume_avg = recent_volume.mean()
-    current_volume = volume.iloc[-1]
-    
+    current_volume = volume[-1]
     # Check if current volume is significantly above average
-    if current_volume > volume_avg * surge_threshold:
+    if current_volume > _nanmean(volume[-lookback:]) * surge_threshold:
         # Check if this is a surge (not just high volume day)
         # Compare with previous days
         if len(volume) >= lookback + 5:
-            prev_volume_avg = volume[-(lookback+5):-5].mean()
+            prev_volume_avg = _nanmean(volume[-(lookback + 5):-5])
             if current_volume > prev_volume_avg * surge_threshold:
                 return True
-    
     return False
 
 
+def detect_volume_surge(volume, lookback=20, surge_threshold=1.5):
+    """
+    Detect volume surge in consolidation - accumulation before breakout
+    
+    Returns:
+        - True if volume surge detected without corresponding price move
+        - False otherwise
+    """
+    return _volume_surge(_tail(volume, lookback + 5), lookback, surge_threshold)
+
+
 def detect_consolidation_base(close, lookback=20, tightness_threshold=0.05):
     """
     Detect consolidation/base formation - setup for breakout
@@ -198,22 +98,25 @@ def detect_consolidation_base(close, lookback=20, tightness_threshold=0.05):
     """
     if len(close) < lookback:
         return None
-    
-    recent_close = close[-lookback:]
-    price_range = recent_close.max() - recent_close.min()
-    avg_price = recent_close.mean()
+    return _consolidation_base(_tail(close, lookback), tightness_threshold)
+
+
+def _consolidation_base(recent_close, tightness_threshold):
+    """detect_consolidation_base on the last `lookback` closes as a float64 array."""
+    valid = recent_close[~np.isnan(recent_close)]  # Series max/min/mean skip NaN
+    if valid.size == 0:
+        return None
+    price_range = valid.max() - valid.min()
+    avg_price = valid.mean()
     range_pct = (price_range / avg_price) * 100
     
     # Tight base: price range < 5% of average
     if range_pct < tightness_threshold * 100:
-        # Check if making higher lows (ascending base)
-        lows = []
-        for i in range(2, len(recent_close) - 2):
-            if (recent_close.iloc[i] < recent_close.iloc[i-1] and 
-                recent_close.iloc[i] < recent_close.iloc[i-2] and
-                recent_close.iloc[i] < recent_close.iloc[i+1] and
-                recent_close.iloc[i] < recent_close.iloc[i+2]):
-                lows.append(recent_close.iloc[i])
+        # Check if making higher lows (ascending base): bars below both neighbours on each side
+        mid = recent_close[2:-2]
+        is_low = ((mid < recent_close[1:-3]) & (mid < recent_close[:-4])
+                  & (mid < recent_close[3:-1]) & (mid < recent_close[4:]))
+        lows = mid[is_low]
         
         if len(lows) >= 2:
             if lows[-1] > lows[-2]:
@@ -238,9 +141,15 @@ def detect_volatility_compression(atr_values, lookback=20, compression_threshold
     """
     if len(atr_values) < lookback:
         return False
-    
-    recent_atr = atr_values[-lookback:]
-    current_atr = atr_values.iloc[-1]
+    return _volatility_compression(_tail(atr_values, lookback), compression_threshold)
+
+
+def _volatility_compression(recent_atr, compression_threshold):
+    """detect_volatility_compression on the last `lookback` ATR values as a float64 array."""
+    current_atr = recent_atr[-1]
+    recent_atr = recent_atr[~np.isnan(recent_atr)]  # Series.mean skips NaN
+    if recent_atr.size == 0:
+        return False
     avg_atr = recent_atr.mean()
     
     # Check if current ATR is significantly below average (compression)
@@ -250,6 +159,46 @@ def detect_volatility_compression(atr_values, lookback=20, compression_threshold
     return False
 
 
+class PredictiveFeatures(NamedTuple):
+    """Outputs of the tail-window detectors, as returned by detect_predictive_features."""
+    rsi_divergence: Optional[str] = None
+    macd_divergence: Optional[str] = None
+    volume_surge: bool = False
+    base_pattern: Optional[str] = None
+    volatility_compression: bool = False
+
+
+def detect_predictive_features(close, rsi_values=None, macd_line=None, volume=None, atr_values=None,
+                               lookback=20):
+    """
+    Run every tail-window detector in one call.
+
+    Each input is cut to its last `lookback` (+5 for volume) values once and the
+    detectors work on those arrays; close is shared by both divergences and the
+    base check. Inputs left as None, or shorter than lookback, give the "nothing
+    detected" value (None/False), like the individual detect_* functions.
+    Thresholds are the detect_* defaults.
+    """
+    if len(close) < lookback:
+        return PredictiveFeatures()
+    close_tail = _tail(close, lookback)
+    rsi_divergence = macd_divergence = None
+    if rsi_values is not None and len(rsi_values) >= lookback:
+        rsi_divergence = _DIVERGENCE_LABELS[divergence_code(close_tail, _tail(rsi_values, lookback))]
+    if macd_line is not None and len(macd_line) >= lookback:
+        macd_divergence = _DIVERGENCE_LABELS[divergence_code(close_tail, _tail(macd_line, lookback))]
+    volume_surge = volume is not None and _volume_surge(_tail(volume, lookback + 5), lookback, 1.5)
+    compression = (atr_values is not None and len(atr_values) >= lookback
+                   and _volatility_compression(_tail(atr_values, lookback), 0.7))
+    return PredictiveFeatures(
+        rsi_divergence=rsi_divergence,
+        macd_divergence=macd_divergence,
+        volume_surge=bool(volume_surge),
+        base_pattern=_consolidation_base(close_tail, 0.05),
+        volatility_compression=bool(compression),
+    )
+
+
 def calculate_price_extension(current_price, ema50):
     """
     Calculate how extended price is above EMA50
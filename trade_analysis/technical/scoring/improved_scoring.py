@@ -24,6 +24,11 @@ except ImportError:
                 "capitulation_threshold": -20,
             }
 
+try:
+    from indicators.kernels import true_range
+except ImportError:
+    from kernels import true_range
+
 # Import seasonality for crypto
 try:
     from indicators.seasonality import get_seasonal_adjustment_for_timeframe
@@ -85,10 +90,7 @@ def calculate_adx(high: pd.Series, low: pd.Series, close: pd.Series, window: int
         if len(close) < window * 2:
             return None, None
         
-        tr1 = high - low
-        tr2 = abs(high - close.shift(1))
-        tr3 = abs(low - close.shift(1))
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+        tr = pd.Series(true_range(high, low, close), index=close.index)
         atr = tr.rolling(window=window).mean()
         
         plus_dm = high.diff()
@@ -198,8 +200,10 @@ def improved_scoring(df: pd.DataFrame, category: str, pi_value: Optional[float]
     # Moving averages
     ema50 = close.ewm(span=50, adjust=False).mean()
     ema200 = close.ewm(span=200, adjust=False).mean()
-    sma50 = close.rolling(window=50).mean()
-    sma200 = close.rolling(window=200).mean()
+    # Only the last SMA values are compared (golden cross): trailing-window means, NaN while too short
+    close_arr = close.to_numpy(dtype=np.float64)
+    sma50 = close_arr[-50:].mean() if len(close_arr) >= 50 else np.nan
+    sma200 = close_arr[-200:].mean() if len(close_arr) >= 200 else np.nan
     
     indicators['ema50'] = round(ema50.iloc[-1], 2) if len(ema50) > 0 else None
     indicators['ema200'] = round(ema200.iloc[-1], 2) if len(ema200) > 0 else None
@@ -419,11 +423,10 @@ def improved_scoring(df: pd.DataFrame, category: str, pi_value: Optional[float]
                     breakdown['trend_continuation_healthy_rsi'] = healthy_rsi_bonus
             
             # Bonus if Golden Cross is present
-            if len(sma50) > 0 and len(sma200) > 0:
-                if sma50.iloc[-1] > sma200.iloc[-1]:
-                    golden_cross_bonus = 0.5
-                    score += golden_cross_bonus
-                    breakdown['trend_continuation_golden_cross'] = golden_cross_bonus
+            if sma50 > sma200:
+                golden_cross_bonus = 0.5
+                score += golden_cross_bonus
+                breakdown['trend_continuation_golden_cross'] = golden_cross_bonus
         
         # Moderate continuation: Price above EMAs + moderate ADX (15-25)
         # This catches moves when trend is established but ADX hasn't spiked yet
@@ -478,10 +481,9 @@ def improved_scoring(df: pd.DataFrame, category: str, pi_value: Optional[float]
             breakdown['price_above_ema200'] = 1.0
         
         # Golden Cross
-        if len(sma50) > 0 and len(sma200) > 0:
-            if sma50.iloc[-1] > sma200.iloc[-1]:
-                score += 1.5
-                breakdown['golden_cross'] = 1.5
+        if sma50 > sma200:
+            score += 1.5
+            breakdown['golden_cross'] = 1.5
     
     # ===== ADX SCORING =====
     if adx_value:
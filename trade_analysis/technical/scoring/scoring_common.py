@@ -6,6 +6,11 @@ Eliminates code duplication and makes maintenance easier
 import pandas as pd
 import numpy as np
 
+try:
+    from indicators.kernels import true_range
+except ImportError:
+    from kernels import true_range
+
 # Import predictive indicators
 try:
     from predictive_indicators import (
@@ -205,10 +210,7 @@ def score_volatility_compression(high, low, close, atr_value, result):
     
     try:
         # Calculate ATR series for compression detection
-        tr1 = high - low
-        tr2 = abs(high - close.shift(1))
-        tr3 = abs(low - close.shift(1))
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+        tr = pd.Series(true_range(high, low, close), index=close.index)
         atr_values = tr.rolling(window=14).mean()
         if len(atr_values) >= 20:
             volatility_compression = detect_volatility_compression(atr_values, lookback=20)
@@ -0,0 +1,147 @@
+"""
+Share read-only OHLCV frames with worker processes through multiprocessing.shared_memory.
+
+The parent copies each column (and the DatetimeIndex) into one shared segment once;
+workers rebuild a DataFrame whose columns are views on that segment instead of
+receiving a pickled copy per pool.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class SharedFrameSpec:
+    """Picklable description of a frame stored in a shared memory segment."""
+
+    shm_name: str
+    length: int
+    columns: Tuple[Tuple[str, str, int], ...]  # (name, dtype, byte offset)
+    index_offset: int
+    index_unit: str
+    index_tz: Optional[str]
+    index_name: Optional[str]
+
+
+# Parent side: segments created by share_frame, keyed by id(frame); unlinked on release or at exit
+_OWNED: Dict[int, Tuple[pd.DataFrame, shared_memory.SharedMemory, SharedFrameSpec]] = {}
+_OWNER_PID = os.getpid()
+# Worker side: attached segments must stay open while their views are in use
+_ATTACHED: List[shared_memory.SharedMemory] = []
+
+
+def can_share(df: Optional[pd.DataFrame]) -> bool:
+    """Only non-empty frames with a DatetimeIndex and named numeric columns are shared."""
+    return (
+        isinstance(df, pd.DataFrame)
+        and len(df) > 0
+        and isinstance(df.index, pd.DatetimeIndex)
+        and all(isinstance(name, str) for name in df.columns)
+        and all(np.issubdtype(dtype, np.number) for dtype in df.dtypes)
+    )
+
+
+def share_frame(df: pd.DataFrame) -> SharedFrameSpec:
+    """Copy df into a shared memory segment (once per frame object) and return its spec."""
+    owned = _OWNED.get(id(df))
+    if owned is not None and owned[0] is df:
+        return owned[2]
+
+    arrays = [(name, np.ascontiguousarray(df[name].to_numpy())) for name in df.columns]
+    index = df.index
+    index_values = np.ascontiguousarray(index.asi8)  # UTC-based for tz-aware indexes
+
+    columns = []
+    offset = 0
+    for name, values in arrays:
+        columns.append((name, values.dtype.str, offset))
+        offset += -(-values.nbytes // 8) * 8  # keep every block 8-byte aligned
+    index_offset = offset
+    total = max(offset + index_values.nbytes, 1)
+
+    shm = shared_memory.SharedMemory(create=True, size=total)
+    for (name, dtype, start), (_, values) in zip(columns, arrays):
+        np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf, offset=start)[:] = values
+    np.ndarray(index_values.shape, dtype=np.int64, buffer=shm.buf, offset=index_offset)[:] = index_values
+
+    spec = SharedFrameSpec(
+        shm_name=shm.name,
+        length=len(df),
+        columns=tuple(columns),
+        index_offset=index_offset,
+        index_unit=index.unit,
+        index_tz=str(index.tz) if index.tz is not None else None,
+        index_name=index.name,
+    )
+    _OWNED[id(df)] = (df, shm, spec)
+    return spec
+
+
+def attach_frame(spec: SharedFrameSpec) -> pd.DataFrame:
+    """Rebuild a read-only DataFrame whose columns are views on the shared segment."""
+    shm = shared_memory.SharedMemory(name=spec.shm_name)
+    _ATTACHED.append(shm)
+
+    data = {}
+    for name, dtype, start in spec.columns:
+        values = np.ndarray((spec.length,), dtype=np.dtype(dtype), buffer=shm.buf, offset=start)
+        values.flags.writeable = False
+        data[name] = values
+    raw_index = np.ndarray((spec.length,), dtype=np.int64, buffer=shm.buf, offset=spec.index_offset)
+    index = pd.DatetimeIndex(raw_index.view(f"M8[{spec.index_unit}]"), name=spec.index_name)
+    if spec.index_tz is not None:
+        index = index.tz_localize("UTC").tz_convert(spec.index_tz)
+    return pd.DataFrame(data, index=index, copy=False)
+
+
+def release_shared_frames(specs: Optional[Iterable[SharedFrameSpec]] = None) -> None:
+    """Close and unlink the segments of specs, or every segment created by this process."""
+    if os.getpid() != _OWNER_PID:
+        return  # forked children inherit _OWNED but must not unlink the parent's segments
+    if specs is None:
+        keys = list(_OWNED)
+    else:
+        names = {spec.shm_name for spec in specs}
+        keys = [key for key, (_, _, spec) in _OWNED.items() if spec.shm_name in names]
+    for key in keys:
+        _, shm, _ = _OWNED.pop(key)
+        try:
+            shm.close()
+            shm.unlink()
+        except (BufferError, FileNotFoundError):
+            pass
+
+
+@contextmanager
+def shared_frame_dicts(*frame_dicts: Optional[Dict[str, pd.DataFrame]]) -> Iterator[tuple]:
+    """
+    Share the frames of label -> frame dicts for the duration of a block.
+
+    Yields the dicts with every shareable frame replaced by its SharedFrameSpec
+    (None dicts and unshareable frames pass through); the segments are released
+    when the block exits, so repeated calls do not pile up open segments.
+    """
+    shared = tuple(
+        {label: share_frame(df) if can_share(df) else df for label, df in frames.items()}
+        if frames is not None else None
+        for frames in frame_dicts
+    )
+    try:
+        yield shared
+    finally:
+        release_shared_frames(
+            spec for frames in shared if frames is not None
+            for spec in frames.values() if isinstance(spec, SharedFrameSpec)
+        )
+
+
+atexit.register(release_shared_frames)
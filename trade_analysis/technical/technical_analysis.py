@@ -1,41 +1,87 @@
 import json
+import math
 import time
 import os
 import sys
 import argparse
+import re
+import threading
 from pathlib import Path
 from collections import defaultdict
+from dataclasses import dataclass
+from bisect import bisect_right
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from datetime import datetime, timedelta, timezone
 import pickle
+import gzip
+import heapq
 import yfinance as yf
 import pandas as pd
-from ta.momentum import RSIIndicator, StochRSIIndicator
-from ta.trend import MACD, ADXIndicator, CCIIndicator
-from ta.volatility import AverageTrueRange
-from ta.volume import OnBalanceVolumeIndicator, AccDistIndexIndicator
+from ta.trend import ADXIndicator
 import numpy as np
-from tradingview_indicators import RSI, ema, sma
-from ta.trend import SMAIndicator
+from tradingview_indicators import RSI, ema
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from curl_cffi import requests as curl_requests
+    CURL_CFFI_AVAILABLE = True
+except ImportError:
+    CURL_CFFI_AVAILABLE = False
+
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    BOTTLENECK_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from pyarrow import feather  # Arrow IPC (Feather v2) OHLCV cache
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 # Import predictive indicators
 try:
-    from indicators.predictive_indicators import (
-        detect_rsi_divergence, detect_macd_divergence,
-        detect_volume_surge, detect_consolidation_base,
-        detect_volatility_compression, detect_adx_trend
-    )
+    from indicators.predictive_indicators import detect_adx_trend, detect_predictive_features
     PREDICTIVE_INDICATORS_AVAILABLE = True
 except ImportError:
     try:
-        from predictive_indicators import (
-            detect_rsi_divergence, detect_macd_divergence,
-            detect_volume_surge, detect_consolidation_base,
-            detect_volatility_compression, detect_adx_trend
-        )
+        from predictive_indicators import detect_adx_trend, detect_predictive_features
         PREDICTIVE_INDICATORS_AVAILABLE = True
     except ImportError:
         PREDICTIVE_INDICATORS_AVAILABLE = False
 
+# Improved scoring (explosive bottom detection) is optional
+try:
+    from scoring.scoring_integration import apply_improved_scoring
+except ImportError:
+    try:
+        from scoring_integration import apply_improved_scoring
+    except ImportError:
+        apply_improved_scoring = None
+
+try:
+    from indicators.kernels import (
+        acc_dist_index, average_true_range, cci_last, divide_rows, ewm_last, last_emas, macd_last,
+        on_balance_volume, range_potential, true_range, wilder_rsi,
+    )
+except ImportError:
+    from kernels import (
+        acc_dist_index, average_true_range, cci_last, divide_rows, ewm_last, last_emas, macd_last,
+        on_balance_volume, range_potential, true_range, wilder_rsi,
+    )
+
+from shared_frames import SharedFrameSpec, attach_frame, shared_frame_dicts
+
 # Data source: yFinance only
 
 # ======================================================
@@ -131,57 +177,194 @@ def load_symbols_config(config_path: str = None) -> dict:
 # DATA HELPERS
 # ======================================================
 
+@lru_cache(maxsize=1)
+def _refresh_cutoff(now_epoch_hour: int) -> datetime:
+    """
+    Most recent Sunday 4 PM UTC that has already passed, for the given UTC hour.
+    The cutoff only moves on the hour, so one computation serves a whole run.
+    """
+    now = datetime.fromtimestamp(now_epoch_hour * 3600, tz=timezone.utc)
+    
+    # Days back to the most recent Sunday (weekday 6); on Sunday before 4 PM, last week's
+    days_back = (now.weekday() - 6) % 7
+    if days_back == 0 and now.hour < 16:
+        days_back = 7
+    return now.replace(hour=16, minute=0, second=0, microsecond=0) - timedelta(days=days_back)
+
 def should_refresh_cache(cache_file: Path, force_refresh: bool = False) -> bool:
     """
     Determine if cached data should be refreshed.
     Returns True if:
     - force_refresh is True (explicit refresh flag)
     - Cache doesn't exist
-    - Cache was last updated before the most recent Sunday 4 PM UTC (to capture weekly closes)
+    - Cache was last downloaded before the most recent Sunday 4 PM UTC (to capture weekly closes)
     """
     if force_refresh:
         return True
     
-    if not cache_file.exists():
+    try:
+        fetched_at = _cache_fetched_at(cache_file)
+    except FileNotFoundError:
         return True
-    
-    # Get cache file modification time
-    cache_mtime = datetime.fromtimestamp(cache_file.stat().st_mtime, tz=timezone.utc)
-    now = datetime.now(timezone.utc)
-    
-    # Find the most recent Sunday 4 PM UTC that has already passed
-    # This ensures weekly closes (Sunday 4 PM) are always captured
-    current_weekday = now.weekday()  # 0=Monday, 6=Sunday
-    current_hour = now.hour
-    
-    if current_weekday == 6:  # Today is Sunday
-        if current_hour >= 16:  # After 4 PM - use today's 4 PM as cutoff
-            last_sunday_4pm = now.replace(hour=16, minute=0, second=0, microsecond=0)
-        else:  # Before 4 PM - use last week's Sunday 4 PM as cutoff
-            last_sunday_4pm = (now - timedelta(days=7)).replace(hour=16, minute=0, second=0, microsecond=0)
-    else:
-        # Not Sunday - find the most recent Sunday 4 PM that has passed
-        # Monday=0, so days since Sunday = 1
-        # Tuesday=1, so days since Sunday = 2, etc.
-        days_since_sunday = (current_weekday + 1) % 7
-        if days_since_sunday == 0:  # This shouldn't happen, but handle it
-            days_since_sunday = 1
-        last_sunday_4pm = (now - timedelta(days=days_since_sunday)).replace(hour=16, minute=0, second=0, microsecond=0)
+    except Exception:
+        return True  # unreadable footer: treat as a miss and re-download
     
     # Refresh if cache is older than the most recent Sunday 4 PM UTC
     # This ensures we always have data that includes the weekly close
-    if cache_mtime < last_sunday_4pm:
-        return True
-    
-    return False
+    return fetched_at < _refresh_cutoff(int(time.time() // 3600)).timestamp()
+
+# OHLCV cache format: Feather v2 / Arrow IPC (lz4) when pyarrow is installed, pickle otherwise
+CACHE_SUFFIX = ".feather" if PYARROW_AVAILABLE else ".pkl"
+# Earlier cache formats, migrated on first read (newest first)
+LEGACY_CACHE_SUFFIXES = (".parquet", ".pkl")
+# Pickle fallback: protocol 5 (PEP 574) block buffers through a 1 MiB file buffer
+PICKLE_BUFFER_SIZE = 1 << 20
+
+
+# Category cache directories already created by this process (one mkdir per category)
+_ENSURED_DIRS = set()
+_SAFE_SYMBOL = str.maketrans("=-", "__")
+
 
 def get_cache_path(category: str, symbol: str, interval: str = "1d") -> Path:
     """Get cache file path for a symbol in a category. Uses interval so 1h and 1d are cached separately."""
     category_dir = CACHE_DIR / category
-    category_dir.mkdir(exist_ok=True)
-    safe_symbol = symbol.replace("=", "_").replace("-", "_")
+    if category_dir not in _ENSURED_DIRS:
+        category_dir.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(category_dir)
+    safe_symbol = symbol.translate(_SAFE_SYMBOL)
     suffix = "" if interval == "1d" else f"_{interval.replace(' ', '_')}"
-    return category_dir / f"{safe_symbol}{suffix}.pkl"
+    return category_dir / f"{safe_symbol}{suffix}{CACHE_SUFFIX}"
+
+_PRICE_COLUMNS = ("Open", "High", "Low", "Close", "Adj Close")
+
+
+def _compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Narrow dtypes for storage where it is lossless: prices to float32 when every value
+    round-trips exactly, Volume to uint32 when it is a non-negative integer below 2**32.
+    """
+    dtypes = {}
+    for col in _PRICE_COLUMNS:
+        if col in df.columns and df[col].dtype == np.float64:
+            values = df[col].to_numpy()
+            if np.array_equal(values.astype(np.float32).astype(np.float64), values, equal_nan=True):
+                dtypes[col] = np.float32
+    if "Volume" in df.columns and len(df) > 0:
+        volume = df["Volume"].to_numpy()
+        if (
+            np.issubdtype(volume.dtype, np.number)
+            and not np.isnan(volume.astype(np.float64)).any()
+            and volume.min() >= 0
+            and volume.max() < 2**32
+            and np.array_equal(np.floor(volume), volume)
+        ):
+            dtypes["Volume"] = np.uint32
+    return df.astype(dtypes) if dtypes else df
+
+def _expand_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Widen stored dtypes back to float64 prices and int64 volume for computation."""
+    dtypes = {col: np.float64 for col in _PRICE_COLUMNS if col in df.columns and df[col].dtype == np.float32}
+    if "Volume" in df.columns and df["Volume"].dtype == np.uint32:
+        dtypes["Volume"] = np.int64
+    return df.astype(dtypes) if dtypes else df
+
+# Download time (epoch seconds) kept in Arrow/parquet schema metadata and df.attrs, so
+# freshness follows the data rather than a file mtime that rsync/tar/checkouts rewrite
+FETCHED_AT_KEY = "fetched_at"
+
+
+def _arrow_table(df: pd.DataFrame):
+    """Arrow table for df carrying its download time in the schema metadata."""
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    fetched_at = df.attrs.get(FETCHED_AT_KEY, time.time())
+    metadata = {**(table.schema.metadata or {}), FETCHED_AT_KEY.encode(): repr(float(fetched_at)).encode()}
+    return table.replace_schema_metadata(metadata)
+
+def _cache_fetched_at(cache_file: Path) -> float:
+    """
+    When the cached data was downloaded: read from the feather/parquet footer (no
+    payload decode), else the file mtime (pickle, or files written before the key existed).
+    Raises FileNotFoundError if the file is missing.
+    """
+    schema = None
+    if cache_file.suffix == ".feather" and PYARROW_AVAILABLE:
+        with pa.memory_map(str(cache_file)) as source:
+            schema = pa.ipc.open_file(source).schema
+    elif cache_file.suffix == ".parquet" and PYARROW_AVAILABLE:
+        schema = pq.read_schema(cache_file)
+    fetched_at = (schema.metadata or {}).get(FETCHED_AT_KEY.encode()) if schema is not None else None
+    if fetched_at is not None:
+        return float(fetched_at)
+    return cache_file.stat().st_mtime
+
+def frame_is_fresh(df: pd.DataFrame, cache_file: Path, force_refresh: bool = False) -> bool:
+    """
+    Whether df, as returned by download_data, counts as fresh cache data: its fetched_at
+    (kept in df.attrs by cache reads and downloads) against the same Sunday-close cutoff,
+    so the file footer is not reopened. Frames without it fall back to should_refresh_cache.
+    """
+    if force_refresh:
+        return False
+    fetched_at = df.attrs.get(FETCHED_AT_KEY)
+    if fetched_at is None:
+        return not should_refresh_cache(cache_file)
+    return fetched_at >= _refresh_cutoff(int(time.time() // 3600)).timestamp()
+
+def _with_fetched_at(df: pd.DataFrame, table) -> pd.DataFrame:
+    """Copy the download time from an Arrow schema onto df.attrs."""
+    fetched_at = (table.schema.metadata or {}).get(FETCHED_AT_KEY.encode())
+    if fetched_at is not None:
+        df.attrs[FETCHED_AT_KEY] = float(fetched_at)
+    return df
+
+def _read_cache_file(cache_file: Path) -> pd.DataFrame:
+    """Read one cached frame (feather, parquet or pickle, by suffix)."""
+    if cache_file.suffix == ".feather":
+        # Memory-mapped read; pandas metadata in the file restores the DatetimeIndex
+        table = feather.read_table(cache_file, memory_map=True)
+        return _with_fetched_at(_expand_dtypes(table.to_pandas()), table)
+    if cache_file.suffix == ".parquet":
+        table = pq.read_table(cache_file)
+        return _with_fetched_at(_expand_dtypes(table.to_pandas()), table)
+    with open(cache_file, 'rb', buffering=PICKLE_BUFFER_SIZE) as f:
+        return _expand_dtypes(pickle.Unpickler(f).load())
+
+def _write_cache_file(cache_file: Path, df: pd.DataFrame) -> None:
+    """Write one cached frame in the format implied by its suffix."""
+    df = _compact_dtypes(df)
+    if cache_file.suffix == ".feather":
+        feather.write_feather(_arrow_table(df), cache_file, compression="lz4")
+    elif cache_file.suffix == ".parquet":
+        pq.write_table(_arrow_table(df), cache_file, compression="zstd")
+    else:
+        with open(cache_file, 'wb', buffering=PICKLE_BUFFER_SIZE) as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def _migrate_legacy_cache(cache_file: Path) -> None:
+    """
+    Rewrite a legacy (.parquet/.pkl) cache entry in the current format (once), keeping
+    its download time so the Sunday-close freshness rule still sees the original fetch.
+    """
+    for legacy_suffix in LEGACY_CACHE_SUFFIXES:
+        if legacy_suffix == cache_file.suffix:
+            return
+        legacy_file = cache_file.with_suffix(legacy_suffix)
+        try:
+            legacy_stat = legacy_file.stat()
+        except FileNotFoundError:
+            continue
+        try:
+            df = _read_cache_file(legacy_file)
+            if isinstance(df, pd.DataFrame) and len(df) > 0:
+                df.attrs.setdefault(FETCHED_AT_KEY, legacy_stat.st_mtime)
+                _write_cache_file(cache_file, df)
+                os.utime(cache_file, ns=(legacy_stat.st_atime_ns, legacy_stat.st_mtime_ns))
+            legacy_file.unlink()
+        except Exception:
+            # Leave the legacy file alone; the symbol is simply re-downloaded
+            pass
+        return
 
 def load_cached_data(category: str, symbol: str, force_refresh: bool = False, interval: str = "1d"):
     """
@@ -189,11 +372,11 @@ def load_cached_data(category: str, symbol: str, force_refresh: bool = False, in
     Returns (dataframe, is_cached). Uses interval so 1h and 1d caches are separate.
     """
     cache_file = get_cache_path(category, symbol, interval=interval)
+    _migrate_legacy_cache(cache_file)
     
     if not should_refresh_cache(cache_file, force_refresh=force_refresh):
         try:
-            with open(cache_file, 'rb') as f:
-                df = pickle.load(f)
+            df = _read_cache_file(cache_file)
             if isinstance(df, pd.DataFrame) and len(df) > 0:
                 return df, True
         except Exception as e:
@@ -202,6 +385,50 @@ def load_cached_data(category: str, symbol: str, force_refresh: bool = False, in
     
     return pd.DataFrame(), False
 
+def load_cached_data_many(category: str, symbols, interval: str = "1d") -> dict:
+    """
+    Fresh cached frames for many symbols of a category: one scandir of the category
+    directory replaces a stat per symbol, and each Arrow file is opened once (its
+    footer's fetched_at is checked on the table just read).
+    Returns dict of symbol -> DataFrame for symbols with a fresh cache entry.
+    """
+    probe = get_cache_path(category, "_", interval=interval)
+    try:
+        with os.scandir(probe.parent) as it:
+            entries = {entry.name: entry for entry in it}
+    except FileNotFoundError:
+        return {}
+    cutoff = _refresh_cutoff(int(time.time() // 3600)).timestamp()
+
+    frames = {}
+    for symbol in symbols:
+        cache_file = get_cache_path(category, symbol, interval=interval)
+        entry = entries.get(cache_file.name)
+        if entry is None:
+            if any(cache_file.with_suffix(suffix).name in entries for suffix in LEGACY_CACHE_SUFFIXES):
+                # Legacy entry: load_cached_data migrates it
+                df, is_cached = load_cached_data(category, symbol, interval=interval)
+                if is_cached:
+                    frames[symbol] = df
+            continue
+        try:
+            if cache_file.suffix == ".feather":
+                table = feather.read_table(cache_file, memory_map=True)
+                fetched_at = (table.schema.metadata or {}).get(FETCHED_AT_KEY.encode())
+                fetched_at = float(fetched_at) if fetched_at is not None else entry.stat().st_mtime
+                if fetched_at < cutoff:
+                    continue
+                df = _with_fetched_at(_expand_dtypes(table.to_pandas()), table)
+            else:
+                if entry.stat().st_mtime < cutoff:
+                    continue
+                df = _read_cache_file(cache_file)
+        except Exception:
+            continue  # unreadable entry: re-download
+        if isinstance(df, pd.DataFrame) and len(df) > 0:
+            frames[symbol] = df
+    return frames
+
 def save_cached_data(category: str, symbol: str, df: pd.DataFrame, interval: str = "1d"):
     """Save downloaded data to cache. Uses interval in path so 1h and 1d are stored separately."""
     if len(df) == 0:
@@ -209,12 +436,118 @@ def save_cached_data(category: str, symbol: str, df: pd.DataFrame, interval: str
 
     cache_file = get_cache_path(category, symbol, interval=interval)
     try:
-        with open(cache_file, 'wb') as f:
-            pickle.dump(df, f)
+        _write_cache_file(cache_file, df)
     except Exception as e:
         # If cache write fails, continue without caching
         pass
 
+def get_category_cache_path(category: str, interval: str = "1d") -> Path:
+    """Single file holding every cached symbol of a category (one open per scan)."""
+    suffix = "" if interval == "1d" else f"_{interval.replace(' ', '_')}"
+    return CACHE_DIR / f"{category}{suffix}.parquet"
+
+class CachedOHLCV:
+    """
+    One symbol's rows of the category file as an Arrow table slice (zero-copy).
+    Converted to pandas on first use, so symbols that are loaded but never scored
+    in this process never pay for the conversion.
+    """
+    __slots__ = ("table", "fetched_at", "_frame")
+
+    def __init__(self, table, fetched_at=None):
+        self.table = table
+        self.fetched_at = fetched_at
+        self._frame = None
+
+    def to_pandas(self) -> pd.DataFrame:
+        if self._frame is None:
+            # The slice is dropped afterwards, so Arrow may free buffers as it converts
+            df = self.table.to_pandas(split_blocks=True, self_destruct=True).droplevel("symbol")
+            df = _expand_dtypes(df)
+            if self.fetched_at is not None:
+                df.attrs[FETCHED_AT_KEY] = self.fetched_at
+            self._frame, self.table = df, None
+        return self._frame
+
+
+def load_category_cache(category: str, symbols, interval: str = "1d") -> dict:
+    """
+    Load the requested symbols from the category file in one read, if it is fresh.
+    Returns dict of symbol -> CachedOHLCV (symbols missing from the file are omitted).
+    """
+    cache_file = get_category_cache_path(category, interval=interval)
+    if not PYARROW_AVAILABLE or should_refresh_cache(cache_file):
+        return {}
+    try:
+        table = pq.read_table(cache_file, filters=[("symbol", "in", list(symbols))])
+    except Exception:
+        return {}
+    if table.num_rows == 0:
+        return {}
+    fetched_at = (table.schema.metadata or {}).get(FETCHED_AT_KEY.encode())
+    fetched_at = float(fetched_at) if fetched_at is not None else None
+
+    # Frames were written one symbol after another: slice each contiguous run
+    symbol_col = table.column("symbol").to_numpy(zero_copy_only=False)
+    starts = np.flatnonzero(np.r_[True, symbol_col[1:] != symbol_col[:-1]])
+    if len(set(symbol_col[starts])) != len(starts):
+        return {}  # not grouped by symbol (not written by save_category_cache)
+    ends = np.append(starts[1:], len(symbol_col))
+    return {
+        symbol_col[start]: CachedOHLCV(table.slice(start, end - start), fetched_at)
+        for start, end in zip(starts, ends)
+    }
+
+def save_category_cache(category: str, frames: dict, interval: str = "1d"):
+    """Write all of a category's frames to one zstd parquet file, keyed by a symbol index level."""
+    if not PYARROW_AVAILABLE or not frames:
+        return
+    cache_file = get_category_cache_path(category, interval=interval)
+    try:
+        packed = _compact_dtypes(pd.concat(frames, names=["symbol"]))
+        # The pack is only as fresh as its oldest frame
+        packed.attrs = {FETCHED_AT_KEY: min(df.attrs.get(FETCHED_AT_KEY, time.time()) for df in frames.values())}
+        pq.write_table(_arrow_table(packed), cache_file, compression="zstd", row_group_size=200_000)
+    except Exception:
+        # If cache write fails, continue without caching
+        pass
+
+_YF_SESSION = None
+_YF_SESSION_PID = None
+_YF_SESSION_LOCK = threading.Lock()
+
+
+def yf_session():
+    """
+    One curl_cffi session per process for every yfinance call (connection keep-alive,
+    one TLS handshake). None lets yfinance create its own session.
+    yfinance rejects caching sessions (requests_cache), so caching stays in this module.
+    """
+    global _YF_SESSION, _YF_SESSION_PID
+    if not CURL_CFFI_AVAILABLE:
+        return None
+    with _YF_SESSION_LOCK:
+        # A session inherited through fork shares the parent's sockets: start a fresh one
+        if _YF_SESSION is None or _YF_SESSION_PID != os.getpid():
+            _YF_SESSION = curl_requests.Session(impersonate="chrome")
+            _YF_SESSION_PID = os.getpid()
+        return _YF_SESSION
+
+
+# Frames already loaded in this process, keyed by (symbol, period, interval, category):
+# checked before the disk cache so repeated lookups (e.g. GC=F) skip file and network I/O.
+# Values are DataFrames or CachedOHLCV entries from the category file.
+_DOWNLOAD_MEMO = {}
+
+
+def _memo_frame(memo_key):
+    """DataFrame memoized under memo_key (materializing a CachedOHLCV entry), or None."""
+    entry = _DOWNLOAD_MEMO.get(memo_key)
+    if isinstance(entry, CachedOHLCV):
+        entry = _DOWNLOAD_MEMO[memo_key] = entry.to_pandas()
+    return entry
+
+
 def download_data(symbol, period="5y", interval="1d", category: str = None, use_cache: bool = True, force_refresh: bool = False):
     """
     Download data from yFinance with optional caching.
@@ -233,216 +566,322 @@ def download_data(symbol, period="5y", interval="1d", category: str = None, use_
     if category == "cryptocurrencies" and period == "5y":
         # Try to get maximum available data
         period = "max"  # yfinance supports "max" for maximum available data
+    memo_key = (symbol, period, interval, category)
+    if use_cache and not force_refresh:
+        memo_df = _memo_frame(memo_key)
+        if memo_df is not None:
+            return memo_df
     # Try to load from cache if category provided and caching enabled
     if use_cache and category and not force_refresh:
         cached_df, is_cached = load_cached_data(category, symbol, force_refresh=force_refresh, interval=interval)
         if is_cached:
+            _DOWNLOAD_MEMO[memo_key] = cached_df
             return cached_df
 
     # Download fresh data
     try:
-        df = yf.download(symbol, period=period, interval=interval, auto_adjust=False, progress=False)
+        df = yf.download(symbol, period=period, interval=interval, auto_adjust=False, progress=False, session=yf_session())
         if isinstance(df.columns, pd.MultiIndex):
             df.columns = df.columns.get_level_values(0)
         df = df.dropna()
+        df.attrs[FETCHED_AT_KEY] = time.time()
         
         # Save to cache if category provided and caching enabled
         if use_cache and category and len(df) > 0:
             save_cached_data(category, symbol, df, interval=interval)
+        if use_cache and len(df) > 0:
+            _DOWNLOAD_MEMO[memo_key] = df
 
         return df
     except Exception as e:
         print(f"  yFinance error for {symbol}: {e}")
         return pd.DataFrame()
 
+def _ticker_frame(batch_df, symbol, single: bool):
+    """One symbol's OHLCV columns from a multi-ticker yf.download frame."""
+    if isinstance(batch_df.columns, pd.MultiIndex):
+        for level in (0, 1):
+            if symbol in batch_df.columns.get_level_values(level):
+                return batch_df.xs(symbol, axis=1, level=level)
+        return pd.DataFrame()
+    return batch_df if single else pd.DataFrame()
+
+DOWNLOAD_WORKERS = 8  # concurrent per-symbol downloads (kept under Yahoo's rate limits)
+
+
+def download_intraday(symbol, category: str = None, force_refresh: bool = False):
+    """1h bars for the last 60 days (intraday limit), the source of the 4H timeframe. Never cached."""
+    return download_data(symbol, period="60d", interval="1h", category=category, use_cache=False, force_refresh=force_refresh)
+
+
+def download_intraday_batch(symbols, category: str = None, force_refresh: bool = False):
+    """
+    download_intraday for every symbol, overlapped on a thread pool (network-bound).
+
+    Returns:
+        Dict of symbol -> DataFrame (empty when Yahoo returned nothing)
+    """
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, len(symbols))) as ex:
+        frames = ex.map(lambda symbol: download_intraday(symbol, category, force_refresh), symbols)
+        return dict(zip(symbols, frames))
+
+
+def download_data_batch(symbols, period="5y", interval="1d", category: str = None, force_refresh: bool = False):
+    """
+    Fetch every cache-miss symbol of a category in one yf.download request, then split,
+    cache and memoize per symbol so later download_data calls are served locally.
+    
+    Returns:
+        Dict of symbol -> DataFrame for symbols fetched by this batch request
+        (symbols that were already cached are not included)
+    """
+    if category == "cryptocurrencies" and period == "5y":
+        period = "max"  # same rule as download_data
+    symbols = list(dict.fromkeys(symbols))
+
+    def pending():
+        return [symbol for symbol in symbols if (symbol, period, interval, category) not in _DOWNLOAD_MEMO]
+
+    unpacked = False  # any symbol served by its own cache file rather than the category file
+    if category and not force_refresh:
+        # Category file first (one read), then the per-symbol files of whatever it lacked
+        for loader in (load_category_cache, load_cached_data_many):
+            wanted = pending()
+            if not wanted:
+                break
+            for symbol, entry in loader(category, wanted, interval=interval).items():
+                _DOWNLOAD_MEMO[(symbol, period, interval, category)] = entry
+                unpacked = unpacked or loader is load_cached_data_many
+    missing = [
+        symbol for symbol in symbols
+        if force_refresh or (symbol, period, interval, category) not in _DOWNLOAD_MEMO
+    ]
+    if not missing:
+        if category and unpacked:
+            _save_category_from_memo(category, symbols, period, interval)
+        return {}
+
+    fetched = {}
+    try:
+        batch_df = yf.download(
+            missing, period=period, interval=interval, group_by="ticker", threads=True,
+            auto_adjust=False, progress=False, session=yf_session(),
+        )
+    except Exception as e:
+        print(f"  yFinance batch error for {category}: {e}")
+        batch_df = pd.DataFrame()
+
+    for symbol in missing:
+        df = _ticker_frame(batch_df, symbol, single=len(missing) == 1).dropna()
+        if len(df) == 0:
+            continue
+        df.columns.name = "Price"  # as in a single-ticker download
+        df.attrs[FETCHED_AT_KEY] = time.time()
+        if category:
+            save_cached_data(category, symbol, df, interval=interval)
+        _DOWNLOAD_MEMO[(symbol, period, interval, category)] = df
+        fetched[symbol] = df
+
+    # Symbols the batch did not return get one request each; network-bound, so overlap them
+    retry = [symbol for symbol in missing if symbol not in fetched]
+    if retry:
+        with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, len(retry))) as ex:
+            frames = ex.map(
+                lambda symbol: download_data(symbol, period=period, interval=interval, category=category, use_cache=True, force_refresh=True),
+                retry,
+            )
+            for symbol, df in zip(retry, frames):
+                if len(df) > 0:
+                    fetched[symbol] = df
+    if category:
+        _save_category_from_memo(category, symbols, period, interval)
+    return fetched
+
+def _save_category_from_memo(category, symbols, period, interval):
+    """Rewrite the category file from the frames this process now holds for it."""
+    frames = {
+        symbol: _memo_frame((symbol, period, interval, category))
+        for symbol in symbols
+        if (symbol, period, interval, category) in _DOWNLOAD_MEMO
+    }
+    save_category_cache(category, frames, interval=interval)
+
+# Bar aggregation shared by every resample
+_OHLCV_AGG = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Volume": "sum",
+}
+# Timeframe labels whose pandas offset differs from the label (2M/3M are for seasonality)
+_RESAMPLE_RULES = {"4H": "4h", "1D": "D", "2M": "2ME", "3M": "3ME"}
+
+
+def _maybe_dropna(df):
+    """df.dropna(), skipping the mask and the copy when there is nothing to drop."""
+    return df.dropna() if df.isna().to_numpy().any() else df
+
+def _resample_fixed_bins(df, step_ns: int):
+    """
+    OHLCV bars for a fixed-width rule (nD, nh) in one pass over contiguous arrays:
+    bins start at midnight of the first bar (pandas' origin="start_day") and only
+    bins that contain bars are produced, so no empty bins are materialised.
+    """
+    index = df.index
+    i8 = index.as_unit("ns").asi8
+    origin = index[0].normalize().as_unit("ns").value
+    codes = (i8 - origin) // step_ns
+    starts = np.flatnonzero(np.diff(codes, prepend=codes[0] - 1))
+    ends = np.append(starts[1:], len(codes)) - 1
+
+    bars = pd.DataFrame(
+        {
+            "Open": df["Open"].to_numpy()[starts],
+            "High": np.maximum.reduceat(df["High"].to_numpy(), starts),
+            "Low": np.minimum.reduceat(df["Low"].to_numpy(), starts),
+            "Close": df["Close"].to_numpy()[ends],
+            "Volume": np.add.reduceat(df["Volume"].to_numpy(), starts),
+        },
+        index=pd.DatetimeIndex(
+            (origin + codes[starts] * step_ns).view("M8[ns]"), name=index.name
+        ).tz_localize(index.tz).as_unit(index.unit),
+    )
+    return bars
+
+def _fixed_step_ns(df, offset) -> int:
+    """Bin width in ns when df can take the reduceat path, else 0 (use resample)."""
+    if not isinstance(offset, (pd.offsets.Tick, pd.offsets.Day)):
+        return 0  # month ends etc. are calendar-dependent
+    index = df.index
+    if not isinstance(index, pd.DatetimeIndex) or not index.is_monotonic_increasing:
+        return 0
+    if index.tz is not None and str(index.tz) != "UTC":
+        return 0  # local midnight / DST make day bins variable-width
+    if df[list(_OHLCV_AGG)].isna().to_numpy().any():
+        return 0  # resample's first/last/min/max skip NaNs; the array path does not
+    return offset.nanos
+
 def resample_ohlcv(df, rule):
     """
     Resample OHLCV data to specified timeframe rule.
     Handles 4H (4-hour) and 1D (daily) timeframes.
     """
-    # Handle 4H timeframe - resample hourly data to 4-hour bars
-    if rule == "4H":
-        # If data is already hourly or higher frequency, resample to 4H
-        if len(df) > 0:
-            # Check if we have intraday data (more than 1 bar per day on average)
-            avg_bars_per_day = len(df) / ((df.index[-1] - df.index[0]).days + 1) if len(df) > 0 and (df.index[-1] - df.index[0]).days > 0 else 1
-            if avg_bars_per_day > 1:
-                # Resample to 4H
-                return (
-                    df.resample("4h")
-                    .agg({
-                        "Open": "first",
-                        "High": "max",
-                        "Low": "min",
-                        "Close": "last",
-                        "Volume": "sum",
-                    })
-                    .dropna()
-                )
-            else:
-                # Daily data - can't create 4H bars, return empty
-                return pd.DataFrame()
-    
-    # Handle 1D timeframe - use daily data as-is or resample if needed
-    if rule == "1D":
-        # If data is already daily, return as-is
-        if len(df) > 0:
-            avg_bars_per_day = len(df) / ((df.index[-1] - df.index[0]).days + 1) if (df.index[-1] - df.index[0]).days > 0 else 1
-            if avg_bars_per_day <= 1.5:  # Daily or near-daily data
-                return df
-            else:
-                # Intraday data - resample to daily
-                return (
-                    df.resample("D")
-                    .agg({
-                        "Open": "first",
-                        "High": "max",
-                        "Low": "min",
-                        "Close": "last",
-                        "Volume": "sum",
-                    })
-                    .dropna()
-                )
-    
-    # Handle 2M and 3M timeframes for seasonality
-    if rule == "2M":
-        return (
-            df.resample("2ME")
-            .agg({
-                "Open": "first",
-                "High": "max",
-                "Low": "min",
-                "Close": "last",
-                "Volume": "sum",
-            })
-            .dropna()
-        )
-    
-    if rule == "3M":
-        return (
-            df.resample("3ME")
-            .agg({
-                "Open": "first",
-                "High": "max",
-                "Low": "min",
-                "Close": "last",
-                "Volume": "sum",
-            })
-            .dropna()
+    if len(df) > 0 and rule in ("4H", "1D"):
+        # Intraday data has more than 1 bar per day on average
+        span_days = (df.index[-1] - df.index[0]).days
+        avg_bars_per_day = len(df) / (span_days + 1) if span_days > 0 else 1
+        if rule == "4H" and avg_bars_per_day <= 1:
+            # Daily data - can't create 4H bars, return empty
+            return pd.DataFrame()
+        if rule == "1D" and avg_bars_per_day <= 1.5:
+            # Daily or near-daily data - use as-is
+            return df
+    
+    offset = pd.tseries.frequencies.to_offset(_RESAMPLE_RULES.get(rule, rule))
+    if len(df) > 0:
+        step_ns = _fixed_step_ns(df, offset)
+        if step_ns:
+            return _resample_fixed_bins(df, step_ns)
+    return _maybe_dropna(df.resample(offset).agg(_OHLCV_AGG))
+
+_OHLC = ["Open", "High", "Low", "Close"]
+_UNIT_RANK = ["ns", "us", "ms", "s"]  # finest first
+
+
+def _align_backward(ref, index):
+    """
+    A sorted Series/DataFrame as of each date in index: the last row at or before
+    the date, NaN before the first one. merge_asof sweeps both sorted indexes once.
+    """
+    if index.is_monotonic_increasing and isinstance(index, pd.DatetimeIndex) and isinstance(ref.index, pd.DatetimeIndex):
+        # merge_asof needs identical key dtypes: compare both at the finer resolution
+        unit = min(index.unit, ref.index.unit, key=_UNIT_RANK.index)
+        frame = ref.rename("Ref").to_frame() if isinstance(ref, pd.Series) else ref
+        aligned = pd.merge_asof(
+            pd.DataFrame(index=index.as_unit(unit)),
+            frame.set_axis(ref.index.as_unit(unit)),
+            left_index=True, right_index=True, direction="backward", allow_exact_matches=True,
         )
+        return aligned["Ref"] if isinstance(ref, pd.Series) else aligned
+    return ref.reindex(index, method="ffill")
+
+
+def _convert_to_reference_terms(df, ref_df):
+    """
+    Price data divided by a reference close (gold, silver) as of each symbol bar:
+    the latest reference close at or before the bar, else the first one after it.
+    """
+    if len(ref_df) == 0 or len(df) == 0:
+        return pd.DataFrame()
     
-    # Standard resampling for other timeframes
-    return (
-        df.resample(rule)
-        .agg({
-            "Open": "first",
-            "High": "max",
-            "Low": "min",
-            "Close": "last",
-            "Volume": "sum",
-        })
-        .dropna()
+    # Align the reference close to the symbol's dates only (no union of the two indexes)
+    ref_close = _maybe_dropna(ref_df["Close"])
+    if not ref_close.index.is_monotonic_increasing:
+        ref_close = ref_close.sort_index()
+    aligned = _align_backward(ref_close, df.index)
+    ref_prices = aligned.bfill().to_numpy(dtype=np.float64)
+    if np.isnan(ref_prices).any():
+        return pd.DataFrame()  # Can't convert if we don't have reference prices
+    
+    ohlcv = df[_OHLC + ["Volume"]]
+    if ohlcv.isna().to_numpy().any():
+        ohlcv = ohlcv.ffill()
+    
+    # Convert OHLC in one fused pass; volume stays the same (as float, like the
+    # previous union/ffill alignment produced whenever the reference had extra dates)
+    ref_terms = pd.DataFrame(
+        divide_rows(np.ascontiguousarray(ohlcv[_OHLC].to_numpy(dtype=np.float64)), ref_prices),
+        index=df.index,
+        columns=_OHLC,
+        copy=False,
     )
+    ref_terms["Volume"] = ohlcv["Volume"].to_numpy(dtype=np.float64)
+    
+    return _maybe_dropna(ref_terms)
 
 def convert_to_gold_terms(df, gold_df):
     """Convert price data to gold terms (price / gold_price)"""
-    if len(gold_df) == 0 or len(df) == 0:
-        return pd.DataFrame()
-    
-    # Create a combined index with all dates from both dataframes
-    all_dates = df.index.union(gold_df.index).sort_values()
-    
-    # Reindex both dataframes to the combined index and forward fill
-    df_reindexed = df.reindex(all_dates).ffill()
-    gold_reindexed = gold_df[["Close"]].reindex(all_dates).ffill()
-    
-    # Now align to symbol dates only
-    aligned_dates = df.index
-    df_aligned = df_reindexed.loc[aligned_dates]
-    gold_aligned = gold_reindexed.loc[aligned_dates]
-    
-    # Check if we have gold prices for all dates
-    if gold_aligned["Close"].isna().any():
-        # Try backward fill for any remaining NaN
-        gold_aligned = gold_aligned.bfill()
-        if gold_aligned["Close"].isna().any():
-            return pd.DataFrame()  # Can't convert if we don't have gold prices
-    
-    gold_prices = gold_aligned["Close"]
-    
-    # Convert OHLC to gold terms
-    gold_terms = pd.DataFrame({
-        "Open": df_aligned["Open"] / gold_prices,
-        "High": df_aligned["High"] / gold_prices,
-        "Low": df_aligned["Low"] / gold_prices,
-        "Close": df_aligned["Close"] / gold_prices,
-        "Volume": df_aligned["Volume"],  # Volume stays the same
-    }, index=aligned_dates)
-    
-    return gold_terms.dropna()
+    return _convert_to_reference_terms(df, gold_df)
 
 def convert_to_silver_terms(df, silver_df):
     """Convert price data to silver terms (price / silver_price)"""
-    if len(silver_df) == 0 or len(df) == 0:
-        return pd.DataFrame()
-    
-    # Create a combined index with all dates from both dataframes
-    all_dates = df.index.union(silver_df.index).sort_values()
-    
-    # Reindex both dataframes to the combined index and forward fill
-    df_reindexed = df.reindex(all_dates).ffill()
-    silver_reindexed = silver_df[["Close"]].reindex(all_dates).ffill()
-    
-    # Now align to symbol dates only
-    aligned_dates = df.index
-    df_aligned = df_reindexed.loc[aligned_dates]
-    silver_aligned = silver_reindexed.loc[aligned_dates]
-    
-    # Check if we have silver prices for all dates
-    if silver_aligned["Close"].isna().any():
-        # Try backward fill for any remaining NaN
-        silver_aligned = silver_aligned.bfill()
-        if silver_aligned["Close"].isna().any():
-            return pd.DataFrame()  # Can't convert if we don't have silver prices
-    
-    silver_prices = silver_aligned["Close"]
-    
-    # Convert OHLC to silver terms
-    silver_terms = pd.DataFrame({
-        "Open": df_aligned["Open"] / silver_prices,
-        "High": df_aligned["High"] / silver_prices,
-        "Low": df_aligned["Low"] / silver_prices,
-        "Close": df_aligned["Close"] / silver_prices,
-        "Volume": df_aligned["Volume"],  # Volume stays the same
-    }, index=aligned_dates)
-    
-    return silver_terms.dropna()
+    return _convert_to_reference_terms(df, silver_df)
 
 
 def build_silver_gold_ratio_df(silver_df, gold_df):
     """Synthetic OHLCV for Silver/Gold (SI=F / GC=F) — stored as SI/GC in results."""
     if silver_df is None or gold_df is None or len(silver_df) == 0 or len(gold_df) == 0:
         return pd.DataFrame()
-    all_dates = silver_df.index.union(gold_df.index).sort_values()
-    s = silver_df.reindex(all_dates).ffill().bfill()
-    g = gold_df.reindex(all_dates).ffill().bfill()
-    idx = silver_df.index
-    s = s.loc[idx]
-    g = g.loc[idx]
-    g_close = g["Close"].replace(0, pd.NA)
-    ratio = pd.DataFrame(
-        {
-            "Open": s["Open"] / g["Open"].replace(0, pd.NA),
-            "High": s["High"] / g_close,
-            "Low": s["Low"] / g_close,
-            "Close": s["Close"] / g_close,
-            "Volume": s["Volume"],
-        },
-        index=idx,
-    )
-    ratio["High"] = ratio[["Open", "High", "Low", "Close"]].max(axis=1)
-    ratio["Low"] = ratio[["Open", "High", "Low", "Close"]].min(axis=1)
-    return ratio.dropna()
+    silver = silver_df[_OHLC + ["Volume"]]
+    if not silver.index.is_monotonic_increasing:
+        silver = silver.sort_index()
+    if silver.isna().to_numpy().any():
+        silver = silver.ffill().bfill()
+    gold = gold_df[["Open", "Close"]]
+    if not gold.index.is_monotonic_increasing:
+        gold = gold.sort_index()
+    gold = gold.ffill().bfill()
+    
+    # Gold as of each silver bar (bars before gold starts take its first row), zeros as missing
+    g = _align_backward(gold, silver.index).to_numpy(dtype=np.float64)
+    g = np.where(np.isnan(g), gold.iloc[0].to_numpy(dtype=np.float64), g)
+    g[g == 0] = np.nan
+    
+    prices = silver[_OHLC].to_numpy(dtype=np.float64)
+    ratio = np.empty((len(silver), 5))
+    ratio[:, 0] = prices[:, 0] / g[:, 0]
+    ratio[:, 2:4] = prices[:, 2:4] / g[:, 1:2]
+    ratio[:, 1] = prices[:, 1] / g[:, 1]
+    # High/Low span the whole bar, since Open is divided by gold's open rather than its close
+    high, low = ratio[:, :4].max(axis=1), ratio[:, :4].min(axis=1)
+    ratio[:, 1], ratio[:, 2] = high, low
+    ratio[:, 4] = silver["Volume"].to_numpy(dtype=np.float64)
+    keep = ~np.isnan(ratio).any(axis=1)
+    return pd.DataFrame(ratio[keep], index=silver.index[keep], columns=_OHLC + ["Volume"])
 
 
 def _score_silver_gold_into_results(
@@ -512,53 +951,269 @@ def _score_silver_gold_into_results(
 
 def convert_to_crypto_terms(df, crypto_df):
     """Convert price data to crypto terms (price / crypto_price) - for cross-pair analysis"""
-    if len(crypto_df) == 0 or len(df) == 0:
-        return pd.DataFrame()
-    
-    # Create a combined index with all dates from both dataframes
-    all_dates = df.index.union(crypto_df.index).sort_values()
-    
-    # Reindex both dataframes to the combined index and forward fill
-    df_reindexed = df.reindex(all_dates).ffill()
-    crypto_reindexed = crypto_df[["Close"]].reindex(all_dates).ffill()
-    
-    # Now align to symbol dates only
-    aligned_dates = df.index
-    df_aligned = df_reindexed.loc[aligned_dates]
-    crypto_aligned = crypto_reindexed.loc[aligned_dates]
-    
-    # Check if we have crypto prices for all dates
-    if crypto_aligned["Close"].isna().any():
-        # Try backward fill for any remaining NaN
-        crypto_aligned = crypto_aligned.bfill()
-        if crypto_aligned["Close"].isna().any():
-            return pd.DataFrame()  # Can't convert if we don't have crypto prices
-    
-    crypto_prices = crypto_aligned["Close"]
-    
-    # Convert OHLC to crypto terms
-    crypto_terms = pd.DataFrame({
-        "Open": df_aligned["Open"] / crypto_prices,
-        "High": df_aligned["High"] / crypto_prices,
-        "Low": df_aligned["Low"] / crypto_prices,
-        "Close": df_aligned["Close"] / crypto_prices,
-        "Volume": df_aligned["Volume"],  # Volume stays the same
-    }, index=aligned_dates)
-    
-    return crypto_terms.dropna()
+    return _convert_to_reference_terms(df, crypto_df)
 
 # ======================================================
 # GMMA
 # ======================================================
 
-def compute_gmma(close):
-    short_periods = [3, 5, 8, 10, 12, 15]
-    long_periods = [30, 35, 40, 45, 50, 60]
+GMMA_SHORT_PERIODS = (3, 5, 8, 10, 12, 15)
+GMMA_LONG_PERIODS = (30, 35, 40, 45, 50, 60)
+GMMA_MIN_BARS = max(GMMA_LONG_PERIODS)  # longest EMA must be warmed up
+
+
+_GMMA_PERIODS = np.array(GMMA_SHORT_PERIODS + GMMA_LONG_PERIODS, dtype=np.float64)
+# Both scorers read EMA50, EMA200 and the GMMA tails from one fused kernel pass
+# (compute_indicators_tv: TradingView SMA-seeded EMAs, compute_indicators_with_score: pandas ewm)
+_TAIL_EMA_PERIODS = np.concatenate(([50.0, 200.0], _GMMA_PERIODS))
+
+# ======================================================
+# FIXED-WEIGHT SCORE FEATURES
+# Trend / GMMA and volume-flow contributions shared by both calculation methods.
+# Each set is evaluated as one boolean vector; breakdown only lists features that fired.
+# A feature set is (names, weights as recorded in the breakdown, weight vector).
+# ======================================================
+
+FEATURES = (
+    "price_above_ema50",
+    "price_above_ema200",
+    "golden_cross",
+    "death_cross",
+    "gmma_bullish",
+    "gmma_early_expansion",
+    "at_4w_low",
+)
+FEATURE_WEIGHTS = (0.5, 1, 1.5, -1.5, 2, 1, 1)
+WEIGHTS = np.array(FEATURE_WEIGHTS, dtype=np.float64)
+TREND_FEATURE_SET = (FEATURES, FEATURE_WEIGHTS, WEIGHTS)
+
+FLOW_FEATURES = (
+    "macd_bullish",
+    "volume_confirmation",
+    "obv_trending_up",
+    "acc_dist_trending_up",
+)
+FLOW_FEATURE_WEIGHTS = (1, 1, 1, 1)
+FLOW_FEATURE_SET = (FLOW_FEATURES, FLOW_FEATURE_WEIGHTS, np.array(FLOW_FEATURE_WEIGHTS))
+
+
+def trend_feature_mask(result: dict, current_price: float) -> np.ndarray:
+    """Boolean vector aligned with FEATURES for the current indicator values."""
+    ema50, ema200 = result["ema50"], result["ema200"]
+    sma50, sma200 = result["sma50"], result["sma200"]
+    has_smas = sma50 is not None and sma200 is not None
+    w4_low = result["4w_low"]
+    return np.array([
+        ema50 is not None and current_price > ema50,
+        ema200 is not None and current_price > ema200,
+        has_smas and sma50 > sma200,
+        has_smas and not sma50 > sma200,
+        bool(result["gmma_bullish"]),
+        bool(result["gmma_early_expansion"]),
+        w4_low is not None and current_price <= w4_low,
+    ], dtype=bool)
+
+
+def flow_feature_mask(result: dict) -> np.ndarray:
+    """Boolean vector aligned with FLOW_FEATURES; flags left None (not computed) count as not fired."""
+    return np.array([
+        bool(result["macd_bullish"] and result["macd_positive"]),
+        bool(result["volume_above_avg"]),
+        bool(result["obv_trending_up"]),
+        bool(result["acc_dist_trending_up"]),
+    ], dtype=bool)
+
+
+def score_from_features(result: dict, mask: np.ndarray, feature_set: tuple = TREND_FEATURE_SET) -> None:
+    """Add the weighted feature vector to result['score'] and record fired features."""
+    if not mask.any():
+        return
+    names, feature_weights, weights = feature_set
+    result["score"] += np.dot(mask, weights).item()  # int weights keep an int score
+    breakdown = result["score_breakdown"]
+    for name, weight, fired in zip(names, feature_weights, mask):
+        if fired:
+            breakdown[name] = weight
+
+
+# ======================================================
+# SCORE LADDERS
+# Threshold -> fixed contribution tables for the single-indicator scoring cascades.
+# A ladder is (edges, buckets): bisect_right(edges, value) picks the bucket, and a
+# bucket is (weight, breakdown key) or None for no contribution. "< x" branches use
+# x as the edge; "> x" branches use _above(x) so x itself stays in the bucket below.
+# ======================================================
+
+def _above(x: float) -> float:
+    """Smallest float greater than x: the bisect_right edge for a "value > x" branch."""
+    return math.nextafter(x, math.inf)
+
+
+# Crypto/tech: overbought = mean reversion entry, oversold = avoid
+RSI_LADDER_MEAN_REVERSION = (
+    (30, 40, _above(70), _above(75)),
+    ((-1.5, "rsi_oversold_avoid"), (-0.5, "rsi_slightly_oversold_avoid"), None,
+     (1, "rsi_overbought_mean_reversion"), (1.5, "rsi_overbought_mean_reversion")),
+)
+# Commodities/ETFs: standard RSI interpretation
+RSI_LADDER_TREND = (
+    (30, 40, _above(65), _above(70), _above(75), _above(80)),
+    ((2, "rsi_oversold"), (1, "rsi_slightly_oversold"), None, (-1, "rsi_approaching_overbought"),
+     (-2, "rsi_overbought"), (-2.5, "rsi_very_overbought"), (-3, "rsi_extreme_overbought")),
+)
+CCI_LADDER_TV = (
+    (-100, _above(0), _above(100)),
+    ((1.5, "cci_oversold_recovery"), None, (0.5, "cci_bullish"), (-1.5, "cci_overbought")),
+)
+# compute_indicators_with_score grades overbought CCI further
+CCI_LADDER = (
+    (-100, _above(0), _above(100), _above(150), _above(200)),
+    ((1.5, "cci_oversold_recovery"), None, (0.5, "cci_bullish"), (-1.5, "cci_overbought"),
+     (-2.5, "cci_very_overbought"), (-3, "cci_extreme_overbought")),
+)
+MOMENTUM_LADDER = (
+    (-15, -8, _above(3), _above(8), _above(15)),
+    ((-1.5, "very_negative_momentum"), (-1, "negative_momentum"), None, (0.5, "moderate_momentum"),
+     (0.5, "strong_momentum"), (1, "very_strong_momentum")),
+)
+# Price extension above EMA50 (%); weights are scaled by the asset-class multiplier
+OVEREXTENSION_LADDER = (
+    (_above(30), _above(50), _above(100)),
+    (None, (-1, "price_moderate_overextension"), (-2, "price_major_overextension"),
+     (-3, "price_extreme_overextension")),
+)
+
+
+@dataclass(frozen=True)
+class CategoryPolicy:
+    """Category-specific scoring knobs, resolved once per scoring call."""
+    # Crypto/tech: RSI read as mean reversion, trend signals (ADX) less reliable
+    mean_reversion: bool = False
+    adx_multiplier: float = 1.0
+    # Crypto/tech can stay extended above EMA50 longer: scale the overextension penalty down
+    extension_multiplier: float = 1.0
+    volume_surge_bonus: float = 1.0
+
+
+DEFAULT_POLICY = CategoryPolicy()
+_TECH_POLICY = CategoryPolicy(mean_reversion=True, adx_multiplier=0.5, extension_multiplier=0.75)
+_POLICY_BY_CATEGORY = {
+    "cryptocurrencies": CategoryPolicy(
+        mean_reversion=True, adx_multiplier=0.5, extension_multiplier=0.5, volume_surge_bonus=2.0
+    ),
+    "tech_stocks": _TECH_POLICY,
+    "faang_hot_stocks": _TECH_POLICY,
+    "semiconductors": _TECH_POLICY,
+}
+
+
+def category_policy(category: str) -> CategoryPolicy:
+    """Scoring policy for a category; categories without overrides get DEFAULT_POLICY."""
+    return _POLICY_BY_CATEGORY.get(category, DEFAULT_POLICY)
+
+
+def score_ladder(result: dict, ladder: tuple, value, multiplier: float = None) -> None:
+    """Add the contribution of the ladder bucket value falls in (NaN/None add nothing)."""
+    if value is None or value != value:
+        return
+    edges, buckets = ladder
+    bucket = buckets[bisect_right(edges, value)]
+    if bucket is None:
+        return
+    weight, key = bucket
+    delta = weight if multiplier is None else weight * multiplier
+    result["score"] += delta
+    result["score_breakdown"][key] = delta
+
+
+# Predictive detector outcomes -> (score delta, breakdown key)
+_DIVERGENCE_SCORES = {
+    "rsi": {"bearish_divergence": (-1.5, "rsi_bearish_divergence"),
+            "bullish_divergence": (1.5, "rsi_bullish_divergence")},
+    "macd": {"bearish_divergence": (-1, "macd_bearish_divergence"),
+             "bullish_divergence": (1, "macd_bullish_divergence")},
+}
+_BASE_PATTERN_SCORES = {
+    "tight_base": (1, "tight_base_formation"),
+    "ascending_base": (1.5, "ascending_base_formation"),
+    "flat_base": (0.5, "flat_base_formation"),
+}
+
+
+def score_predictive_features(result: dict, features, volume_surge_bonus: float) -> None:
+    """Add divergence, volume surge, base pattern and volatility compression contributions."""
+    hits = [
+        _DIVERGENCE_SCORES["rsi"].get(features.rsi_divergence),
+        _DIVERGENCE_SCORES["macd"].get(features.macd_divergence),
+        # Accumulation before breakout; CATEGORY-SPECIFIC weight (2x for crypto)
+        (volume_surge_bonus, "volume_surge_accumulation") if features.volume_surge else None,
+        _BASE_PATTERN_SCORES.get(features.base_pattern),
+        (1, "volatility_compression") if features.volatility_compression else None,
+    ]
+    for hit in hits:
+        if hit is not None:
+            delta, key = hit
+            result["score"] += delta
+            result["score_breakdown"][key] = delta
+
+
+# Display precision for indicator values; applied once when scoring finishes
+_RESULT_PRECISION = {
+    "close": 4, "ema50": 4, "ema200": 4, "sma50": 4, "sma100": 4, "sma200": 4,
+    "4w_low": 4, "atr": 4,
+    "adx": 2, "rsi": 2, "cci": 2, "atr_pct": 2, "obv": 2, "acc_dist": 2, "momentum": 2,
+}
 
-    short_emas = pd.DataFrame({f"ema_{p}": close.ewm(span=p, adjust=False).mean() for p in short_periods})
-    long_emas = pd.DataFrame({f"ema_{p}": close.ewm(span=p, adjust=False).mean() for p in long_periods})
 
-    return short_emas, long_emas
+# Indicator keys of a scorer result, in output order; None until the scorer computes them
+INDICATOR_RESULT_KEYS = (
+    "rsi",
+    "atr",
+    "atr_pct",  # ATR as percentage of price
+    "close",
+    "ema50",
+    "ema200",
+    "sma50",
+    "sma100",
+    "sma200",
+    "4w_low",
+    "gmma_bullish",
+    "gmma_early_expansion",
+    "macd_bullish",  # MACD line above signal
+    "macd_positive",  # MACD histogram positive
+    "volume_above_avg",  # Volume above 20-day average
+    "momentum",  # Rate of change
+    "adx",
+    "adx_strong_trend",
+    "cci",
+    "obv",
+    "obv_trending_up",
+    "acc_dist",
+    "acc_dist_trending_up",
+)
+
+
+def new_indicator_result() -> dict:
+    """Empty scorer result: every indicator key None, score 0 and a fresh score_breakdown (track what contributed)."""
+    result = dict.fromkeys(INDICATOR_RESULT_KEYS)
+    result["score"] = 0
+    result["score_breakdown"] = {}
+    return result
+
+
+def round_result_values(result: dict) -> None:
+    """Round raw indicator values in place to their display precision."""
+    for key, digits in _RESULT_PRECISION.items():
+        value = result.get(key)
+        if value is not None:
+            result[key] = round(value, digits)
+
+
+def round_breakdown_values(result: dict, digits: int = 1) -> None:
+    """Round score_breakdown contributions in place for display; result['score'] keeps full precision."""
+    breakdown = result["score_breakdown"]
+    for key, value in breakdown.items():
+        breakdown[key] = round(value, digits)
 
 # ======================================================
 # TRADINGVIEW INDICATORS (using tradingview-indicators library)
@@ -576,21 +1231,21 @@ def compute_stochrsi_tv(rsi_values, k_period=3, d_period=3, stoch_period=14):
     if len(rsi_values) < stoch_period + k_period + d_period:
         return None, None
     
-    # Calculate Stochastic of RSI
-    stoch_values = []
-    for i in range(stoch_period - 1, len(rsi_values)):
-        rsi_window = rsi_values[i - stoch_period + 1:i + 1]
-        rsi_low = rsi_window.min()
-        rsi_high = rsi_window.max()
-        rsi_current = rsi_values.iloc[i]
-        
-        if rsi_high - rsi_low == 0:
-            stoch_value = 0
-        else:
-            stoch_value = (rsi_current - rsi_low) / (rsi_high - rsi_low)
-        stoch_values.append(stoch_value)
+    # Calculate Stochastic of RSI: rolling low/high of every stoch_period window at once
+    # (min_count/min_periods=1 skips NaNs inside a window like Series.min/max)
+    rsi_arr = np.ascontiguousarray(rsi_values.to_numpy(dtype=np.float64))
+    if BOTTLENECK_AVAILABLE:
+        rsi_low = bn.move_min(rsi_arr, stoch_period, min_count=1)
+        rsi_high = bn.move_max(rsi_arr, stoch_period, min_count=1)
+    else:
+        rsi_rolling = pd.Series(rsi_arr).rolling(stoch_period, min_periods=1)
+        rsi_low = rsi_rolling.min().to_numpy()
+        rsi_high = rsi_rolling.max().to_numpy()
+    rsi_range = rsi_high - rsi_low
+    # Flat window -> 0
+    stoch = np.divide(rsi_arr - rsi_low, rsi_range, out=np.zeros_like(rsi_arr), where=rsi_range != 0)
     
-    stoch_series = pd.Series(stoch_values, index=rsi_values.index[stoch_period - 1:])
+    stoch_series = pd.Series(stoch[stoch_period - 1:], index=rsi_values.index[stoch_period - 1:])
     
     # Smooth %K (K-period SMA of StochRSI)
     stoch_k = stoch_series.rolling(window=k_period).mean()
@@ -619,10 +1274,15 @@ def attach_stoch_rsi(result: dict, rsi_series: pd.Series) -> None:
             )
         except Exception:
             continue
-        if sk is None or len(sk) == 0 or pd.isna(sk.iloc[-1]):
+        if sk is None or len(sk) == 0:
             continue
+        # Plain float NaN checks (x != x) instead of pd.isna dispatch
         sk_v = float(sk.iloc[-1])
-        sd_v = float(sd.iloc[-1]) if sd is not None and len(sd) and not pd.isna(sd.iloc[-1]) else None
+        if sk_v != sk_v:
+            continue
+        sd_v = float(sd.iloc[-1]) if sd is not None and len(sd) else None
+        if sd_v is not None and sd_v != sd_v:
+            sd_v = None
         if sk_v <= 1.0:
             sk_v *= 100.0
             if sd_v is not None:
@@ -633,6 +1293,27 @@ def attach_stoch_rsi(result: dict, rsi_series: pd.Series) -> None:
         return
 
 
+def _tail_mean(values: np.ndarray, window: int) -> float:
+    """Last value of a `window`-bar SMA without building the rolling series (NaN if the window has a NaN)."""
+    return values[-window:].mean()
+
+
+def _last_emas(close: pd.Series, close_arr: np.ndarray, periods: np.ndarray) -> np.ndarray:
+    """Last value of ema(close, p) for each p; the kernel handles NaN-free input, ema() the rest."""
+    if np.isnan(close_arr).any():
+        # ema()'s NaN handling (reweighting across gaps) is not replicated by the kernel
+        return np.array([ema(close, int(p)).iloc[-1] for p in periods])
+    return last_emas(close_arr, periods)
+
+
+def _trend_slope(values, bars: int = 5) -> float:
+    """Mean bar-to-bar change over the last `bars` values, i.e. series.iloc[-bars:].diff().mean()."""
+    tail = np.asarray(values, dtype=np.float64)[-bars:]
+    if np.isnan(tail).any():
+        return float(pd.Series(tail).diff().mean())  # keep diff().mean()'s NaN skipping
+    return float(tail[-1] - tail[0]) / (len(tail) - 1)
+
+
 def compute_indicators_tv(df, category: str = None, is_gold_denominated: bool = False, timeframe: str = "1W", market_context: dict = None):
     """
     Compute indicators using tradingview-indicators library (TradingView-style calculations)
@@ -642,33 +1323,9 @@ def compute_indicators_tv(df, category: str = None, is_gold_denominated: bool =
         category: Category name (e.g., 'cryptocurrencies') for asset-class aware scoring
         is_gold_denominated: Whether this is gold-denominated analysis (less harsh ATR penalties)
     """
-    result = {
-        "rsi": None,
-        "atr": None,
-        "atr_pct": None,
-        "close": None,
-        "ema50": None,
-        "ema200": None,
-        "sma50": None,
-        "sma100": None,
-        "sma200": None,
-        "4w_low": None,
-        "gmma_bullish": None,
-        "gmma_early_expansion": None,
-        "macd_bullish": None,
-        "macd_positive": None,
-        "volume_above_avg": None,
-        "momentum": None,
-        "adx": None,
-        "adx_strong_trend": None,
-        "cci": None,
-        "obv": None,
-        "obv_trending_up": None,
-        "acc_dist": None,
-        "acc_dist_trending_up": None,
-        "score": 0,
-        "score_breakdown": {}
-    }
+    result = new_indicator_result()
+    # Branches record their contributions here (same dict as result["score_breakdown"])
+    breakdown = result["score_breakdown"]
     
     if len(df) == 0:
         return result
@@ -677,167 +1334,119 @@ def compute_indicators_tv(df, category: str = None, is_gold_denominated: bool =
     high = df["High"]
     low = df["Low"]
     volume = df["Volume"]
+    n = len(close)  # bar count shared by every length gate below
+    # Point reads and tail reductions go through the array, not Series indexing
+    close_arr = close.to_numpy(dtype=np.float64)
+    high_arr, low_arr = high.to_numpy(dtype=np.float64), low.to_numpy(dtype=np.float64)
+    volume_arr = volume.to_numpy()  # native dtype: integer volume keeps OBV integral
     
-    result["close"] = round(close.iloc[-1], 4)
+    result["close"] = close_arr[-1]
     
     # === Key Moving Averages (50, 100, 200) ===
+    # Only the last value of each average is used, so none of the full series are built.
+    # EMA tails (EMA50, EMA200, GMMA lanes) come from one pass; lanes longer than the data are NaN.
+    tail_emas = _last_emas(close, close_arr, _TAIL_EMA_PERIODS) if n >= min(50, GMMA_MIN_BARS) else None
+    
     # EMA50
-    if len(close) >= 50:
-        ema50_values = ema(close, 50)
-        result["ema50"] = round(ema50_values.iloc[-1], 4)
+    if n >= 50:
+        result["ema50"] = tail_emas[0]
     
     # EMA200
-    if len(close) >= 200:
-        ema200_values = ema(close, 200)
-        result["ema200"] = round(ema200_values.iloc[-1], 4)
+    if n >= 200:
+        result["ema200"] = tail_emas[1]
     
     # SMA50
-    if len(close) >= 50:
-        sma50_values = sma(close, 50)
-        result["sma50"] = round(sma50_values.iloc[-1], 4)
+    if n >= 50:
+        result["sma50"] = _tail_mean(close_arr, 50)
     
     # SMA100
-    if len(close) >= 100:
-        sma100_values = sma(close, 100)
-        result["sma100"] = round(sma100_values.iloc[-1], 4)
+    if n >= 100:
+        result["sma100"] = _tail_mean(close_arr, 100)
     
     # SMA200
-    if len(close) >= 200:
-        sma200_values = sma(close, 200)
-        result["sma200"] = round(sma200_values.iloc[-1], 4)
-    
-    # === GMMA ===
-    short_periods = [3, 5, 8, 10, 12, 15]
-    long_periods = [30, 35, 40, 45, 50, 60]
-    
-    try:
-        short_emas = pd.DataFrame({f"ema_{p}": ema(close, p) for p in short_periods})
-        long_emas = pd.DataFrame({f"ema_{p}": ema(close, p) for p in long_periods})
-        
-        short_last = short_emas.iloc[-1]
-        long_last = long_emas.iloc[-1]
-        result["gmma_bullish"] = bool(short_last.min() > long_last.max())
+    if n >= 200:
+        result["sma200"] = _tail_mean(close_arr, 200)
+    
+    # === GMMA (needs the longest EMA period) ===
+    if n >= GMMA_MIN_BARS:
+        last = tail_emas[2:]
+        n_short = len(GMMA_SHORT_PERIODS)
+        short_last, long_last = last[:n_short], last[n_short:]
+        # Python floats, so the flags below are plain bools
+        short_min, short_max = float(np.nanmin(short_last)), float(np.nanmax(short_last))
+        result["gmma_bullish"] = short_min > float(np.nanmax(long_last))
         
-        short_spread = short_last.max() - short_last.min()
-        result["gmma_early_expansion"] = bool((short_last.mean() > long_last.mean()) and (short_spread / close.iloc[-1] < 0.03))
-    except:
-        pass
+        short_spread = short_max - short_min
+        result["gmma_early_expansion"] = (float(np.nanmean(short_last)) > float(np.nanmean(long_last))) and (short_spread / float(close_arr[-1]) < 0.03)
     
     # === Recent low (4 weeks) ===
-    if len(close) >= 4:
-        result["4w_low"] = round(close[-4:].min(), 4)
+    if n >= 4:
+        result["4w_low"] = np.nanmin(close_arr[-4:])
     
     # === ADX (Average Directional Index) - Measure trend strength FIRST ===
     # ADX is calculated before RSI to make RSI context-aware
     adx_value = None
     adx_series_stored = None
-    if len(df) >= 14:  # ADX needs at least 14 periods
+    if n >= 14:  # ADX needs at least 14 periods
         try:
             adx_indicator = ADXIndicator(high, low, close, window=14)
             adx_series_stored = adx_indicator.adx()
-            if len(adx_series_stored) > 0 and not pd.isna(adx_series_stored.iloc[-1]):
-                adx_value = adx_series_stored.iloc[-1]
-                result["adx"] = round(adx_value, 2)
-                result["adx_strong_trend"] = bool(adx_value > 25)
-        except:
+            adx_arr = adx_series_stored.to_numpy(dtype=np.float64)
+            if adx_arr.size and not math.isnan(adx_arr[-1]):
+                adx_value = float(adx_arr[-1])
+                result["adx"] = adx_value
+                result["adx_strong_trend"] = adx_value > 25
+        except Exception:
             pass
     
     # === RSI (Context-aware: reduce weight when strong trend detected) ===
     # CATEGORY-SPECIFIC: Crypto and tech stocks show mean-reversion (invert RSI logic)
-    is_crypto = category == "cryptocurrencies"
-    is_tech_stock = category in ["tech_stocks", "faang_hot_stocks", "semiconductors"]
-    use_mean_reversion = is_crypto or is_tech_stock
+    policy = category_policy(category)
     
-    if len(close) >= INDICATOR_WINDOWS["rsi"]:
+    # rsi_values is reused by RSI divergence detection below
+    rsi_values = None
+    if n >= INDICATOR_WINDOWS["rsi"]:
         rsi_values = RSI(close, INDICATOR_WINDOWS["rsi"])
         rsi_value = rsi_values.iloc[-1]
-        result["rsi"] = round(rsi_value, 2)
+        result["rsi"] = rsi_value
         attach_stoch_rsi(result, rsi_values)
         
         # If ADX shows strong trend, RSI signals are less reliable (trend-following > mean-reverting)
         # BUT: For crypto/tech, mean-reversion works better, so don't reduce weight
-        rsi_multiplier = 0.5 if (adx_value is not None and adx_value > 25 and not use_mean_reversion) else 1.0
+        rsi_multiplier = 0.5 if (adx_value is not None and adx_value > 25 and not policy.mean_reversion) else 1.0
         
-        if use_mean_reversion:
-            # MEAN REVERSION LOGIC (Crypto/Tech): Overbought = good entry, Oversold = bad
-            if rsi_value > 75:  # Very overbought = mean reversion opportunity
-                score_add = 1.5 * rsi_multiplier
-                result["score"] += score_add
-                result["score_breakdown"]["rsi_overbought_mean_reversion"] = round(score_add, 1)
-            elif rsi_value > 70:  # Overbought = potential entry
-                score_add = 1 * rsi_multiplier
-                result["score"] += score_add
-                result["score_breakdown"]["rsi_overbought_mean_reversion"] = round(score_add, 1)
-            elif rsi_value < 30:  # Oversold = avoid (may continue down)
-                score_sub = 1.5 * rsi_multiplier
-                result["score"] -= score_sub
-                result["score_breakdown"]["rsi_oversold_avoid"] = round(-score_sub, 1)
-            elif rsi_value < 40:  # Slightly oversold = caution
-                score_sub = 0.5 * rsi_multiplier
-                result["score"] -= score_sub
-                result["score_breakdown"]["rsi_slightly_oversold_avoid"] = round(-score_sub, 1)
-        else:
-            # TREND-FOLLOWING LOGIC (Commodities/ETFs): Standard RSI interpretation
-            if rsi_value < 30:
-                score_add = 2 * rsi_multiplier
-                result["score"] += score_add
-                result["score_breakdown"]["rsi_oversold"] = round(score_add, 1)
-            elif rsi_value < 40:
-                score_add = 1 * rsi_multiplier
-                result["score"] += score_add
-                result["score_breakdown"]["rsi_slightly_oversold"] = round(score_add, 1)
-            elif rsi_value > 80:  # Extreme overbought
-                score_sub = 3 * rsi_multiplier
-                result["score"] -= score_sub
-                result["score_breakdown"]["rsi_extreme_overbought"] = round(-score_sub, 1)
-            elif rsi_value > 75:  # Very overbought
-                score_sub = 2.5 * rsi_multiplier
-                result["score"] -= score_sub
-                result["score_breakdown"]["rsi_very_overbought"] = round(-score_sub, 1)
-            elif rsi_value > 70:  # Overbought
-                score_sub = 2 * rsi_multiplier
-                result["score"] -= score_sub
-                result["score_breakdown"]["rsi_overbought"] = round(-score_sub, 1)
-            elif rsi_value > 65:  # Approaching overbought
-                score_sub = 1 * rsi_multiplier
-                result["score"] -= score_sub
-                result["score_breakdown"]["rsi_approaching_overbought"] = round(-score_sub, 1)
+        # MEAN REVERSION LOGIC (Crypto/Tech) vs TREND-FOLLOWING LOGIC (Commodities/ETFs)
+        rsi_ladder = RSI_LADDER_MEAN_REVERSION if policy.mean_reversion else RSI_LADDER_TREND
+        score_ladder(result, rsi_ladder, rsi_value, rsi_multiplier)
     
     # === CCI (Commodity Channel Index) - Better for commodities than RSI ===
-    if len(df) >= 20:  # CCI typically uses 20 periods
+    if n >= 20:  # CCI typically uses 20 periods
         try:
-            cci_indicator = CCIIndicator(high, low, close, window=20)
-            cci_series = cci_indicator.cci()
-            if len(cci_series) > 0 and not pd.isna(cci_series.iloc[-1]):
-                cci_value = cci_series.iloc[-1]
-                result["cci"] = round(cci_value, 2)
-                # CCI signals: >100 = overbought, <-100 = oversold, but less prone to false signals
-                if cci_value < -100:  # Oversold recovery
-                    result["score"] += 1.5
-                    result["score_breakdown"]["cci_oversold_recovery"] = 1.5
-                elif cci_value > 100:  # Overbought
-                    result["score"] -= 1.5
-                    result["score_breakdown"]["cci_overbought"] = -1.5
-                elif cci_value > 0:  # Above zero = bullish momentum
-                    result["score"] += 0.5
-                    result["score_breakdown"]["cci_bullish"] = 0.5
-        except:
+            cci_value = cci_last(high_arr, low_arr, close_arr, 20)
+            if not math.isnan(cci_value):
+                result["cci"] = cci_value
+                # CCI signals: >100 = overbought, <-100 = oversold, >0 = bullish momentum
+                score_ladder(result, CCI_LADDER_TV, cci_value)
+        except Exception:
             pass
     
-    # StochRSI removed - redundant with RSI for momentum/overbought-oversold signals
+    # StochRSI is reported (attach_stoch_rsi above) but not scored - redundant with RSI for momentum/overbought-oversold signals
     
     # === ATR (simplified calculation) ===
-    if len(close) >= INDICATOR_WINDOWS["atr"]:
+    # atr_values is reused by volatility compression detection below
+    atr_values = None
+    if n >= INDICATOR_WINDOWS["atr"]:
         # Calculate True Range
-        tr1 = high - low
-        tr2 = abs(high - close.shift(1))
-        tr3 = abs(low - close.shift(1))
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr_values = tr.rolling(window=INDICATOR_WINDOWS["atr"]).mean()
-        atr_value = atr_values.iloc[-1]
-        result["atr"] = round(atr_value, 4)
-        atr_pct = (atr_value / close.iloc[-1]) * 100
-        result["atr_pct"] = round(atr_pct, 2)
+        tr = true_range(high_arr, low_arr, close_arr)
+        if BOTTLENECK_AVAILABLE:
+            atr_arr = bn.move_mean(tr, INDICATOR_WINDOWS["atr"])
+        else:
+            atr_arr = pd.Series(tr).rolling(window=INDICATOR_WINDOWS["atr"]).mean().to_numpy()
+        atr_values = pd.Series(atr_arr, index=close.index, copy=False)
+        atr_value = atr_arr[-1]
+        result["atr"] = atr_value
+        atr_pct = (atr_value / close_arr[-1]) * 100
+        result["atr_pct"] = atr_pct
         
         # ATR is kept as data but NOT used for scoring
         # Volatility is a risk metric, not a buy/sell signal
@@ -846,93 +1455,66 @@ def compute_indicators_tv(df, category: str = None, is_gold_denominated: bool =
         # No penalties or bonuses for ATR - focus on directional signals instead
     
     # === MACD (simplified - using EMA difference) ===
-    if len(close) >= 26:
+    # macd_line is reused by MACD divergence detection below
+    macd_line = None
+    if n >= 26:
         ema12 = ema(close, 12)
         ema26 = ema(close, 26)
         macd_line = ema12 - ema26
         signal_line = ema(macd_line, 9)
-        macd_diff = macd_line - signal_line
+        macd_last = float(macd_line.to_numpy()[-1])
+        signal_last = float(signal_line.to_numpy()[-1])
         
-        if len(macd_line) > 0 and len(signal_line) > 0:
-            result["macd_bullish"] = bool(macd_line.iloc[-1] > signal_line.iloc[-1])
-            result["macd_positive"] = bool(macd_diff.iloc[-1] > 0)
-            if result["macd_bullish"] and result["macd_positive"]:
-                result["score"] += 1
-                result["score_breakdown"]["macd_bullish"] = 1
+        result["macd_bullish"] = macd_last > signal_last
+        result["macd_positive"] = macd_last - signal_last > 0
 
     # === Enhanced Volume Analysis ===
-    if len(volume) >= 20:
-        volume_avg = volume.rolling(window=20).mean()
-        if len(volume_avg) > 0 and volume_avg.iloc[-1] > 0:
-            volume_ratio = volume.iloc[-1] / volume_avg.iloc[-1]
-            result["volume_above_avg"] = bool(volume_ratio > 1.2)
-            if result["volume_above_avg"]:
-                result["score"] += 1
-                result["score_breakdown"]["volume_confirmation"] = 1
+    if n >= 20:
+        volume_avg = _tail_mean(volume_arr, 20)
+        if volume_avg > 0:
+            volume_ratio = float(volume_arr[-1] / volume_avg)
+            result["volume_above_avg"] = volume_ratio > 1.2
     
     # === OBV (On-Balance Volume) - Shows accumulation/distribution ===
-    if len(volume) >= 20:
+    if n >= 20:
         try:
-            obv_indicator = OnBalanceVolumeIndicator(close, volume)
-            obv_series = obv_indicator.on_balance_volume()
-            if len(obv_series) > 0:
-                result["obv"] = round(obv_series.iloc[-1], 2)
-                # Check if OBV is trending up (last 5 periods)
-                if len(obv_series) >= 5:
-                    obv_trend = obv_series.iloc[-5:].diff().mean()
-                    result["obv_trending_up"] = bool(obv_trend > 0)
-                    if result["obv_trending_up"]:
-                        result["score"] += 1
-                        result["score_breakdown"]["obv_trending_up"] = 1
-        except:
+            obv_arr = on_balance_volume(close_arr, volume_arr)
+            result["obv"] = obv_arr[-1]
+            # Check if OBV is trending up (last 5 periods)
+            obv_trend = _trend_slope(obv_arr)
+            result["obv_trending_up"] = obv_trend > 0
+        except Exception:
             pass
     
     # === Accumulation/Distribution Line ===
-    if len(df) >= 20:
+    if n >= 20:
         try:
-            acc_dist_indicator = AccDistIndexIndicator(high, low, close, volume)
-            acc_dist_series = acc_dist_indicator.acc_dist_index()
-            if len(acc_dist_series) > 0:
-                result["acc_dist"] = round(acc_dist_series.iloc[-1], 2)
-                # Check if A/D is trending up (last 5 periods)
-                if len(acc_dist_series) >= 5:
-                    acc_dist_trend = acc_dist_series.iloc[-5:].diff().mean()
-                    result["acc_dist_trending_up"] = bool(acc_dist_trend > 0)
-                    if result["acc_dist_trending_up"]:
-                        result["score"] += 1
-                        result["score_breakdown"]["acc_dist_trending_up"] = 1
-        except:
+            acc_dist_arr = acc_dist_index(high_arr, low_arr, close_arr, volume_arr)
+            result["acc_dist"] = acc_dist_arr[-1]
+            # Check if A/D is trending up (last 5 periods)
+            acc_dist_trend = _trend_slope(acc_dist_arr)
+            result["acc_dist_trending_up"] = acc_dist_trend > 0
+        except Exception:
             pass
 
+    # MACD / volume / OBV / A-D confirmations: one fixed-weight feature set
+    score_from_features(result, flow_feature_mask(result), FLOW_FEATURE_SET)
+
     # === Momentum (Rate of Change) ===
     # Use approximately 10-14 periods for momentum calculation
     # For resampled data, this represents different calendar days per timeframe
     # Cap lookback to reasonable value to avoid extreme calculations
-    lookback = min(14, max(2, len(close) - 1))
-    if lookback >= 2 and len(close) > lookback:
-        momentum = ((close.iloc[-1] / close.iloc[-lookback]) - 1) * 100
-        result["momentum"] = round(momentum, 2)
+    lookback = min(14, max(2, n - 1))
+    if lookback >= 2 and n > lookback:
+        momentum = ((close_arr[-1] / close_arr[-lookback]) - 1) * 100
+        result["momentum"] = momentum
         # Cap extreme values (likely data issues, gaps, or very short timeframes)
         if abs(momentum) > 50:
             momentum = 50 if momentum > 0 else -50
-            result["momentum"] = round(momentum, 2)
+            result["momentum"] = momentum
         
         # More conservative momentum scoring
-        if momentum > 15:  # Very strong momentum (>15%)
-            result["score"] += 1
-            result["score_breakdown"]["very_strong_momentum"] = 1
-        elif momentum > 8:  # Strong momentum (8-15%)
-            result["score"] += 0.5
-            result["score_breakdown"]["strong_momentum"] = 0.5
-        elif momentum > 3:  # Moderate momentum (3-8%)
-            result["score"] += 0.5
-            result["score_breakdown"]["moderate_momentum"] = 0.5
-        elif momentum < -15:  # Very strong negative momentum
-            result["score"] -= 1.5
-            result["score_breakdown"]["very_negative_momentum"] = -1.5
-        elif momentum < -8:  # Strong negative momentum
-            result["score"] -= 1
-            result["score_breakdown"]["negative_momentum"] = -1
+        score_ladder(result, MOMENTUM_LADDER, momentum)
 
     # === ADX Trend Strength Scoring (Improved: Detect Rising vs Falling) ===
     if result["adx"] is not None:
@@ -943,103 +1525,46 @@ def compute_indicators_tv(df, category: str = None, is_gold_denominated: bool =
         if result["adx"] > 30:  # Very strong trend
             if adx_trend == 'rising':
                 result["score"] += 2.5  # Bonus for rising ADX
-                result["score_breakdown"]["adx_very_strong_trend_rising"] = 2.5
+                breakdown["adx_very_strong_trend_rising"] = 2.5
             elif adx_trend == 'falling':
                 result["score"] += 1  # Penalty for falling ADX (trend weakening)
-                result["score_breakdown"]["adx_very_strong_trend_falling"] = 1
+                breakdown["adx_very_strong_trend_falling"] = 1
             else:
                 result["score"] += 2
-                result["score_breakdown"]["adx_very_strong_trend"] = 2
+                breakdown["adx_very_strong_trend"] = 2
         elif result["adx"] > 25:  # Strong trend
             if adx_trend == 'rising':
                 result["score"] += 2  # Bonus for rising ADX (trend starting)
-                result["score_breakdown"]["adx_strong_trend_rising"] = 2
+                breakdown["adx_strong_trend_rising"] = 2
             elif adx_trend == 'falling':
                 result["score"] += 0.5  # Reduced score for falling ADX
-                result["score_breakdown"]["adx_strong_trend_falling"] = 0.5
+                breakdown["adx_strong_trend_falling"] = 0.5
             else:
                 result["score"] += 1.5
-                result["score_breakdown"]["adx_strong_trend"] = 1.5
+                breakdown["adx_strong_trend"] = 1.5
         elif result["adx"] < 20:  # Weak trend / choppy market
             # In weak trends, reduce confidence in trend-following signals
             # Don't penalize, but note that trend signals are less reliable
             pass
         elif result["adx"] >= 20 and adx_trend == 'rising':  # ADX rising from low (20-25) = early trend
             result["score"] += 1.5  # Early trend detection bonus
-            result["score_breakdown"]["adx_rising_from_low"] = 1.5
+            breakdown["adx_rising_from_low"] = 1.5
     
     # === Score additions from price vs Moving Averages / GMMA conditions ===
     # NOTE: Using only EMAs for scoring to avoid double-counting with SMAs
     # SMAs are still calculated and stored for reference, but not used in scoring
-    current_price = close.iloc[-1]
-    
-    # Price above key EMAs (bullish) - more conservative scoring
-    # Only count EMA50 and EMA200 as they're more significant
-    if result["ema50"] is not None and current_price > result["ema50"]:
-        result["score"] += 0.5
-        result["score_breakdown"]["price_above_ema50"] = 0.5
-    if result["ema200"] is not None and current_price > result["ema200"]:
-        result["score"] += 1
-        result["score_breakdown"]["price_above_ema200"] = 1
-    
-    # Golden Cross / Death Cross detection (SMA50 vs SMA200) - major signal
-    # This is a key indicator that would have caught gold's 1970s move
-    if result["sma50"] is not None and result["sma200"] is not None:
-        if result["sma50"] > result["sma200"]:
-            result["score"] += 1.5
-            result["score_breakdown"]["golden_cross"] = 1.5
-        else:
-            result["score"] -= 1.5
-            result["score_breakdown"]["death_cross"] = -1.5
-    
-    # GMMA conditions (simplified - removed compressed as it's less reliable)
-    if result["gmma_bullish"]:
-        result["score"] += 2
-        result["score_breakdown"]["gmma_bullish"] = 2
-    if result["gmma_early_expansion"]:
-        result["score"] += 1
-        result["score_breakdown"]["gmma_early_expansion"] = 1
-    if result["4w_low"] is not None and close.iloc[-1] <= result["4w_low"]:
-        result["score"] += 1
-        result["score_breakdown"]["at_4w_low"] = 1
+    current_price = close_arr[-1]
+    
+    # Price above EMA50/EMA200, Golden/Death Cross (SMA50 vs SMA200), GMMA
+    # bullish/early expansion and 4-week low, scored as one weighted vector
+    score_from_features(result, trend_feature_mask(result, current_price))
     
     # === Overextension Penalty (Price too far above EMA50) ===
     # This catches stocks like AEM (38% above) and AG (88% above) that have already moved
     # CATEGORY-SPECIFIC: Crypto can stay extended longer (reduce penalty)
     if result["ema50"] is not None and result["ema50"] > 0 and current_price > result["ema50"]:
         price_extension_pct = ((current_price / result["ema50"]) - 1) * 100
-
-        # Determine category-specific multiplier
-        # Check which function we're in by checking which variables exist
-        try:
-            # Try second function variables first
-            crypto_flag = is_crypto_2
-            tech_flag = is_tech_stock_2
-        except NameError:
-            # Fall back to first function variables
-            crypto_flag = is_crypto
-            tech_flag = is_tech_stock
-
-        # Crypto: Reduce overextension penalty (crypto can stay extended)
-        if crypto_flag:
-            extension_multiplier = 0.5  # 50% reduction
-        elif tech_flag:
-            extension_multiplier = 0.75  # 25% reduction
-        else:
-            extension_multiplier = 1.0  # Full penalty
-
-        if price_extension_pct > 100:  # Price > 100% above EMA50 (doubled)
-            penalty = -3 * extension_multiplier
-            result["score"] += penalty
-            result["score_breakdown"]["price_extreme_overextension"] = round(penalty, 1)
-        elif price_extension_pct > 50:  # Price > 50% above EMA50
-            penalty = -2 * extension_multiplier
-            result["score"] += penalty
-            result["score_breakdown"]["price_major_overextension"] = round(penalty, 1)
-        elif price_extension_pct > 30:  # Price > 30% above EMA50
-            penalty = -1 * extension_multiplier
-            result["score"] += penalty
-            result["score_breakdown"]["price_moderate_overextension"] = round(penalty, 1)
+        score_ladder(result, OVEREXTENSION_LADDER, price_extension_pct, policy.extension_multiplier)
     
     # === Multiple Overbought Penalty ===
     # If both RSI and CCI are overbought, additional penalty
@@ -1050,110 +1575,42 @@ def compute_indicators_tv(df, category: str = None, is_gold_denominated: bool =
         overbought_count += 1
     if overbought_count >= 2:  # Both RSI and CCI overbought
         result["score"] -= 1
-        result["score_breakdown"]["multiple_overbought_penalty"] = -1
+        breakdown["multiple_overbought_penalty"] = -1
     
     # === 52-Week High Proximity Penalty (Resistance Risk) ===
     # If price is very close to 52-week high, resistance risk increases
-    if len(close) >= 252:  # ~1 year of trading days
-        year_high = close[-252:].max()
+    if n >= 252:  # ~1 year of trading days
+        year_high = np.nanmax(close_arr[-252:])
         distance_from_high_pct = ((year_high - current_price) / year_high) * 100
         if distance_from_high_pct < 2:  # Within 2% of 52-week high
             result["score"] -= 1.5
-            result["score_breakdown"]["near_52w_high_resistance"] = -1.5
+            breakdown["near_52w_high_resistance"] = -1.5
         elif distance_from_high_pct < 5:  # Within 5% of 52-week high
             result["score"] -= 1
-            result["score_breakdown"]["close_to_52w_high"] = -1
+            breakdown["close_to_52w_high"] = -1
     
-    # === Predictive Indicators: Divergence Detection ===
-    if PREDICTIVE_INDICATORS_AVAILABLE:
-        # RSI Divergence Detection
-        if result.get("rsi") is not None and len(close) >= 20:
-            try:
-                rsi_values = RSI(close, INDICATOR_WINDOWS["rsi"])
-                rsi_divergence = detect_rsi_divergence(close, rsi_values, lookback=20)
-                if rsi_divergence == 'bearish_divergence':
-                    result["score"] -= 1.5
-                    result["score_breakdown"]["rsi_bearish_divergence"] = -1.5
-                elif rsi_divergence == 'bullish_divergence':
-                    result["score"] += 1.5
-                    result["score_breakdown"]["rsi_bullish_divergence"] = 1.5
-            except:
-                pass
-        
-        # MACD Divergence Detection
-        if len(close) >= 26:
-            try:
-                ema12 = ema(close, 12)
-                ema26 = ema(close, 26)
-                macd_line = ema12 - ema26
-                macd_divergence = detect_macd_divergence(close, macd_line, lookback=20)
-                if macd_divergence == 'bearish_divergence':
-                    result["score"] -= 1
-                    result["score_breakdown"]["macd_bearish_divergence"] = -1
-                elif macd_divergence == 'bullish_divergence':
-                    result["score"] += 1
-                    result["score_breakdown"]["macd_bullish_divergence"] = 1
-            except:
-                pass
-        
-        # Volume Surge Detection (accumulation before breakout)
-        # CATEGORY-SPECIFIC: More important for crypto (2x weight)
-        if len(volume) >= 20:
-            try:
-                volume_surge = detect_volume_surge(volume, lookback=20, surge_threshold=1.5)
-                if volume_surge:
-                    volume_bonus = 2.0 if is_crypto_2 else 1.0  # Double weight for crypto
-                    result["score"] += volume_bonus
-                    result["score_breakdown"]["volume_surge_accumulation"] = volume_bonus
-            except:
-                pass
-        
-        # Consolidation Base Detection (setup for breakout)
-        if len(close) >= 20:
-            try:
-                base_pattern = detect_consolidation_base(close, lookback=20, tightness_threshold=0.05)
-                if base_pattern == 'tight_base':
-                    result["score"] += 1
-                    result["score_breakdown"]["tight_base_formation"] = 1
-                elif base_pattern == 'ascending_base':
-                    result["score"] += 1.5
-                    result["score_breakdown"]["ascending_base_formation"] = 1.5
-                elif base_pattern == 'flat_base':
-                    result["score"] += 0.5
-                    result["score_breakdown"]["flat_base_formation"] = 0.5
-            except:
-                pass
-        
-        # Volatility Compression Detection (Bollinger Band Squeeze)
-        if result.get("atr") is not None and len(close) >= 20:
-            try:
-                # Calculate ATR series for compression detection
-                tr1 = high - low
-                tr2 = abs(high - close.shift(1))
-                tr3 = abs(low - close.shift(1))
-                tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-                atr_values = tr.rolling(window=INDICATOR_WINDOWS["atr"]).mean()
-                if len(atr_values) >= 20:
-                    volatility_compression = detect_volatility_compression(atr_values, lookback=20)
-                    if volatility_compression:
-                        result["score"] += 1
-                        result["score_breakdown"]["volatility_compression"] = 1
-            except:
-                pass
+    # === Predictive Indicators: Divergence, Volume Surge, Bases, Volatility Compression ===
+    # Every detector looks back 20 bars, so one gate covers the whole section and the
+    # tails are cut once for all of them
+    if PREDICTIVE_INDICATORS_AVAILABLE and n >= 20:
+        try:
+            features = detect_predictive_features(
+                close_arr, rsi_values=rsi_values, macd_line=macd_line, volume=volume_arr, atr_values=atr_values
+            )
+            score_predictive_features(result, features, policy.volume_surge_bonus)
+        except Exception:
+            pass
     
+    round_result_values(result)
+    round_breakdown_values(result)
+
     # Apply improved scoring with explosive bottom detection
-    # Note: original_daily_df defaults to None if not provided. USD path: no prior usd_score (we're computing it).
-    original_daily_for_seasonality = original_daily_df if 'original_daily_df' in locals() and original_daily_df is not None else None
-    try:
-        from scoring.scoring_integration import apply_improved_scoring
-        result = apply_improved_scoring(result, df, category, timeframe=timeframe, market_context=market_context, original_daily_df=original_daily_for_seasonality, usd_score=None, is_gold_denominated=is_gold_denominated)
-    except ImportError:
+    # Note: no daily frame for seasonality here. USD path: no prior usd_score (we're computing it).
+    if apply_improved_scoring is not None:
         try:
-            from scoring_integration import apply_improved_scoring
-            original_daily_for_seasonality = original_daily_df if 'original_daily_df' in locals() and original_daily_df is not None else None
-            result = apply_improved_scoring(result, df, category, timeframe=timeframe, market_context=market_context, original_daily_df=original_daily_for_seasonality, usd_score=None, is_gold_denominated=is_gold_denominated)
+            result = apply_improved_scoring(result, df, category, timeframe=timeframe, market_context=market_context, original_daily_df=None, usd_score=None, is_gold_denominated=is_gold_denominated)
         except ImportError:
-            pass  # Fall back to original scoring if improved scoring not available
+            pass  # Fall back to original scoring if one of its optional modules is missing
 
     return result
 
@@ -1171,33 +1628,9 @@ def compute_indicators_with_score(df, category: str = None, is_gold_denominated:
         category: Category name (e.g., 'cryptocurrencies') for asset-class aware scoring
         is_gold_denominated: Whether this is gold-denominated analysis (less harsh ATR penalties)
     """
-    result = {
-        "rsi": None,
-        "atr": None,
-        "atr_pct": None,  # ATR as percentage of price
-        "close": None,
-        "ema50": None,
-        "ema200": None,
-        "sma50": None,
-        "sma100": None,
-        "sma200": None,
-        "4w_low": None,
-        "gmma_bullish": None,
-        "gmma_early_expansion": None,
-        "macd_bullish": None,  # MACD line above signal
-        "macd_positive": None,  # MACD histogram positive
-        "volume_above_avg": None,  # Volume above 20-day average
-        "momentum": None,  # Rate of change
-        "adx": None,
-        "adx_strong_trend": None,
-        "cci": None,
-        "obv": None,
-        "obv_trending_up": None,
-        "acc_dist": None,
-        "acc_dist_trending_up": None,
-        "score": 0,
-        "score_breakdown": {}  # Track what contributed to score
-    }
+    result = new_indicator_result()
+    # Branches record their contributions here (same dict as result["score_breakdown"])
+    breakdown = result["score_breakdown"]
 
     if len(df) == 0:
         return result
@@ -1206,164 +1639,110 @@ def compute_indicators_with_score(df, category: str = None, is_gold_denominated:
     high = df["High"]
     low = df["Low"]
     volume = df["Volume"]
+    n = len(close)  # bar count shared by every length gate below
+    # Last-value lookups and the indicator kernels read raw ndarrays; Series are kept for
+    # the remaining rolling/ewm indicators
+    close_arr = close.to_numpy(dtype=np.float64)
+    high_arr, low_arr = high.to_numpy(dtype=np.float64), low.to_numpy(dtype=np.float64)
+    volume_arr = volume.to_numpy()  # native dtype: integer volume keeps OBV integral
 
-    result["close"] = round(close.iloc[-1], 4)
+    result["close"] = close_arr[-1]
 
     # === Key Moving Averages (simplified - only 50 and 200) ===
-    # EMA50
-    if len(close) >= 50:
-        ema50 = close.ewm(span=50, adjust=False).mean()
-        result["ema50"] = round(ema50.iloc[-1], 4)
-    
-    # EMA200
-    if len(close) >= 200:
-        ema200 = close.ewm(span=200, adjust=False).mean()
-        result["ema200"] = round(ema200.iloc[-1], 4)
+    # EMA tails (EMA50, EMA200, GMMA lanes) come from one pass, no full-length series
+    tail_emas = ewm_last(close_arr, _TAIL_EMA_PERIODS)
+    if n >= 50:
+        result["ema50"] = tail_emas[0]
+    if n >= 200:
+        result["ema200"] = tail_emas[1]
     
     # SMA50
-    if len(close) >= 50:
-        sma50 = SMAIndicator(close, window=50).sma_indicator()
-        result["sma50"] = round(sma50.iloc[-1], 4)
+    if n >= 50:
+        result["sma50"] = float(close_arr[-50:].mean())
     
     # SMA100
-    if len(close) >= 100:
-        sma100 = SMAIndicator(close, window=100).sma_indicator()
-        result["sma100"] = round(sma100.iloc[-1], 4)
+    if n >= 100:
+        result["sma100"] = float(close_arr[-100:].mean())
     
     # SMA200
-    if len(close) >= 200:
-        sma200 = SMAIndicator(close, window=200).sma_indicator()
-        result["sma200"] = round(sma200.iloc[-1], 4)
+    if n >= 200:
+        result["sma200"] = float(close_arr[-200:].mean())
 
     # === GMMA ===
-    short_emas, long_emas = compute_gmma(close)
-    try:
-        short_last = short_emas.iloc[-1]
-        long_last = long_emas.iloc[-1]
-        result["gmma_bullish"] = short_last.min() > long_last.max()
-
-        short_spread = short_last.max() - short_last.min()
-        result["gmma_early_expansion"] = (short_last.mean() > long_last.mean()) and (short_spread / close.iloc[-1] < 0.03)
-    except IndexError:
-        # Not enough data for GMMA
-        pass
+    # pandas ewm(adjust=False) is defined from the first bar, and df is non-empty here
+    n_short = len(GMMA_SHORT_PERIODS)
+    short_last, long_last = tail_emas[2:2 + n_short], tail_emas[2 + n_short:]
+    # Python floats, so the flags below are plain bools
+    short_min, short_max = float(short_last.min()), float(short_last.max())
+    result["gmma_bullish"] = short_min > float(long_last.max())
+
+    short_spread = short_max - short_min
+    result["gmma_early_expansion"] = (float(short_last.mean()) > float(long_last.mean())) and (short_spread / float(close_arr[-1]) < 0.03)
 
     # === Recent low (4 weeks) ===
-    if len(close) >= 4:
-        result["4w_low"] = round(close[-4:].min(), 4)
+    if n >= 4:
+        result["4w_low"] = close_arr[-4:].min()
 
     # === ADX (Average Directional Index) - Measure trend strength FIRST ===
     # ADX is calculated before RSI to make RSI context-aware
     adx_value = None
     adx_series_stored = None
-    if len(df) >= 14:  # ADX needs at least 14 periods
+    if n >= 14:  # ADX needs at least 14 periods
         try:
             adx_indicator = ADXIndicator(high, low, close, window=14)
             adx_series_stored = adx_indicator.adx()
-            if len(adx_series_stored) > 0 and not pd.isna(adx_series_stored.iloc[-1]):
-                adx_value = adx_series_stored.iloc[-1]
-                result["adx"] = round(adx_value, 2)
-                result["adx_strong_trend"] = bool(adx_value > 25)
+            adx_arr = adx_series_stored.to_numpy(dtype=np.float64)
+            if adx_arr.size and not math.isnan(adx_arr[-1]):
+                adx_value = float(adx_arr[-1])
+                result["adx"] = adx_value
+                result["adx_strong_trend"] = adx_value > 25
         except:
             pass
 
     # === RSI (Context-aware: reduce weight when strong trend detected) ===
     # CATEGORY-SPECIFIC: Crypto and tech stocks show mean-reversion (invert RSI logic)
-    is_crypto_2 = category == "cryptocurrencies"
-    is_tech_stock_2 = category in ["tech_stocks", "faang_hot_stocks", "semiconductors"]
-    use_mean_reversion_2 = is_crypto_2 or is_tech_stock_2
-    
-    if len(close) >= INDICATOR_WINDOWS["rsi"]:
-        rsi = RSIIndicator(close, INDICATOR_WINDOWS["rsi"]).rsi()
-        rsi_value = rsi.iloc[-1]
-        result["rsi"] = round(rsi_value, 2)
+    policy = category_policy(category)
+    
+    # rsi is reused by RSI divergence detection below
+    rsi = None
+    if n >= INDICATOR_WINDOWS["rsi"]:
+        rsi_arr = wilder_rsi(close_arr, INDICATOR_WINDOWS["rsi"])
+        rsi = pd.Series(rsi_arr, index=close.index, copy=False)
+        rsi_value = rsi_arr[-1]
+        result["rsi"] = rsi_value
         attach_stoch_rsi(result, rsi)
         
         # If ADX shows strong trend, RSI signals are less reliable (trend-following > mean-reverting)
         # BUT: For crypto/tech, mean-reversion works better, so don't reduce weight
-        rsi_multiplier = 0.5 if (adx_value is not None and adx_value > 25 and not use_mean_reversion_2) else 1.0
+        rsi_multiplier = 0.5 if (adx_value is not None and adx_value > 25 and not policy.mean_reversion) else 1.0
         
-        if use_mean_reversion_2:
-            # MEAN REVERSION LOGIC (Crypto/Tech): Overbought = good entry, Oversold = bad
-            if rsi_value > 75:  # Very overbought = mean reversion opportunity
-                score_add = 1.5 * rsi_multiplier
-                result["score"] += score_add
-                result["score_breakdown"]["rsi_overbought_mean_reversion"] = round(score_add, 1)
-            elif rsi_value > 70:  # Overbought = potential entry
-                score_add = 1 * rsi_multiplier
-                result["score"] += score_add
-                result["score_breakdown"]["rsi_overbought_mean_reversion"] = round(score_add, 1)
-            elif rsi_value < 30:  # Oversold = avoid (may continue down)
-                score_sub = 1.5 * rsi_multiplier
-                result["score"] -= score_sub
-                result["score_breakdown"]["rsi_oversold_avoid"] = round(-score_sub, 1)
-            elif rsi_value < 40:  # Slightly oversold = caution
-                score_sub = 0.5 * rsi_multiplier
-                result["score"] -= score_sub
-                result["score_breakdown"]["rsi_slightly_oversold_avoid"] = round(-score_sub, 1)
-        else:
-            # TREND-FOLLOWING LOGIC (Commodities/ETFs): Standard RSI interpretation
-            if rsi_value < 30:
-                score_add = 2 * rsi_multiplier
-                result["score"] += score_add
-                result["score_breakdown"]["rsi_oversold"] = round(score_add, 1)
-            elif rsi_value < 40:
-                score_add = 1 * rsi_multiplier
-                result["score"] += score_add
-                result["score_breakdown"]["rsi_slightly_oversold"] = round(score_add, 1)
-            elif rsi_value > 80:  # Extreme overbought
-                score_sub = 3 * rsi_multiplier
-                result["score"] -= score_sub
-                result["score_breakdown"]["rsi_extreme_overbought"] = round(-score_sub, 1)
-            elif rsi_value > 75:  # Very overbought
-                score_sub = 2.5 * rsi_multiplier
-                result["score"] -= score_sub
-                result["score_breakdown"]["rsi_very_overbought"] = round(-score_sub, 1)
-            elif rsi_value > 70:  # Overbought
-                score_sub = 2 * rsi_multiplier
-                result["score"] -= score_sub
-                result["score_breakdown"]["rsi_overbought"] = round(-score_sub, 1)
-            elif rsi_value > 65:  # Approaching overbought
-                score_sub = 1 * rsi_multiplier
-                result["score"] -= score_sub
-                result["score_breakdown"]["rsi_approaching_overbought"] = round(-score_sub, 1)
+        # MEAN REVERSION LOGIC (Crypto/Tech) vs TREND-FOLLOWING LOGIC (Commodities/ETFs)
+        rsi_ladder = RSI_LADDER_MEAN_REVERSION if policy.mean_reversion else RSI_LADDER_TREND
+        score_ladder(result, rsi_ladder, rsi_value, rsi_multiplier)
     
     # === CCI (Commodity Channel Index) - Better for commodities than RSI ===
-    if len(df) >= 20:  # CCI typically uses 20 periods
+    if n >= 20:  # CCI typically uses 20 periods
         try:
-            cci_indicator = CCIIndicator(high, low, close, window=20)
-            cci_series = cci_indicator.cci()
-            if len(cci_series) > 0 and not pd.isna(cci_series.iloc[-1]):
-                cci_value = cci_series.iloc[-1]
-                result["cci"] = round(cci_value, 2)
+            cci_value = cci_last(high_arr, low_arr, close_arr, 20)
+            if not math.isnan(cci_value):
+                result["cci"] = cci_value
                 # CCI signals: >100 = overbought, <-100 = oversold, but less prone to false signals
-                if cci_value < -100:  # Oversold recovery
-                    result["score"] += 1.5
-                    result["score_breakdown"]["cci_oversold_recovery"] = 1.5
-                elif cci_value > 200:  # Extreme overbought
-                    result["score"] -= 3
-                    result["score_breakdown"]["cci_extreme_overbought"] = -3
-                elif cci_value > 150:  # Very overbought
-                    result["score"] -= 2.5
-                    result["score_breakdown"]["cci_very_overbought"] = -2.5
-                elif cci_value > 100:  # Overbought
-                    result["score"] -= 1.5
-                    result["score_breakdown"]["cci_overbought"] = -1.5
-                elif cci_value > 0:  # Above zero = bullish momentum
-                    result["score"] += 0.5
-                    result["score_breakdown"]["cci_bullish"] = 0.5
+                score_ladder(result, CCI_LADDER, cci_value)
         except:
             pass
 
-    # StochRSI removed - redundant with RSI for momentum/overbought-oversold signals
+    # StochRSI is reported (attach_stoch_rsi above) but not scored - redundant with RSI for momentum/overbought-oversold signals
 
     # === ATR ===
-    if len(close) >= INDICATOR_WINDOWS["atr"]:
-        atr = AverageTrueRange(high, low, close, INDICATOR_WINDOWS["atr"]).average_true_range()
-        atr_value = atr.iloc[-1]
-        result["atr"] = round(atr_value, 4)
-        atr_pct = (atr_value / close.iloc[-1]) * 100
-        result["atr_pct"] = round(atr_pct, 2)
+    # atr is reused by volatility compression detection below
+    atr = None
+    if n >= INDICATOR_WINDOWS["atr"]:
+        atr_arr = average_true_range(high_arr, low_arr, close_arr, INDICATOR_WINDOWS["atr"])
+        atr = pd.Series(atr_arr, index=close.index, copy=False)
+        atr_value = atr_arr[-1]
+        result["atr"] = atr_value
+        atr_pct = (atr_value / close_arr[-1]) * 100
+        result["atr_pct"] = atr_pct
         
         # ATR is kept as data but NOT used for scoring
         # Volatility is a risk metric, not a buy/sell signal
@@ -1371,93 +1750,59 @@ def compute_indicators_with_score(df, category: str = None, is_gold_denominated:
         # Volatility is already reflected in momentum and price action indicators
         # No penalties or bonuses for ATR - focus on directional signals instead
 
-    # === MACD ===
-    if len(close) >= 26:  # MACD needs at least 26 periods
-        macd = MACD(close)
-        macd_line = macd.macd()
-        macd_signal = macd.macd_signal()
-        macd_diff = macd.macd_diff()
-        
-        if len(macd_line) > 0 and len(macd_signal) > 0:
-            result["macd_bullish"] = bool(macd_line.iloc[-1] > macd_signal.iloc[-1])
-            result["macd_positive"] = bool(macd_diff.iloc[-1] > 0)
-            if result["macd_bullish"] and result["macd_positive"]:
-                result["score"] += 1
-                result["score_breakdown"]["macd_bullish"] = 1
+    # === MACD (12/26/9, single pass over close) ===
+    if n >= 26:  # MACD needs at least 26 periods
+        macd_value, macd_signal_value, macd_hist_value = map(float, macd_last(close_arr))
+        result["macd_bullish"] = macd_value > macd_signal_value
+        result["macd_positive"] = macd_hist_value > 0
 
     # === Enhanced Volume Analysis ===
-    if len(volume) >= 20:
-        volume_avg = volume.rolling(window=20).mean()
-        if len(volume_avg) > 0 and volume_avg.iloc[-1] > 0:
-            volume_ratio = volume.iloc[-1] / volume_avg.iloc[-1]
-            result["volume_above_avg"] = bool(volume_ratio > 1.2)  # 20% above average
-            if result["volume_above_avg"]:
-                result["score"] += 1  # Volume confirmation
-                result["score_breakdown"]["volume_confirmation"] = 1
+    if n >= 20:
+        volume_avg = _tail_mean(volume_arr, 20)
+        if volume_avg > 0:
+            volume_ratio = float(volume_arr[-1] / volume_avg)
+            result["volume_above_avg"] = volume_ratio > 1.2  # 20% above average
     
     # === OBV (On-Balance Volume) - Shows accumulation/distribution ===
-    if len(volume) >= 20:
+    if n >= 20:
         try:
-            obv_indicator = OnBalanceVolumeIndicator(close, volume)
-            obv_series = obv_indicator.on_balance_volume()
-            if len(obv_series) > 0:
-                result["obv"] = round(obv_series.iloc[-1], 2)
-                # Check if OBV is trending up (last 5 periods)
-                if len(obv_series) >= 5:
-                    obv_trend = obv_series.iloc[-5:].diff().mean()
-                    result["obv_trending_up"] = bool(obv_trend > 0)
-                    if result["obv_trending_up"]:
-                        result["score"] += 1
-                        result["score_breakdown"]["obv_trending_up"] = 1
+            obv_arr = on_balance_volume(close_arr, volume_arr)
+            result["obv"] = obv_arr[-1]
+            # Check if OBV is trending up (last 5 periods)
+            obv_trend = _trend_slope(obv_arr)
+            result["obv_trending_up"] = obv_trend > 0
         except:
             pass
     
     # === Accumulation/Distribution Line ===
-    if len(df) >= 20:
+    if n >= 20:
         try:
-            acc_dist_indicator = AccDistIndexIndicator(high, low, close, volume)
-            acc_dist_series = acc_dist_indicator.acc_dist_index()
-            if len(acc_dist_series) > 0:
-                result["acc_dist"] = round(acc_dist_series.iloc[-1], 2)
-                # Check if A/D is trending up (last 5 periods)
-                if len(acc_dist_series) >= 5:
-                    acc_dist_trend = acc_dist_series.iloc[-5:].diff().mean()
-                    result["acc_dist_trending_up"] = bool(acc_dist_trend > 0)
-                    if result["acc_dist_trending_up"]:
-                        result["score"] += 1
-                        result["score_breakdown"]["acc_dist_trending_up"] = 1
+            acc_dist_arr = acc_dist_index(high_arr, low_arr, close_arr, volume_arr)
+            result["acc_dist"] = acc_dist_arr[-1]
+            # Check if A/D is trending up (last 5 periods)
+            acc_dist_trend = _trend_slope(acc_dist_arr)
+            result["acc_dist_trending_up"] = acc_dist_trend > 0
         except:
             pass
 
+    # MACD / volume / OBV / A-D confirmations: one fixed-weight feature set
+    score_from_features(result, flow_feature_mask(result), FLOW_FEATURE_SET)
+
     # === Momentum (Rate of Change) ===
     # Use approximately 10-14 periods for momentum calculation
     # For resampled data, this represents different calendar days per timeframe
     # Cap lookback to reasonable value to avoid extreme calculations
-    lookback = min(14, max(2, len(close) - 1))
-    if lookback >= 2 and len(close) > lookback:
-        momentum = ((close.iloc[-1] / close.iloc[-lookback]) - 1) * 100
-        result["momentum"] = round(momentum, 2)
+    lookback = min(14, max(2, n - 1))
+    if lookback >= 2 and n > lookback:
+        momentum = ((close_arr[-1] / close_arr[-lookback]) - 1) * 100
+        result["momentum"] = momentum
         # Cap extreme values (likely data issues, gaps, or very short timeframes)
         if abs(momentum) > 50:
             momentum = 50 if momentum > 0 else -50
-            result["momentum"] = round(momentum, 2)
+            result["momentum"] = momentum
         
         # More conservative momentum scoring
-        if momentum > 15:  # Very strong momentum (>15%)
-            result["score"] += 1
-            result["score_breakdown"]["very_strong_momentum"] = 1
-        elif momentum > 8:  # Strong momentum (8-15%)
-            result["score"] += 0.5
-            result["score_breakdown"]["strong_momentum"] = 0.5
-        elif momentum > 3:  # Moderate momentum (3-8%)
-            result["score"] += 0.5
-            result["score_breakdown"]["moderate_momentum"] = 0.5
-        elif momentum < -15:  # Very strong negative momentum
-            result["score"] -= 1.5
-            result["score_breakdown"]["very_negative_momentum"] = -1.5
-        elif momentum < -8:  # Strong negative momentum
-            result["score"] -= 1
-            result["score_breakdown"]["negative_momentum"] = -1
+        score_ladder(result, MOMENTUM_LADDER, momentum)
 
     # === ADX Trend Strength Scoring (Improved: Detect Rising vs Falling) ===
     # CATEGORY-SPECIFIC: Crypto/tech show mean-reversion, so ADX less reliable
@@ -1467,34 +1812,34 @@ def compute_indicators_with_score(df, category: str = None, is_gold_denominated:
             adx_trend = detect_adx_trend(adx_series_stored, periods=5)
         
         # Reduce ADX weight for crypto/tech (mean-reversion works better)
-        adx_multiplier = 0.5 if use_mean_reversion_2 else 1.0
+        adx_multiplier = policy.adx_multiplier
         
         if result["adx"] > 30:  # Very strong trend
             if adx_trend == 'rising':
                 score_add = 2.5 * adx_multiplier
                 result["score"] += score_add
-                result["score_breakdown"]["adx_very_strong_trend_rising"] = round(score_add, 1)
+                breakdown["adx_very_strong_trend_rising"] = score_add
             elif adx_trend == 'falling':
                 score_add = 1 * adx_multiplier
                 result["score"] += score_add
-                result["score_breakdown"]["adx_very_strong_trend_falling"] = round(score_add, 1)
+                breakdown["adx_very_strong_trend_falling"] = score_add
             else:
                 score_add = 2 * adx_multiplier
                 result["score"] += score_add
-                result["score_breakdown"]["adx_very_strong_trend"] = round(score_add, 1)
+                breakdown["adx_very_strong_trend"] = score_add
         elif result["adx"] > 25:  # Strong trend
             if adx_trend == 'rising':
                 score_add = 2 * adx_multiplier
                 result["score"] += score_add
-                result["score_breakdown"]["adx_strong_trend_rising"] = round(score_add, 1)
+                breakdown["adx_strong_trend_rising"] = score_add
             elif adx_trend == 'falling':
                 score_add = 0.5 * adx_multiplier
                 result["score"] += score_add
-                result["score_breakdown"]["adx_strong_trend_falling"] = round(score_add, 1)
+                breakdown["adx_strong_trend_falling"] = score_add
             else:
                 score_add = 1.5 * adx_multiplier
                 result["score"] += score_add
-                result["score_breakdown"]["adx_strong_trend"] = round(score_add, 1)
+                breakdown["adx_strong_trend"] = score_add
         elif result["adx"] < 20:  # Weak trend / choppy market
             # In weak trends, reduce confidence in trend-following signals
             # Don't penalize, but note that trend signals are less reliable
@@ -1502,80 +1847,23 @@ def compute_indicators_with_score(df, category: str = None, is_gold_denominated:
         elif result["adx"] >= 20 and adx_trend == 'rising':  # ADX rising from low (20-25) = early trend
             score_add = 1.5 * adx_multiplier
             result["score"] += score_add
-            result["score_breakdown"]["adx_rising_from_low"] = round(score_add, 1)
+            breakdown["adx_rising_from_low"] = score_add
 
     # === Score additions from price vs Moving Averages / GMMA conditions ===
     # NOTE: Using only EMAs for scoring to avoid double-counting with SMAs
     # SMAs are still calculated and stored for reference, but not used in scoring
-    current_price = close.iloc[-1]
-    
-    # Price above key EMAs (bullish) - more conservative scoring
-    # Only count EMA50 and EMA200 as they're more significant
-    if result["ema50"] is not None and current_price > result["ema50"]:
-        result["score"] += 0.5
-        result["score_breakdown"]["price_above_ema50"] = 0.5
-    if result["ema200"] is not None and current_price > result["ema200"]:
-        result["score"] += 1
-        result["score_breakdown"]["price_above_ema200"] = 1
-    
-    # Golden Cross / Death Cross detection (SMA50 vs SMA200) - major signal
-    # This is a key indicator that would have caught gold's 1970s move
-    if result["sma50"] is not None and result["sma200"] is not None:
-        if result["sma50"] > result["sma200"]:
-            result["score"] += 1.5
-            result["score_breakdown"]["golden_cross"] = 1.5
-        else:
-            result["score"] -= 1.5
-            result["score_breakdown"]["death_cross"] = -1.5
-    
-    # GMMA conditions (simplified - removed compressed as it's less reliable)
-    if result["gmma_bullish"]:
-        result["score"] += 2
-        result["score_breakdown"]["gmma_bullish"] = 2
-    if result["gmma_early_expansion"]:
-        result["score"] += 1
-        result["score_breakdown"]["gmma_early_expansion"] = 1
-    if result["4w_low"] is not None and close.iloc[-1] <= result["4w_low"]:
-        result["score"] += 1
-        result["score_breakdown"]["at_4w_low"] = 1
+    current_price = close_arr[-1]
+    
+    # Price above EMA50/EMA200, Golden/Death Cross (SMA50 vs SMA200), GMMA
+    # bullish/early expansion and 4-week low, scored as one weighted vector
+    score_from_features(result, trend_feature_mask(result, current_price))
     
     # === Overextension Penalty (Price too far above EMA50) ===
     # This catches stocks like AEM (38% above) and AG (88% above) that have already moved
     # CATEGORY-SPECIFIC: Crypto can stay extended longer (reduce penalty)
     if result["ema50"] is not None and result["ema50"] > 0 and current_price > result["ema50"]:
         price_extension_pct = ((current_price / result["ema50"]) - 1) * 100
-
-        # Determine category-specific multiplier
-        # Check which function we're in by checking which variables exist
-        try:
-            # Try second function variables first
-            crypto_flag = is_crypto_2
-            tech_flag = is_tech_stock_2
-        except NameError:
-            # Fall back to first function variables
-            crypto_flag = is_crypto
-            tech_flag = is_tech_stock
-
-        # Crypto: Reduce overextension penalty (crypto can stay extended)
-        if crypto_flag:
-            extension_multiplier = 0.5  # 50% reduction
-        elif tech_flag:
-            extension_multiplier = 0.75  # 25% reduction
-        else:
-            extension_multiplier = 1.0  # Full penalty
-
-        if price_extension_pct > 100:  # Price > 100% above EMA50 (doubled)
-            penalty = -3 * extension_multiplier
-            result["score"] += penalty
-            result["score_breakdown"]["price_extreme_overextension"] = round(penalty, 1)
-        elif price_extension_pct > 50:  # Price > 50% above EMA50
-            penalty = -2 * extension_multiplier
-            result["score"] += penalty
-            result["score_breakdown"]["price_major_overextension"] = round(penalty, 1)
-        elif price_extension_pct > 30:  # Price > 30% above EMA50
-            penalty = -1 * extension_multiplier
-            result["score"] += penalty
-            result["score_breakdown"]["price_moderate_overextension"] = round(penalty, 1)
+        score_ladder(result, OVEREXTENSION_LADDER, price_extension_pct, policy.extension_multiplier)
     
     # === Multiple Overbought Penalty ===
     # If both RSI and CCI are overbought, additional penalty
@@ -1586,114 +1874,54 @@ def compute_indicators_with_score(df, category: str = None, is_gold_denominated:
         overbought_count += 1
     if overbought_count >= 2:  # Both RSI and CCI overbought
         result["score"] -= 1
-        result["score_breakdown"]["multiple_overbought_penalty"] = -1
+        breakdown["multiple_overbought_penalty"] = -1
     
     # === 52-Week High Proximity Penalty (Resistance Risk) ===
     # If price is very close to 52-week high, resistance risk increases
-    if len(close) >= 252:  # ~1 year of trading days
-        year_high = close[-252:].max()
+    if n >= 252:  # ~1 year of trading days
+        year_high = close_arr[-252:].max()
         distance_from_high_pct = ((year_high - current_price) / year_high) * 100
         if distance_from_high_pct < 2:  # Within 2% of 52-week high
             result["score"] -= 1.5
-            result["score_breakdown"]["near_52w_high_resistance"] = -1.5
+            breakdown["near_52w_high_resistance"] = -1.5
         elif distance_from_high_pct < 5:  # Within 5% of 52-week high
             result["score"] -= 1
-            result["score_breakdown"]["close_to_52w_high"] = -1
+            breakdown["close_to_52w_high"] = -1
     
     # === Conflict Detection ===
     # Penalize conflicting signals (e.g., overbought RSI with strong momentum)
     if result.get("rsi") is not None and result.get("momentum") is not None:
         if result["rsi"] > 70 and result["momentum"] > 15:
             result["score"] -= 1  # Overbought + extreme momentum = warning
-            result["score_breakdown"]["overbought_momentum_conflict"] = -1
+            breakdown["overbought_momentum_conflict"] = -1
         elif result["rsi"] < 30 and result["momentum"] < -15:
             result["score"] += 0.5  # Oversold + extreme negative momentum = potential reversal
-            result["score_breakdown"]["oversold_reversal_potential"] = 0.5
+            breakdown["oversold_reversal_potential"] = 0.5
     
-    # === Predictive Indicators: Divergence Detection ===
-    if PREDICTIVE_INDICATORS_AVAILABLE:
-        # RSI Divergence Detection
-        if result.get("rsi") is not None and len(close) >= 20:
-            try:
-                rsi = RSIIndicator(close, INDICATOR_WINDOWS["rsi"]).rsi()
-                rsi_divergence = detect_rsi_divergence(close, rsi, lookback=20)
-                if rsi_divergence == 'bearish_divergence':
-                    result["score"] -= 1.5
-                    result["score_breakdown"]["rsi_bearish_divergence"] = -1.5
-                elif rsi_divergence == 'bullish_divergence':
-                    result["score"] += 1.5
-                    result["score_breakdown"]["rsi_bullish_divergence"] = 1.5
-            except:
-                pass
-        
-        # MACD Divergence Detection
-        if len(close) >= 26:
-            try:
-                macd = MACD(close)
-                macd_line = macd.macd()
-                macd_divergence = detect_macd_divergence(close, macd_line, lookback=20)
-                if macd_divergence == 'bearish_divergence':
-                    result["score"] -= 1
-                    result["score_breakdown"]["macd_bearish_divergence"] = -1
-                elif macd_divergence == 'bullish_divergence':
-                    result["score"] += 1
-                    result["score_breakdown"]["macd_bullish_divergence"] = 1
-            except:
-                pass
-        
-        # Volume Surge Detection (accumulation before breakout)
-        # CATEGORY-SPECIFIC: More important for crypto (2x weight)
-        if len(volume) >= 20:
-            try:
-                volume_surge = detect_volume_surge(volume, lookback=20, surge_threshold=1.5)
-                if volume_surge:
-                    volume_bonus = 2.0 if is_crypto_2 else 1.0  # Double weight for crypto
-                    result["score"] += volume_bonus
-                    result["score_breakdown"]["volume_surge_accumulation"] = volume_bonus
-            except:
-                pass
-        
-        # Consolidation Base Detection (setup for breakout)
-        if len(close) >= 20:
-            try:
-                base_pattern = detect_consolidation_base(close, lookback=20, tightness_threshold=0.05)
-                if base_pattern == 'tight_base':
-                    result["score"] += 1
-                    result["score_breakdown"]["tight_base_formation"] = 1
-                elif base_pattern == 'ascending_base':
-                    result["score"] += 1.5
-                    result["score_breakdown"]["ascending_base_formation"] = 1.5
-                elif base_pattern == 'flat_base':
-                    result["score"] += 0.5
-                    result["score_breakdown"]["flat_base_formation"] = 0.5
-            except:
-                pass
-        
-        # Volatility Compression Detection (Bollinger Band Squeeze)
-        if result.get("atr") is not None and len(close) >= 20:
-            try:
-                atr = AverageTrueRange(high, low, close, INDICATOR_WINDOWS["atr"]).average_true_range()
-                if len(atr) >= 20:
-                    volatility_compression = detect_volatility_compression(atr, lookback=20)
-                    if volatility_compression:
-                        result["score"] += 1
-                        result["score_breakdown"]["volatility_compression"] = 1
-            except:
-                pass
+    # === Predictive Indicators: Divergence, Volume Surge, Bases, Volatility Compression ===
+    if PREDICTIVE_INDICATORS_AVAILABLE and n >= 20:
+        try:
+            macd_line = None
+            if n >= 26:
+                macd_line = (close.ewm(span=12, min_periods=12, adjust=False).mean()
+                             - close.ewm(span=26, min_periods=26, adjust=False).mean())
+            features = detect_predictive_features(
+                close_arr, rsi_values=rsi, macd_line=macd_line, volume=volume_arr, atr_values=atr
+            )
+            score_predictive_features(result, features, policy.volume_surge_bonus)
+        except Exception:
+            pass
     
+    round_result_values(result)
+    round_breakdown_values(result)
+
     # Apply improved scoring with explosive bottom detection
     # Note: original_daily_df defaults to None if not provided
-    original_daily_for_seasonality = original_daily_df if 'original_daily_df' in locals() and original_daily_df is not None else None
-    try:
-        from scoring.scoring_integration import apply_improved_scoring
-        result = apply_improved_scoring(result, df, category, timeframe=timeframe, market_context=market_context, original_daily_df=original_daily_for_seasonality, usd_score=usd_score, is_gold_denominated=is_gold_denominated)
-    except ImportError:
+    if apply_improved_scoring is not None:
         try:
-            from scoring_integration import apply_improved_scoring
-            original_daily_for_seasonality = original_daily_df if 'original_daily_df' in locals() and original_daily_df is not None else None
-            result = apply_improved_scoring(result, df, category, timeframe=timeframe, market_context=market_context, original_daily_df=original_daily_for_seasonality, usd_score=usd_score, is_gold_denominated=is_gold_denominated)
+            result = apply_improved_scoring(result, df, category, timeframe=timeframe, market_context=market_context, original_daily_df=original_daily_df, usd_score=usd_score, is_gold_denominated=is_gold_denominated)
         except ImportError:
-            pass  # Fall back to original scoring if improved scoring not available
+            pass  # Fall back to original scoring if one of its optional modules is missing
 
     return result
 
@@ -1701,99 +1929,292 @@ def compute_indicators_with_score(df, category: str = None, is_gold_denominated:
 # RELATIVE UPSIDE/DOWNSIDE POTENTIAL
 # ======================================================
 
-def calculate_relative_potential(symbol, df, category_symbols):
+PEER_FETCH_WORKERS = 8
+PEER_FETCH_TIMEOUT = 10  # seconds to wait for all of a symbol's uncached peers
+
+# yfinance .info per symbol, fetched at most once per process
+_INFO_CACHE: dict = {}
+_INFO_LOCK = threading.Lock()
+_INFO_SYMBOL_LOCKS: dict = {}
+
+# Market caps move slowly: keep the fields we use on disk for a day across runs
+INFO_CACHE_FILE = CACHE_DIR / "info_cache.json"
+INFO_CACHE_TTL = 86400  # seconds
+_INFO_FIELDS = ("marketCap", "totalAssets")
+_DISK_INFO_CACHE = None  # {symbol: {"marketCap", "totalAssets", "fetched_at"}}, loaded lazily
+_DISK_INFO_DIRTY = False  # entries added since the file was last written
+
+
+def _load_info_cache() -> dict:
+    """Read the on-disk .info cache; a missing or corrupt file yields an empty cache."""
+    try:
+        with open(INFO_CACHE_FILE, "rb") as f:
+            raw = f.read()
+        data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_info_cache(cache: dict) -> None:
     """
-    Calculate relative upside/downside potential based on:
-    1. Technical levels (recent highs/lows, support/resistance)
-    2. Market cap comparison within category (for stocks)
-    3. Price position relative to historical range
+    Write the .info cache atomically (tmp file + os.replace).
+    Encoded with orjson when installed.
+    """
+    tmp_file = INFO_CACHE_FILE.with_name(f"{INFO_CACHE_FILE.name}.{os.getpid()}.tmp")
+    payload = orjson.dumps(cache) if ORJSON_AVAILABLE else json.dumps(cache).encode("utf-8")
+    try:
+        with open(tmp_file, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_file, INFO_CACHE_FILE)
+    except OSError:
+        # If cache write fails, continue without caching
+        pass
+
+
+def get_info_cached(symbol, ticker=None):
+    """
+    Return yf.Ticker(symbol).info, fetching each symbol at most once per process.
+    ticker: an existing yf.Ticker for symbol (e.g. from a yf.Tickers batch) to reuse.
+    Backed by INFO_CACHE_FILE (marketCap/totalAssets only) with a 24-hour TTL; new entries
+    reach the file on the next flush_info_cache.
+    Concurrent misses for the same symbol wait on one request; failures (including an .info
+    with none of _INFO_FIELDS, as Yahoo returns when throttling) are not cached.
+    """
+    global _DISK_INFO_CACHE, _DISK_INFO_DIRTY
+    info = _INFO_CACHE.get(symbol)
+    if info is not None:
+        return info
+    with _INFO_LOCK:
+        symbol_lock = _INFO_SYMBOL_LOCKS.setdefault(symbol, threading.Lock())
+        if _DISK_INFO_CACHE is None:
+            _DISK_INFO_CACHE = _load_info_cache()
+    with symbol_lock:
+        info = _INFO_CACHE.get(symbol)
+        if info is not None:
+            return info
+        entry = _DISK_INFO_CACHE.get(symbol)
+        if (isinstance(entry, dict) and time.time() - entry.get("fetched_at", 0) < INFO_CACHE_TTL
+                and any(entry.get(field) is not None for field in _INFO_FIELDS)):
+            info = {field: entry.get(field) for field in _INFO_FIELDS}
+        else:
+            info = (ticker if ticker is not None else yf.Ticker(symbol, session=yf_session())).info or {}
+            if all(info.get(field) is None for field in _INFO_FIELDS):
+                # Empty or throttled response: treat as a failure, so the next call retries
+                return info
+            with _INFO_LOCK:
+                _DISK_INFO_CACHE[symbol] = {
+                    **{field: info.get(field) for field in _INFO_FIELDS},
+                    "fetched_at": time.time(),
+                }
+                _DISK_INFO_DIRTY = True  # written by flush_info_cache, not once per miss
+        _INFO_CACHE[symbol] = info
+    return info
+
+
+def flush_info_cache() -> None:
+    """Write INFO_CACHE_FILE if get_info_cached added entries since the last write."""
+    global _DISK_INFO_DIRTY
+    with _INFO_LOCK:
+        if not _DISK_INFO_DIRTY:
+            return
+        _save_info_cache(_DISK_INFO_CACHE)
+        _DISK_INFO_DIRTY = False
+
+
+def _info_cap(info: dict):
+    """marketCap, or totalAssets for funds/ETFs; None when .info has neither."""
+    return info.get('marketCap') or info.get('totalAssets')
+
+
+def _fetch_cap(symbol, ticker=None):
+    """Return (symbol, marketCap or totalAssets) from yfinance info; cap is None on failure."""
+    try:
+        return symbol, _info_cap(get_info_cached(symbol, ticker))
+    except Exception:
+        return symbol, None
+
+
+INFO_BATCH_SIZE = 20  # symbols per yf.Tickers batch (Yahoo URL-length limit)
+
+# Futures, FX pairs, indices and crypto pairs carry no meaningful marketCap/totalAssets
+_NO_MARKET_CAP = re.compile(r"(=F|-USD|=X)$|^\^")
+NO_MARKET_CAP_CATEGORIES = frozenset({"cryptocurrencies"})
+
+
+def has_market_cap(symbol: str) -> bool:
+    """False for symbols whose .info never carries a usable market cap (skip the network call)."""
+    return not _NO_MARKET_CAP.search(symbol.upper())
+
+
+def prefetch_market_caps(symbols):
+    """
+    Warm the .info cache for a whole category before its symbols are scored.
+    Symbols not cached yet are grouped into yf.Tickers batches of INFO_BATCH_SIZE and
+    each batch is fetched on the peer thread pool, so per-symbol peer comparisons
+    only read the cache.
+    """
+    missing = [s for s in dict.fromkeys(symbols) if s not in _INFO_CACHE and has_market_cap(s)]
+    for i in range(0, len(missing), INFO_BATCH_SIZE):
+        chunk = missing[i:i + INFO_BATCH_SIZE]
+        try:
+            batch = yf.Tickers(" ".join(chunk), session=yf_session()).tickers
+        except Exception:
+            batch = {}
+        with ThreadPoolExecutor(max_workers=min(PEER_FETCH_WORKERS, len(chunk))) as ex:
+            list(ex.map(lambda s: _fetch_cap(s, batch.get(s.upper())), chunk))
+    flush_info_cache()
+
+
+_MARKET_CAP_RELATIVE: dict = {}  # (symbol, peers) -> relative_to_category
+
+
+def _compute_market_cap_relative(symbol, category_symbols):
+    """
+    Market cap of symbol relative to the average of its category peers (stocks/ETFs only).
+    Depends only on the symbol and its peers, so it is computed once per process.
+    """
+    if not has_market_cap(symbol) or len(category_symbols) <= 1:
+        # No peers to compare against: no need to fetch the symbol's own .info either
+        return None
+    key = (symbol, tuple(category_symbols))
+    if key in _MARKET_CAP_RELATIVE:
+        return _MARKET_CAP_RELATIVE[key]
+
+    relative = None
+    try:
+        market_cap = _info_cap(get_info_cached(symbol))
+        if not market_cap:
+            # No cap for the symbol itself: skip the peer lookups entirely
+            _MARKET_CAP_RELATIVE[key] = None
+            return None
+        
+        # Get market caps for category peers. After prefetch_market_caps they are all in
+        # the process cache, so only the misses go to the (network-bound) thread pool.
+        peers = [s for s in category_symbols if s != symbol and has_market_cap(s)]
+        fetched = {}
+        missing = []
+        for s in peers:
+            cached = _INFO_CACHE.get(s)
+            if cached is None:
+                missing.append(s)
+                continue
+            peer_cap = _info_cap(cached)
+            if peer_cap:
+                fetched[s] = peer_cap
+        timed_out = False
+        if missing:
+            # No context manager: its exit would wait on a hung .info call however long Yahoo takes
+            ex = ThreadPoolExecutor(max_workers=min(PEER_FETCH_WORKERS, len(missing)))
+            try:
+                futures = [ex.submit(_fetch_cap, s) for s in missing]
+                for future in as_completed(futures, timeout=PEER_FETCH_TIMEOUT):
+                    peer_symbol, peer_cap = future.result()  # _fetch_cap returns None on failure
+                    if peer_cap:
+                        fetched[peer_symbol] = peer_cap
+            except FuturesTimeoutError:
+                timed_out = True  # Average over the peers that answered in time
+            finally:
+                ex.shutdown(wait=False, cancel_futures=True)
+        # Keep category order so the peer average does not depend on completion order
+        peer_caps = {s: fetched[s] for s in peers if s in fetched}
+        
+        if peer_caps:
+            avg_peer_cap = sum(peer_caps.values()) / len(peer_caps)
+            if avg_peer_cap > 0:
+                # Relative market cap (1.0 = average, >1 = larger, <1 = smaller)
+                relative_cap = market_cap / avg_peer_cap
+                relative = {
+                    "market_cap_ratio": round(relative_cap, 2),
+                    "market_cap": market_cap,
+                    "avg_peer_cap": round(avg_peer_cap, 0),
+                    "peer_count": len(peer_caps)
+                }
+    except Exception:
+        # Network/API failure: not cached, so a later call can retry
+        return None
+
+    if not timed_out:  # A partial peer set is not cached either
+        _MARKET_CAP_RELATIVE[key] = relative
+    return relative
+
+
+_RANGE_SCALE = np.array([100.0, 100.0, 10.0])  # upside %, downside %, range position
+# For daily data, 52 weeks = ~252 trading days (52 * 5 trading days/week)
+RANGE_LOOKBACK_BARS = 252
+
+
+def _compute_price_range_potential(df, lookback: int = RANGE_LOOKBACK_BARS):
+    """
+    Upside/downside to the 52-week high/low and position in that range.
+    Pure array work on df; no network calls.
     """
     if len(df) == 0:
         return {
             "upside_potential_pct": None,
             "downside_potential_pct": None,
-            "relative_to_category": None,
             "price_vs_52w_range": None
         }
     
-    close = df["Close"]
-    high = df["High"]
-    low = df["Low"]
-    current_price = close.iloc[-1]
-    
-    result = {}
-    
-    # 1. Technical levels: Calculate distance to recent highs/lows
-    # For daily data, 52 weeks = ~252 trading days (52 * 5 trading days/week)
-    # Use 252 periods for daily data, or adjust based on data frequency
-    lookback_periods = min(252, len(close))  # 52 weeks (~252 trading days) or available data
-    recent_high = high[-lookback_periods:].max()
-    recent_low = low[-lookback_periods:].min()
-    
-    # Upside potential: distance to recent high
-    if recent_high > current_price:
-        upside_pct = ((recent_high / current_price) - 1) * 100
-        result["upside_potential_pct"] = round(upside_pct, 2)
-    else:
-        result["upside_potential_pct"] = 0  # Already at or above recent high
-    
-    # Downside potential: distance to recent low
-    if recent_low < current_price:
-        downside_pct = ((current_price / recent_low) - 1) * 100
-        result["downside_potential_pct"] = round(downside_pct, 2)
-    else:
-        result["downside_potential_pct"] = 0  # Already at or below recent low
+    close_arr = df["Close"].to_numpy(dtype=np.float64)
+    high_arr = df["High"].to_numpy(dtype=np.float64)
+    low_arr = df["Low"].to_numpy(dtype=np.float64)
     
-    # 2. Price position in 52-week range (0 = at low, 100 = at high)
-    if recent_high > recent_low:
-        price_position = ((current_price - recent_low) / (recent_high - recent_low)) * 100
-        result["price_vs_52w_range"] = round(price_position, 1)
-    else:
-        result["price_vs_52w_range"] = 50  # Neutral if no range
-    
-    # 3. Market cap comparison (for stocks only, not crypto/futures)
-    try:
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
-        market_cap = info.get('marketCap') or info.get('totalAssets')
-        
-        if market_cap and len(category_symbols) > 1:
-            # Get market caps for category peers
-            peer_caps = {}
-            for peer_symbol in category_symbols:
-                if peer_symbol != symbol:
-                    try:
-                        peer_ticker = yf.Ticker(peer_symbol)
-                        peer_info = peer_ticker.info
-                        peer_cap = peer_info.get('marketCap') or peer_info.get('totalAssets')
-                        if peer_cap:
-                            peer_caps[peer_symbol] = peer_cap
-                    except:
-                        continue
-            
-            if peer_caps:
-                avg_peer_cap = sum(peer_caps.values()) / len(peer_caps)
-                if avg_peer_cap > 0:
-                    # Relative market cap (1.0 = average, >1 = larger, <1 = smaller)
-                    relative_cap = market_cap / avg_peer_cap
-                    result["relative_to_category"] = {
-                        "market_cap_ratio": round(relative_cap, 2),
-                        "market_cap": market_cap,
-                        "avg_peer_cap": round(avg_peer_cap, 0),
-                        "peer_count": len(peer_caps)
-                    }
-        else:
-            result["relative_to_category"] = None
-    except:
-        result["relative_to_category"] = None
+    # Technical levels: distance to recent highs/lows and position in that range
+    # (last `lookback` bars, or all available data when shorter)
+    _, _, upside_pct, downside_pct, price_position = range_potential(
+        high_arr, low_arr, close_arr, min(lookback, len(close_arr))
+    )
     
+    # Display precision (2/2/1 decimals) applied in one vectorised round
+    upside_pct, downside_pct, price_position = (
+        np.round(np.array([upside_pct, downside_pct, price_position]) * _RANGE_SCALE) / _RANGE_SCALE
+    )
+    return {
+        "upside_potential_pct": upside_pct,
+        "downside_potential_pct": downside_pct,
+        "price_vs_52w_range": price_position
+    }
+
+
+def calculate_relative_potential(symbol, df, category_symbols):
+    """
+    Calculate relative upside/downside potential based on:
+    1. Technical levels (recent highs/lows, support/resistance)
+    2. Market cap comparison within category (for stocks)
+    3. Price position relative to historical range
+    """
+    result = _compute_price_range_potential(df)
+    result["relative_to_category"] = (
+        _compute_market_cap_relative(symbol, category_symbols) if len(df) > 0 else None
+    )
     return result
 
+
+def _reference_potential(df, ref_df, market_cap_relative):
+    """Relative potential of df in terms of a reference (gold, silver) daily frame."""
+    ref_terms = _convert_to_reference_terms(df, ref_df) if ref_df is not None else pd.DataFrame()
+    return {
+        **_compute_price_range_potential(ref_terms),
+        "relative_to_category": market_cap_relative,
+    }
+
 # ======================================================
 # UTIL
 # ======================================================
 
+# Exact-type lookup for numpy scalars (numpy scalar classes are concrete, so no MRO walk)
+_JSON_SAFE = {
+    np.bool_: bool,
+    **{t: int for t in (np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16, np.uint32, np.uint64)},
+    **{t: float for t in (np.float16, np.float32, np.float64)},
+}
+
+
 def json_safe(obj):
+    convert = _JSON_SAFE.get(type(obj))
+    if convert is not None:
+        return convert(obj)
     if isinstance(obj, (np.bool_,)):
         return bool(obj)
     if isinstance(obj, (np.integer,)):
@@ -1804,11 +2225,434 @@ def json_safe(obj):
         return obj.item()
     return obj
 
+
+def encode_results_json(data) -> bytes:
+    """
+    Encode results as indented JSON bytes.
+    Uses orjson when installed (numpy scalars/arrays encoded natively, json_safe only
+    for anything else); falls back to stdlib json.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            data,
+            default=json_safe,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(data, indent=2, default=json_safe).encode("utf-8")
+
+
+def _atomic_write_bytes(path: Path, payload: bytes) -> None:
+    """Write via a temp file in the same directory + os.replace, so readers never see a partial file."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def write_results_json(path: Path, data) -> None:
+    """Write results as indented JSON, atomically."""
+    _atomic_write_bytes(path, encode_results_json(data))
+
+
+def write_results_bundle(path: Path, all_results: dict, compresslevel: int = 3) -> None:
+    """Write every category's results as one gzip-compressed JSON document, atomically."""
+    _atomic_write_bytes(path, gzip.compress(encode_results_json(all_results), compresslevel=compresslevel))
+
 # ======================================================
 # MAIN
 # ======================================================
 
-def process_category(category_name: str, symbols: list, gold_df=None, silver_df=None, timeframes=None, calculate_potential: bool = False, force_refresh: bool = False):
+# Read-only inputs shared by every symbol of a run; set once per worker process
+_WORKER_GOLD_BY_TF = None  # timeframe label -> resampled gold, None when gold is unavailable
+_WORKER_SILVER_BY_TF = None  # timeframe label -> resampled silver, None when silver is unavailable
+_WORKER_MARKET_CONTEXT = None
+_WORKER_REFERENCE_DAILY = None  # "gold"/"silver" -> daily frame, only set when potential is calculated
+
+
+def _init_symbol_worker(gold_by_tf, silver_by_tf, market_context, reference_daily=None):
+    """
+    ProcessPoolExecutor initializer: ship resampled gold, resampled silver and market context once per worker,
+    plus the daily gold/silver frames the relative potential is measured against.
+    Frames may arrive as SharedFrameSpec, in which case they are attached from shared memory.
+    """
+    global _WORKER_GOLD_BY_TF, _WORKER_SILVER_BY_TF, _WORKER_MARKET_CONTEXT, _WORKER_REFERENCE_DAILY
+    _WORKER_GOLD_BY_TF = _frames_from_shared(gold_by_tf)
+    _WORKER_SILVER_BY_TF = _frames_from_shared(silver_by_tf)
+    _WORKER_MARKET_CONTEXT = market_context
+    _WORKER_REFERENCE_DAILY = _frames_from_shared(reference_daily)
+
+
+def _from_shared(obj):
+    """Worker side: turn a shared-memory spec back into a DataFrame."""
+    return attach_frame(obj) if isinstance(obj, SharedFrameSpec) else obj
+
+
+def _frames_from_shared(frames_by_tf):
+    """_from_shared over a label -> frame dict (None passes through)."""
+    return {label: _from_shared(frame) for label, frame in frames_by_tf.items()} if frames_by_tf is not None else None
+
+
+def process_symbol(symbol: str, category_name: str, timeframes=None, calculate_potential: bool = False, force_refresh: bool = False, category_symbols=None, intraday_df=None):
+    """
+    Download, score and collect every timeframe for one symbol.
+    Resampled gold and silver and market context come from _init_symbol_worker.
+    intraday_df is the prefetched download_intraday frame for 4H (downloaded here when None).
+    
+    Returns:
+        Tuple of (symbol, per-timeframe results dict, timings dict)
+    """
+    category_symbols = category_symbols if category_symbols is not None else [symbol]
+    symbol_start = time.time()
+    print(f"\nProcessing {symbol}...")
+    symbol_results = {}
+    symbol_timing = {
+        'download': 0,
+        'relative_potential': 0,
+        'timeframes': {},
+    }
+    
+    # Fetch data from yFinance (with caching)
+    # For crypto, use maximum available data for seasonality analysis
+    data_period = "max" if category_name == "cryptocurrencies" else "5y"
+    print(f"  Fetching data...", end=" ")
+    download_start = time.time()
+    base_df = download_data(symbol, period=data_period, category=category_name, use_cache=True, force_refresh=force_refresh)
+    symbol_timing['download'] = time.time() - download_start
+    if len(base_df) == 0:
+        print("✗ (no data)")
+        print(f"  Warning: No data available for {symbol}")
+        return symbol, symbol_results, symbol_timing
+    
+    # Check if data was from cache
+    # Cache freshness is evaluated once per symbol from the frame's fetched_at and reused below
+    is_cached = frame_is_fresh(base_df, get_cache_path(category_name, symbol), force_refresh=force_refresh)
+    cache_status = " (cached)" if is_cached else ""
+    print(f"✓ ({len(base_df)} rows){cache_status} [{symbol_timing['download']:.2f}s]")
+    
+    # Calculate relative potential using full dataset (not resampled).
+    # The market-cap comparison is per symbol; only the price range depends on the frame.
+    market_cap_relative = None
+    if calculate_potential:
+        potential_start = time.time()
+        if category_name not in NO_MARKET_CAP_CATEGORIES:
+            market_cap_relative = _compute_market_cap_relative(symbol, category_symbols)
+            flush_info_cache()  # Peers missed by prefetch_market_caps (no-op otherwise)
+        relative_potential = {
+            **_compute_price_range_potential(base_df),
+            "relative_to_category": market_cap_relative,
+        }
+        # Gold/silver terms likewise come from the full daily history, once for every timeframe
+        reference_daily = _WORKER_REFERENCE_DAILY or {}
+        gold_potential = _reference_potential(base_df, reference_daily.get("gold"), market_cap_relative)
+        silver_potential = _reference_potential(base_df, reference_daily.get("silver"), market_cap_relative)
+        symbol_timing['relative_potential'] = time.time() - potential_start
+    else:
+        relative_potential = gold_potential = silver_potential = {
+            "upside_potential_pct": None,
+            "downside_potential_pct": None,
+            "relative_to_category": None,
+            "price_vs_52w_range": None
+        }
+        symbol_timing['relative_potential'] = 0
+
+    # Use provided timeframes or default
+    timeframes_to_process = timeframes if timeframes else TIMEFRAMES
+    gold_by_tf = _WORKER_GOLD_BY_TF
+    silver_by_tf = _WORKER_SILVER_BY_TF
+    market_context = _WORKER_MARKET_CONTEXT
+    
+    for label, rule in timeframes_to_process.items():
+        symbol_results[label] = {}
+        
+        # Initialize timing for this timeframe
+        if label not in symbol_timing['timeframes']:
+            symbol_timing['timeframes'][label] = {
+                'resample': 0,
+                'indicators_usd': 0,
+                'indicators_gold': 0,
+                'gold_conversion': 0,
+            }
+        
+        # For 4H timeframe, download intraday data if needed
+        if label == "4H":
+            # Check if we need intraday data
+            if len(base_df) > 0:
+                avg_bars_per_day = len(base_df) / ((base_df.index[-1] - base_df.index[0]).days + 1) if (base_df.index[-1] - base_df.index[0]).days > 0 else 1
+                if avg_bars_per_day <= 1.5:  # Daily data, need intraday
+                    # 1h data for 4H resampling (60 days max for intraday)
+                    if intraday_df is None:
+                        intraday_df = download_intraday(symbol, category_name, force_refresh)
+                    if len(intraday_df) > 0:
+                        base_df_for_resample = intraday_df
+                    else:
+                        base_df_for_resample = base_df  # Fallback to daily
+                else:
+                    base_df_for_resample = base_df
+            else:
+                base_df_for_resample = base_df
+        else:
+            base_df_for_resample = base_df
+        
+        # Resample
+        resample_start = time.time()
+        df_usd = resample_ohlcv(base_df_for_resample, rule)
+        symbol_timing['timeframes'][label]['resample'] = time.time() - resample_start
+        
+        if len(df_usd) == 0:
+            symbol_results[label]["yfinance"] = {"error": "No data after resampling"}
+            continue
+        
+        # Calculate indicators for USD-denominated prices
+        indicators_start = time.time()
+        # Store timeframe and market_context for improved_scoring to access
+        compute_indicators_with_score._current_timeframe = label
+        compute_indicators_with_score._current_market_context = market_context
+        # For crypto, pass original daily data for seasonality analysis
+        original_daily_for_seasonality = base_df if category_name == "cryptocurrencies" else None
+        try:
+            indicators_ta_usd = compute_indicators_with_score(df_usd, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context, original_daily_df=original_daily_for_seasonality)
+            indicators_tv_usd = compute_indicators_tv(df_usd, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context)
+        except (IndexError, ValueError, KeyError) as e:
+            # Insufficient data for indicators - skip this timeframe
+            print(f"    ⚠️  Skipping {label} timeframe for {symbol}: insufficient data ({type(e).__name__})")
+            symbol_results[label]["yfinance"] = {"error": f"Insufficient data for indicators: {type(e).__name__}"}
+            continue
+        symbol_timing['timeframes'][label]['indicators_usd'] = time.time() - indicators_start
+        
+        # Add relative potential to indicators (same for all timeframes, calculated from full data)
+        indicators_ta_usd["relative_potential"] = relative_potential
+        indicators_tv_usd["relative_potential"] = relative_potential
+        
+        # Calculate indicators for Gold-denominated prices (if gold data available)
+        indicators_ta_gold = None
+        indicators_tv_gold = None
+        
+        if gold_by_tf is not None and symbol != "GC=F":  # Skip gold for itself
+            gold_conv_start = time.time()
+            gold_resampled = gold_by_tf[label]
+            df_gold = convert_to_gold_terms(df_usd, gold_resampled)
+            symbol_timing['timeframes'][label]['gold_conversion'] = time.time() - gold_conv_start
+            
+            if len(df_gold) > 0:
+                gold_indicators_start = time.time()
+                # For crypto, pass original daily data for seasonality analysis
+                original_daily_for_seasonality = base_df if category_name == "cryptocurrencies" else None
+                try:
+                    # Get USD score for cross-validation
+                    usd_score_for_validation = indicators_ta_usd.get('score') if indicators_ta_usd else None
+                    indicators_ta_gold = compute_indicators_with_score(df_gold, category=category_name, is_gold_denominated=True, timeframe=label, market_context=market_context, original_daily_df=original_daily_for_seasonality, usd_score=usd_score_for_validation)
+                    indicators_tv_gold = compute_indicators_tv(df_gold, category=category_name, is_gold_denominated=True, timeframe=label, market_context=market_context)
+                except (IndexError, ValueError, KeyError) as e:
+                    # Insufficient data - skip gold analysis for this timeframe
+                    indicators_ta_gold = None
+                    indicators_tv_gold = None
+                symbol_timing['timeframes'][label]['indicators_gold'] = time.time() - gold_indicators_start
+                indicators_ta_gold["relative_potential"] = gold_potential
+                indicators_tv_gold["relative_potential"] = gold_potential
+        
+        symbol_results[label]["yfinance"] = {
+            "usd": {
+                "ta_library": indicators_ta_usd,
+                "tradingview_library": indicators_tv_usd
+            }
+        }
+        
+        # Add gold-denominated results if available
+        if indicators_ta_gold is not None:
+            symbol_results[label]["yfinance"]["gold"] = {
+                "ta_library": indicators_ta_gold,
+                "tradingview_library": indicators_tv_gold
+            }
+        
+        # Calculate indicators for Silver-denominated prices (if silver data available)
+        indicators_ta_silver = None
+        indicators_tv_silver = None
+        
+        if silver_by_tf is not None and symbol not in ["GC=F", "SI=F"]:  # Skip gold and silver for themselves
+            silver_conv_start = time.time()
+            silver_resampled = silver_by_tf[label]
+            df_silver = convert_to_silver_terms(df_usd, silver_resampled)
+            symbol_timing['timeframes'][label]['silver_conversion'] = time.time() - silver_conv_start
+            
+            if len(df_silver) > 0:
+                silver_indicators_start = time.time()
+                # For crypto, pass original daily data for seasonality analysis
+                original_daily_for_seasonality = base_df if category_name == "cryptocurrencies" else None
+                try:
+                    # Get USD score for cross-validation
+                    usd_score_for_validation = indicators_ta_usd.get('score') if indicators_ta_usd else None
+                    indicators_ta_silver = compute_indicators_with_score(df_silver, category=category_name, is_gold_denominated=True, timeframe=label, market_context=market_context, original_daily_df=original_daily_for_seasonality, usd_score=usd_score_for_validation)
+                    indicators_tv_silver = compute_indicators_tv(df_silver, category=category_name, is_gold_denominated=True, timeframe=label, market_context=market_context)
+                except (IndexError, ValueError, KeyError) as e:
+                    # Insufficient data - skip silver analysis for this timeframe
+                    indicators_ta_silver = None
+                    indicators_tv_silver = None
+                symbol_timing['timeframes'][label]['indicators_silver'] = time.time() - silver_indicators_start
+                indicators_ta_silver["relative_potential"] = silver_potential
+                indicators_tv_silver["relative_potential"] = silver_potential
+        
+        # Add silver-denominated results if available
+        if indicators_ta_silver is not None:
+            symbol_results[label]["yfinance"]["silver"] = {
+                "ta_library": indicators_ta_silver,
+                "tradingview_library": indicators_tv_silver
+            }
+        
+        # For cryptocurrencies: add cross-pair analysis (SOL vs ETH, others vs BTC/ETH)
+        if category_name == "cryptocurrencies":
+            # Download ETH and BTC for cross-pair analysis
+            eth_df = None
+            btc_df = None
+            
+            if symbol == "SOL-USD":
+                # SOL vs ETH
+                try:
+                    eth_ticker = yf.Ticker("ETH-USD", session=yf_session())
+                    eth_df = eth_ticker.history(period="max", interval="1d")
+                    if len(eth_df) > 0:
+                        eth_resampled = resample_ohlcv(eth_df, rule)
+                        df_sol_eth = convert_to_crypto_terms(df_usd, eth_resampled)
+                        if len(df_sol_eth) > 0:
+                            indicators_ta_sol_eth = compute_indicators_with_score(df_sol_eth, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context, original_daily_df=base_df)
+                            indicators_tv_sol_eth = compute_indicators_tv(df_sol_eth, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context)
+                            symbol_results[label]["yfinance"]["eth_denominated"] = {
+                                "ta_library": indicators_ta_sol_eth,
+                                "tradingview_library": indicators_tv_sol_eth
+                            }
+                except:
+                    pass
+            
+            elif symbol not in ["BTC-USD", "ETH-USD"]:
+                # Other cryptos vs BTC and ETH
+                try:
+                    # Get BTC
+                    btc_ticker = yf.Ticker("BTC-USD", session=yf_session())
+                    btc_df = btc_ticker.history(period="max", interval="1d")
+                    
+                    # Get ETH
+                    eth_ticker = yf.Ticker("ETH-USD", session=yf_session())
+                    eth_df = eth_ticker.history(period="max", interval="1d")
+                    
+                    # BTC-denominated
+                    if len(btc_df) > 0:
+                        btc_resampled = resample_ohlcv(btc_df, rule)
+                        df_crypto_btc = convert_to_crypto_terms(df_usd, btc_resampled)
+                        if len(df_crypto_btc) > 0:
+                            indicators_ta_crypto_btc = compute_indicators_with_score(df_crypto_btc, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context, original_daily_df=base_df)
+                            indicators_tv_crypto_btc = compute_indicators_tv(df_crypto_btc, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context)
+                            symbol_results[label]["yfinance"]["btc_denominated"] = {
+                                "ta_library": indicators_ta_crypto_btc,
+                                "tradingview_library": indicators_tv_crypto_btc
+                            }
+                    
+                    # ETH-denominated
+                    if len(eth_df) > 0:
+                        eth_resampled = resample_ohlcv(eth_df, rule)
+                        df_crypto_eth = convert_to_crypto_terms(df_usd, eth_resampled)
+                        if len(df_crypto_eth) > 0:
+                            indicators_ta_crypto_eth = compute_indicators_with_score(df_crypto_eth, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context, original_daily_df=base_df)
+                            indicators_tv_crypto_eth = compute_indicators_tv(df_crypto_eth, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context)
+                            symbol_results[label]["yfinance"]["eth_denominated"] = {
+                                "ta_library": indicators_ta_crypto_eth,
+                                "tradingview_library": indicators_tv_crypto_eth
+                            }
+                except:
+                    pass
+            
+            elif symbol == "ETH-USD":
+                # ETH vs BTC
+                try:
+                    btc_ticker = yf.Ticker("BTC-USD", session=yf_session())
+                    btc_df = btc_ticker.history(period="max", interval="1d")
+                    if len(btc_df) > 0:
+                        btc_resampled = resample_ohlcv(btc_df, rule)
+                        df_eth_btc = convert_to_crypto_terms(df_usd, btc_resampled)
+                        if len(df_eth_btc) > 0:
+                            indicators_ta_eth_btc = compute_indicators_with_score(df_eth_btc, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context, original_daily_df=base_df)
+                            indicators_tv_eth_btc = compute_indicators_tv(df_eth_btc, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context)
+                            symbol_results[label]["yfinance"]["btc_denominated"] = {
+                                "ta_library": indicators_ta_eth_btc,
+                                "tradingview_library": indicators_tv_eth_btc
+                            }
+                except:
+                    pass
+
+    return symbol, symbol_results, symbol_timing
+
+
+def print_benchmark_summary(category_name: str, timings: dict, total_time: float, output_file: Path) -> None:
+    """Write the per-category benchmark summary to stdout in a single write."""
+    symbols = timings['symbols'].values()
+    total_download = sum(t['download'] for t in symbols)
+    total_potential = sum(t['relative_potential'] for t in symbols)
+    total_indicators_usd = sum(
+        sum(tf['indicators_usd'] for tf in s['timeframes'].values())
+        for s in symbols
+    )
+    total_indicators_gold = sum(
+        sum(tf.get('indicators_gold', 0) for tf in s['timeframes'].values())
+        for s in symbols
+    )
+    total_gold_conv = sum(
+        sum(tf.get('gold_conversion', 0) for tf in s['timeframes'].values())
+        for s in symbols
+    )
+
+    def share(seconds):
+        return f"{seconds:.2f}s ({seconds/total_time*100:.1f}%)"
+
+    lines = [
+        f"\n{'=' * 60}",
+        f"BENCHMARK SUMMARY - {category_name.upper()}",
+        f"{'=' * 60}",
+        f"Total execution time: {total_time:.2f}s ({total_time/60:.2f} minutes)",
+        "\nBreakdown:",
+        f"  Gold download: {share(timings['gold_download'])}",
+        f"  Gold/silver resample (all timeframes): {share(timings['gold_resample_total'])}",
+        f"  Batch download: {share(timings['batch_download'])}",
+        f"  Data downloads: {share(total_download)}",
+        f"  Relative potential: {share(total_potential)}",
+        f"  USD indicators: {share(total_indicators_usd)}",
+        f"  Gold conversion: {share(total_gold_conv)}",
+        f"  Gold indicators: {share(total_indicators_gold)}",
+        f"  JSON write: {share(timings['json_write'])}",
+    ]
+
+    # Slowest symbols
+    symbol_times = {
+        sym: sum([
+            t['download'],
+            t['relative_potential'],
+            sum(tf['indicators_usd'] + tf.get('indicators_gold', 0) for tf in t['timeframes'].values())
+        ])
+        for sym, t in timings['symbols'].items()
+    }
+    if symbol_times:
+        lines.append("\nSlowest symbols (top 3):")
+        lines.extend(
+            f"  {sym}: {t:.2f}s"
+            for sym, t in heapq.nlargest(3, symbol_times.items(), key=lambda x: x[1])
+        )
+
+    lines += [
+        f"\n✓ Saved results to {output_file}",
+        "\nNote: Results use yFinance data with two calculation methods:",
+        "      - ta_library: Standard technical analysis library",
+        "      - tradingview_library: TradingView-style calculations",
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+# Pool kinds for per-symbol processing: processes for CPU-bound scoring, threads for
+# download-bound runs (yfinance waits on HTTP without holding the GIL)
+SYMBOL_EXECUTORS = ("process", "thread")
+
+
+def process_category(category_name: str, symbols: list, gold_df=None, silver_df=None, timeframes=None, calculate_potential: bool = False, force_refresh: bool = False, max_workers: int = None, verbose: bool = True, executor: str = "process"):
     """
     Process a single category of symbols.
     
@@ -1819,16 +2663,24 @@ def process_category(category_name: str, symbols: list, gold_df=None, silver_df=
         silver_df: Pre-downloaded silver data (optional)
         timeframes: Dictionary of timeframes to process (defaults to TIMEFRAMES)
         calculate_potential: Whether to calculate relative potential (slower, requires API calls)
+        max_workers: Workers for per-symbol processing (None = one per CPU, 1 = serial)
+        verbose: Print the benchmark summary (disable when calling programmatically in batch)
+        executor: "process" (default) or "thread"; see SYMBOL_EXECUTORS
         
     Returns:
         Tuple of (results_dict, timings_dict)
     """
+    if executor not in SYMBOL_EXECUTORS:
+        raise ValueError(f"executor must be one of {SYMBOL_EXECUTORS}, got {executor!r}")
+
     # Benchmarking
     start_time = time.time()
     timings = {
         'gold_download': 0,
         'silver_download': 0,
         'symbols': {},
+        'gold_resample_total': 0,
+        'batch_download': 0,
         'json_write': 0,
     }
     
@@ -1849,8 +2701,7 @@ def process_category(category_name: str, symbols: list, gold_df=None, silver_df=
             print("  Warning: Could not fetch gold prices. Gold-denominated analysis will be skipped.")
             gold_df = None
         else:
-            cache_file = get_cache_path("gold", "GC=F")
-            cache_status = " (cached)" if cache_file.exists() and not should_refresh_cache(cache_file, force_refresh=False) else ""
+            cache_status = " (cached)" if frame_is_fresh(gold_df, get_cache_path("gold", "GC=F")) else ""
             print(f"  ✓ Gold prices downloaded ({len(gold_df)} rows){cache_status} [{timings['gold_download']:.2f}s]")
     
     # Download silver prices if not provided
@@ -1863,370 +2714,96 @@ def process_category(category_name: str, symbols: list, gold_df=None, silver_df=
             print("  Warning: Could not fetch silver prices. Silver-denominated analysis will be skipped.")
             silver_df = None
         else:
-            cache_file = get_cache_path("precious_metals", "SI=F")
-            cache_status = " (cached)" if cache_file.exists() and not should_refresh_cache(cache_file, force_refresh=False) else ""
+            cache_status = " (cached)" if frame_is_fresh(silver_df, get_cache_path("precious_metals", "SI=F")) else ""
             print(f"  ✓ Silver prices downloaded ({len(silver_df)} rows){cache_status} [{timings['silver_download']:.2f}s]")
     
     # All symbols in this category share the same category list for relative comparisons
     category_symbols = symbols
 
-    for symbol in symbols:
-        symbol_start = time.time()
-        print(f"\nProcessing {symbol}...")
-        results[symbol] = {}
-        
-        # Initialize timing for this symbol
-        if symbol not in timings['symbols']:
-            timings['symbols'][symbol] = {
-                'download': 0,
-                'relative_potential': 0,
-                'timeframes': {},
-            }
-        
-        # Fetch data from yFinance (with caching)
-        # For crypto, use maximum available data for seasonality analysis
-        data_period = "max" if category_name == "cryptocurrencies" else "5y"
-        print(f"  Fetching data...", end=" ")
-        download_start = time.time()
-        base_df = download_data(symbol, period=data_period, category=category_name, use_cache=True, force_refresh=force_refresh)
-        timings['symbols'][symbol]['download'] = time.time() - download_start
-        if len(base_df) == 0:
-            print("✗ (no data)")
-            print(f"  Warning: No data available for {symbol}")
-            continue
-        
-        # Check if data was from cache
-        cache_file = get_cache_path(category_name, symbol)
-        cache_status = " (cached)" if cache_file.exists() and not should_refresh_cache(cache_file, force_refresh=force_refresh) else ""
-        print(f"✓ ({len(base_df)} rows){cache_status} [{timings['symbols'][symbol]['download']:.2f}s]")
-        
-        # Calculate relative potential using full dataset (not resampled)
-        if calculate_potential:
-            potential_start = time.time()
-            relative_potential = calculate_relative_potential(symbol, base_df, category_symbols)
-            timings['symbols'][symbol]['relative_potential'] = time.time() - potential_start
-        else:
-            relative_potential = {
-                "upside_potential_pct": None,
-                "downside_potential_pct": None,
-                "relative_to_category": None,
-                "price_vs_52w_range": None
-            }
-            timings['symbols'][symbol]['relative_potential'] = 0
-
-        # Use provided timeframes or default
-        timeframes_to_process = timeframes if timeframes else TIMEFRAMES
-        
-        for label, rule in timeframes_to_process.items():
-            results[symbol][label] = {}
-            
-            # Initialize timing for this timeframe
-            if label not in timings['symbols'][symbol]['timeframes']:
-                timings['symbols'][symbol]['timeframes'][label] = {
-                    'resample': 0,
-                    'indicators_usd': 0,
-                    'indicators_gold': 0,
-                    'gold_conversion': 0,
-                }
-            
-            # For 4H timeframe, download intraday data if needed
-            if label == "4H":
-                # Check if we need intraday data
-                if len(base_df) > 0:
-                    avg_bars_per_day = len(base_df) / ((base_df.index[-1] - base_df.index[0]).days + 1) if (base_df.index[-1] - base_df.index[0]).days > 0 else 1
-                    if avg_bars_per_day <= 1.5:  # Daily data, need intraday
-                        # Download 1h data for 4H resampling (60 days max for intraday)
-                        intraday_df = download_data(symbol, period="60d", interval="1h", category=category_name, use_cache=False, force_refresh=force_refresh)
-                        if len(intraday_df) > 0:
-                            base_df_for_resample = intraday_df
-                        else:
-                            base_df_for_resample = base_df  # Fallback to daily
-                    else:
-                        base_df_for_resample = base_df
-                else:
-                    base_df_for_resample = base_df
-            else:
-                base_df_for_resample = base_df
-            
-            # Resample
-            resample_start = time.time()
-            df_usd = resample_ohlcv(base_df_for_resample, rule)
-            timings['symbols'][symbol]['timeframes'][label]['resample'] = time.time() - resample_start
-            
-            if len(df_usd) == 0:
-                results[symbol][label]["yfinance"] = {"error": "No data after resampling"}
-                continue
-            
-            # Get market context (once per category, cached)
-            if not hasattr(process_category, '_market_context'):
-                try:
-                    from indicators.market_context import get_market_context
-                    process_category._market_context = get_market_context()
-                except:
-                    process_category._market_context = None
-            
-            market_context = process_category._market_context if hasattr(process_category, '_market_context') else None
-            
-            # Calculate indicators for USD-denominated prices
-            indicators_start = time.time()
-            # Store timeframe and market_context for improved_scoring to access
-            compute_indicators_with_score._current_timeframe = label
-            compute_indicators_with_score._current_market_context = market_context
-            # For crypto, pass original daily data for seasonality analysis
-            original_daily_for_seasonality = base_df if category_name == "cryptocurrencies" else None
-            try:
-                indicators_ta_usd = compute_indicators_with_score(df_usd, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context, original_daily_df=original_daily_for_seasonality)
-                indicators_tv_usd = compute_indicators_tv(df_usd, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context)
-            except (IndexError, ValueError, KeyError) as e:
-                # Insufficient data for indicators - skip this timeframe
-                print(f"    ⚠️  Skipping {label} timeframe for {symbol}: insufficient data ({type(e).__name__})")
-                results[symbol][label]["yfinance"] = {"error": f"Insufficient data for indicators: {type(e).__name__}"}
-                continue
-            timings['symbols'][symbol]['timeframes'][label]['indicators_usd'] = time.time() - indicators_start
-            
-            # Add relative potential to indicators (same for all timeframes, calculated from full data)
-            indicators_ta_usd["relative_potential"] = relative_potential
-            indicators_tv_usd["relative_potential"] = relative_potential
-            
-            # Calculate indicators for Gold-denominated prices (if gold data available)
-            indicators_ta_gold = None
-            indicators_tv_gold = None
-            
-            if gold_df is not None and symbol != "GC=F":  # Skip gold for itself
-                gold_conv_start = time.time()
-                gold_resampled = resample_ohlcv(gold_df, rule)
-                df_gold = convert_to_gold_terms(df_usd, gold_resampled)
-                timings['symbols'][symbol]['timeframes'][label]['gold_conversion'] = time.time() - gold_conv_start
-                
-                if len(df_gold) > 0:
-                    gold_indicators_start = time.time()
-                    # For crypto, pass original daily data for seasonality analysis
-                    original_daily_for_seasonality = base_df if category_name == "cryptocurrencies" else None
-                    try:
-                        # Get USD score for cross-validation
-                        usd_score_for_validation = indicators_ta_usd.get('score') if indicators_ta_usd else None
-                        indicators_ta_gold = compute_indicators_with_score(df_gold, category=category_name, is_gold_denominated=True, timeframe=label, market_context=market_context, original_daily_df=original_daily_for_seasonality, usd_score=usd_score_for_validation)
-                        indicators_tv_gold = compute_indicators_tv(df_gold, category=category_name, is_gold_denominated=True, timeframe=label, market_context=market_context)
-                    except (IndexError, ValueError, KeyError) as e:
-                        # Insufficient data - skip gold analysis for this timeframe
-                        indicators_ta_gold = None
-                        indicators_tv_gold = None
-                    timings['symbols'][symbol]['timeframes'][label]['indicators_gold'] = time.time() - gold_indicators_start
-                    # Calculate relative potential for gold terms too (if enabled)
-                    if calculate_potential:
-                        gold_potential = calculate_relative_potential(symbol, df_gold, category_symbols)
-                    else:
-                        gold_potential = {
-                            "upside_potential_pct": None,
-                            "downside_potential_pct": None,
-                            "relative_to_category": None,
-                            "price_vs_52w_range": None
-                        }
-                    indicators_ta_gold["relative_potential"] = gold_potential
-                    indicators_tv_gold["relative_potential"] = gold_potential
-            
-            results[symbol][label]["yfinance"] = {
-                "usd": {
-                    "ta_library": indicators_ta_usd,
-                    "tradingview_library": indicators_tv_usd
-                }
-            }
-            
-            # Add gold-denominated results if available
-            if indicators_ta_gold is not None:
-                results[symbol][label]["yfinance"]["gold"] = {
-                    "ta_library": indicators_ta_gold,
-                    "tradingview_library": indicators_tv_gold
-                }
-            
-            # Calculate indicators for Silver-denominated prices (if silver data available)
-            indicators_ta_silver = None
-            indicators_tv_silver = None
-            
-            if silver_df is not None and symbol not in ["GC=F", "SI=F"]:  # Skip gold and silver for themselves
-                silver_conv_start = time.time()
-                silver_resampled = resample_ohlcv(silver_df, rule)
-                df_silver = convert_to_silver_terms(df_usd, silver_resampled)
-                timings['symbols'][symbol]['timeframes'][label]['silver_conversion'] = time.time() - silver_conv_start
-                
-                if len(df_silver) > 0:
-                    silver_indicators_start = time.time()
-                    # For crypto, pass original daily data for seasonality analysis
-                    original_daily_for_seasonality = base_df if category_name == "cryptocurrencies" else None
-                    try:
-                        # Get USD score for cross-validation
-                        usd_score_for_validation = indicators_ta_usd.get('score') if indicators_ta_usd else None
-                        indicators_ta_silver = compute_indicators_with_score(df_silver, category=category_name, is_gold_denominated=True, timeframe=label, market_context=market_context, original_daily_df=original_daily_for_seasonality, usd_score=usd_score_for_validation)
-                        indicators_tv_silver = compute_indicators_tv(df_silver, category=category_name, is_gold_denominated=True, timeframe=label, market_context=market_context)
-                    except (IndexError, ValueError, KeyError) as e:
-                        # Insufficient data - skip silver analysis for this timeframe
-                        indicators_ta_silver = None
-                        indicators_tv_silver = None
-                    timings['symbols'][symbol]['timeframes'][label]['indicators_silver'] = time.time() - silver_indicators_start
-                    # Calculate relative potential for silver terms too (if enabled)
-                    if calculate_potential:
-                        silver_potential = calculate_relative_potential(symbol, df_silver, category_symbols)
-                    else:
-                        silver_potential = {
-                            "upside_potential_pct": None,
-                            "downside_potential_pct": None,
-                            "relative_to_category": None,
-                            "price_vs_52w_range": None
-                        }
-                    indicators_ta_silver["relative_potential"] = silver_potential
-                    indicators_tv_silver["relative_potential"] = silver_potential
-            
-            # Add silver-denominated results if available
-            if indicators_ta_silver is not None:
-                results[symbol][label]["yfinance"]["silver"] = {
-                    "ta_library": indicators_ta_silver,
-                    "tradingview_library": indicators_tv_silver
-                }
-            
-            # For cryptocurrencies: add cross-pair analysis (SOL vs ETH, others vs BTC/ETH)
-            if category_name == "cryptocurrencies":
-                # Download ETH and BTC for cross-pair analysis
-                eth_df = None
-                btc_df = None
-                
-                if symbol == "SOL-USD":
-                    # SOL vs ETH
-                    try:
-                        eth_ticker = yf.Ticker("ETH-USD")
-                        eth_df = eth_ticker.history(period="max", interval="1d")
-                        if len(eth_df) > 0:
-                            eth_resampled = resample_ohlcv(eth_df, rule)
-                            df_sol_eth = convert_to_crypto_terms(df_usd, eth_resampled)
-                            if len(df_sol_eth) > 0:
-                                indicators_ta_sol_eth = compute_indicators_with_score(df_sol_eth, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context, original_daily_df=base_df)
-                                indicators_tv_sol_eth = compute_indicators_tv(df_sol_eth, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context)
-                                results[symbol][label]["yfinance"]["eth_denominated"] = {
-                                    "ta_library": indicators_ta_sol_eth,
-                                    "tradingview_library": indicators_tv_sol_eth
-                                }
-                    except:
-                        pass
-                
-                elif symbol not in ["BTC-USD", "ETH-USD"]:
-                    # Other cryptos vs BTC and ETH
-                    try:
-                        # Get BTC
-                        btc_ticker = yf.Ticker("BTC-USD")
-                        btc_df = btc_ticker.history(period="max", interval="1d")
-                        
-                        # Get ETH
-                        eth_ticker = yf.Ticker("ETH-USD")
-                        eth_df = eth_ticker.history(period="max", interval="1d")
-                        
-                        # BTC-denominated
-                        if len(btc_df) > 0:
-                            btc_resampled = resample_ohlcv(btc_df, rule)
-                            df_crypto_btc = convert_to_crypto_terms(df_usd, btc_resampled)
-                            if len(df_crypto_btc) > 0:
-                                indicators_ta_crypto_btc = compute_indicators_with_score(df_crypto_btc, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context, original_daily_df=base_df)
-                                indicators_tv_crypto_btc = compute_indicators_tv(df_crypto_btc, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context)
-                                results[symbol][label]["yfinance"]["btc_denominated"] = {
-                                    "ta_library": indicators_ta_crypto_btc,
-                                    "tradingview_library": indicators_tv_crypto_btc
-                                }
-                        
-                        # ETH-denominated
-                        if len(eth_df) > 0:
-                            eth_resampled = resample_ohlcv(eth_df, rule)
-                            df_crypto_eth = convert_to_crypto_terms(df_usd, eth_resampled)
-                            if len(df_crypto_eth) > 0:
-                                indicators_ta_crypto_eth = compute_indicators_with_score(df_crypto_eth, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context, original_daily_df=base_df)
-                                indicators_tv_crypto_eth = compute_indicators_tv(df_crypto_eth, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context)
-                                results[symbol][label]["yfinance"]["eth_denominated"] = {
-                                    "ta_library": indicators_ta_crypto_eth,
-                                    "tradingview_library": indicators_tv_crypto_eth
-                                }
-                    except:
-                        pass
-                
-                elif symbol == "ETH-USD":
-                    # ETH vs BTC
-                    try:
-                        btc_ticker = yf.Ticker("BTC-USD")
-                        btc_df = btc_ticker.history(period="max", interval="1d")
-                        if len(btc_df) > 0:
-                            btc_resampled = resample_ohlcv(btc_df, rule)
-                            df_eth_btc = convert_to_crypto_terms(df_usd, btc_resampled)
-                            if len(df_eth_btc) > 0:
-                                indicators_ta_eth_btc = compute_indicators_with_score(df_eth_btc, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context, original_daily_df=base_df)
-                                indicators_tv_eth_btc = compute_indicators_tv(df_eth_btc, category=category_name, is_gold_denominated=False, timeframe=label, market_context=market_context)
-                                results[symbol][label]["yfinance"]["btc_denominated"] = {
-                                    "ta_library": indicators_ta_eth_btc,
-                                    "tradingview_library": indicators_tv_eth_btc
-                                }
-                    except:
-                        pass
+    # Get market context (once per process, shared by every symbol)
+    if not hasattr(process_category, '_market_context'):
+        try:
+            from indicators.market_context import get_market_context
+            process_category._market_context = get_market_context()
+        except:
+            process_category._market_context = None
+    market_context = process_category._market_context
+
+    # Resample gold and silver once per timeframe; every symbol reuses the same frames
+    gold_resample_start = time.time()
+    tf_rules = (timeframes if timeframes else TIMEFRAMES).items()
+    gold_by_tf = silver_by_tf = None
+    if gold_df is not None:
+        gold_by_tf = {label: resample_ohlcv(gold_df, rule) for label, rule in tf_rules}
+    if silver_df is not None:
+        silver_by_tf = {label: resample_ohlcv(silver_df, rule) for label, rule in tf_rules}
+    timings['gold_resample_total'] = time.time() - gold_resample_start
+    # Daily gold/silver for the per-symbol relative potential (not shipped when it is off)
+    reference_daily = {"gold": gold_df, "silver": silver_df} if calculate_potential else None
+
+    # Market caps for the whole category in batches, before workers fork off
+    if calculate_potential and category_name not in NO_MARKET_CAP_CATEGORIES:
+        prefetch_market_caps(category_symbols)
+
+    # Price history for every cache-miss symbol in one request; workers then read it from
+    # the cache (symbols fetched here are fresh, so they need no forced re-download)
+    batch_start = time.time()
+    data_period = "max" if category_name == "cryptocurrencies" else "5y"
+    fetched = download_data_batch(symbols, period=data_period, category=category_name, force_refresh=force_refresh)
+    refresh_flags = [force_refresh and symbol not in fetched for symbol in symbols]
+    # 4H is built from 1h bars: fetch them for all symbols concurrently rather than one
+    # blocking request inside each symbol's task
+    intraday = {}
+    if "4H" in (timeframes if timeframes else TIMEFRAMES):
+        intraday = download_intraday_batch(symbols, category=category_name, force_refresh=force_refresh)
+    timings['batch_download'] = time.time() - batch_start
+
+    # Symbols are independent: score them in parallel worker processes
+    worker_count = max_workers if max_workers else min(os.cpu_count() or 1, len(symbols))
+    n = len(symbols)
+    task_args = (
+        [category_name] * n, [timeframes] * n, [calculate_potential] * n, refresh_flags, [category_symbols] * n,
+        [intraday.get(symbol) for symbol in symbols],
+    )
+    if worker_count <= 1 or len(symbols) <= 1:
+        _init_symbol_worker(gold_by_tf, silver_by_tf, market_context, reference_daily)
+        symbol_outputs = list(map(process_symbol, symbols, *task_args))
+    elif executor == "thread":
+        # Threads read this process's worker globals directly; no shared-memory hand-off
+        _init_symbol_worker(gold_by_tf, silver_by_tf, market_context, reference_daily)
+        with ThreadPoolExecutor(max_workers=worker_count) as ex:
+            symbol_outputs = list(ex.map(process_symbol, symbols, *task_args))
+    else:
+        # Frames go to workers through shared memory rather than one pickle per worker;
+        # the segments are released once the pool is done, not kept until exit
+        with shared_frame_dicts(gold_by_tf, silver_by_tf, reference_daily) as (gold_shared, silver_shared, daily_shared):
+            with ProcessPoolExecutor(
+                max_workers=worker_count,
+                initializer=_init_symbol_worker,
+                initargs=(gold_shared, silver_shared, market_context, daily_shared),
+            ) as ex:
+                symbol_outputs = list(ex.map(process_symbol, symbols, *task_args))
+
+    for symbol, symbol_results, symbol_timing in symbol_outputs:
+        results[symbol] = symbol_results
+        timings['symbols'][symbol] = symbol_timing
 
     # Precious metals focus pairs: Gold/USD (GC=F), Silver/USD (SI=F) already scored above;
     # add Silver/Gold ratio as SI/GC for the same timeframes.
     if category_name == "precious_metals" and gold_df is not None and silver_df is not None:
         tfs = timeframes if timeframes else TIMEFRAMES
-        mctx = process_category._market_context if hasattr(process_category, "_market_context") else None
-        _score_silver_gold_into_results(results, gold_df, silver_df, tfs, category_name, mctx)
+        _score_silver_gold_into_results(results, gold_df, silver_df, tfs, category_name, market_context)
 
     # Write JSON
     output_file = RESULTS_DIR / f"{category_name}_results.json"
     json_start = time.time()
-    with open(output_file, "w") as f:
-        json.dump(results, f, indent=2, default=json_safe)
+    write_results_json(output_file, results)
     timings['json_write'] = time.time() - json_start
 
     total_time = time.time() - start_time
     
-    # Print summary
-    print(f"\n{'=' * 60}")
-    print(f"BENCHMARK SUMMARY - {category_name.upper()}")
-    print(f"{'=' * 60}")
-    print(f"Total execution time: {total_time:.2f}s ({total_time/60:.2f} minutes)")
-    print(f"\nBreakdown:")
-    print(f"  Gold download: {timings['gold_download']:.2f}s ({timings['gold_download']/total_time*100:.1f}%)")
-    
-    # Per-symbol breakdown
-    total_download = sum(t['download'] for t in timings['symbols'].values())
-    total_potential = sum(t['relative_potential'] for t in timings['symbols'].values())
-    total_indicators_usd = sum(
-        sum(tf['indicators_usd'] for tf in s['timeframes'].values())
-        for s in timings['symbols'].values()
-    )
-    total_indicators_gold = sum(
-        sum(tf.get('indicators_gold', 0) for tf in s['timeframes'].values())
-        for s in timings['symbols'].values()
-    )
-    total_gold_conv = sum(
-        sum(tf.get('gold_conversion', 0) for tf in s['timeframes'].values())
-        for s in timings['symbols'].values()
-    )
-    
-    print(f"  Data downloads: {total_download:.2f}s ({total_download/total_time*100:.1f}%)")
-    print(f"  Relative potential: {total_potential:.2f}s ({total_potential/total_time*100:.1f}%)")
-    print(f"  USD indicators: {total_indicators_usd:.2f}s ({total_indicators_usd/total_time*100:.1f}%)")
-    print(f"  Gold conversion: {total_gold_conv:.2f}s ({total_gold_conv/total_time*100:.1f}%)")
-    print(f"  Gold indicators: {total_indicators_gold:.2f}s ({total_indicators_gold/total_time*100:.1f}%)")
-    print(f"  JSON write: {timings['json_write']:.2f}s ({timings['json_write']/total_time*100:.1f}%)")
-    
-    # Slowest symbols
-    symbol_times = {
-        sym: sum([
-            t['download'],
-            t['relative_potential'],
-            sum(tf['indicators_usd'] + tf.get('indicators_gold', 0) for tf in t['timeframes'].values())
-        ])
-        for sym, t in timings['symbols'].items()
-    }
-    if symbol_times:
-        print(f"\nSlowest symbols (top 3):")
-        for sym, t in sorted(symbol_times.items(), key=lambda x: x[1], reverse=True)[:3]:
-            print(f"  {sym}: {t:.2f}s")
-    
-    print(f"\n✓ Saved results to {output_file}")
-    print(f"\nNote: Results use yFinance data with two calculation methods:")
-    print(f"      - ta_library: Standard technical analysis library")
-    print(f"      - tradingview_library: TradingView-style calculations")
+    if verbose:
+        print_benchmark_summary(category_name, timings, total_time, output_file)
     
     return results, timings
 
@@ -2247,6 +2824,12 @@ def main():
                        help='Process categories in batches of N (0 = all at once)')
     parser.add_argument('--batch-index', type=int, default=0,
                        help='Process batch number N (0-indexed, use with --batch-size)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Workers for per-symbol processing (default: one per CPU, 1 = serial)')
+    parser.add_argument('--executor', choices=SYMBOL_EXECUTORS, default='process',
+                       help='Per-symbol pool: process (CPU-bound scoring) or thread (download-bound runs)')
+    parser.add_argument('--bundle', action='store_true',
+                       help='Also write all processed categories to result_scores/all_results.json.gz')
     args = parser.parse_args()
     
     if args.refresh and (not args.category or args.category == "cryptocurrencies"):
@@ -2292,8 +2875,7 @@ def main():
         print("  Warning: Could not fetch gold prices. Gold-denominated analysis will be skipped.")
         gold_df = None
     else:
-        cache_file = get_cache_path("gold", "GC=F")
-        cache_status = " (cached)" if cache_file.exists() and not should_refresh_cache(cache_file, force_refresh=args.refresh) else ""
+        cache_status = " (cached)" if frame_is_fresh(gold_df, get_cache_path("gold", "GC=F"), args.refresh) else ""
         print(f"  ✓ Gold prices downloaded ({len(gold_df)} rows){cache_status} [{gold_download_time:.2f}s]")
     
     print("\nDownloading silver prices (SI=F) for silver-denominated analysis...")
@@ -2304,8 +2886,7 @@ def main():
         print("  Warning: Could not fetch silver prices. Silver-denominated analysis will be skipped.")
         silver_df = None
     else:
-        cache_file = get_cache_path("precious_metals", "SI=F")
-        cache_status = " (cached)" if cache_file.exists() and not should_refresh_cache(cache_file, force_refresh=args.refresh) else ""
+        cache_status = " (cached)" if frame_is_fresh(silver_df, get_cache_path("precious_metals", "SI=F"), args.refresh) else ""
         print(f"  ✓ Silver prices downloaded ({len(silver_df)} rows){cache_status} [{silver_download_time:.2f}s]")
     
     # Process categories (skip index-excluded niches unless --category targets one explicitly)
@@ -2368,7 +2949,7 @@ def main():
             print(f"Warning: Category '{category_name}' has no symbols. Skipping.")
             continue
         
-        results, timings = process_category(category_name, symbols, gold_df, silver_df, timeframes_to_use, args.calculate_potential, args.refresh)
+        results, timings = process_category(category_name, symbols, gold_df, silver_df, timeframes_to_use, args.calculate_potential, args.refresh, max_workers=args.workers, executor=args.executor)
         all_results[category_name] = results
         all_timings[category_name] = timings
         
@@ -2383,6 +2964,11 @@ def main():
         if remaining_cats > 0:
             print(f"   ETA: {eta_seconds/60:.1f} minutes ({remaining_cats} categories remaining)")
     
+    if args.bundle and all_results:
+        bundle_file = RESULTS_DIR / "all_results.json.gz"
+        write_results_bundle(bundle_file, all_results)
+        print(f"\n✓ Saved combined results to {bundle_file}")
+    
     overall_time = time.time() - overall_start
     
     # Overall summary
@@ -2396,6 +2982,7 @@ def main():
             if cat in all_timings:
                 cat_time = sum([
                     all_timings[cat]['gold_download'],
+                    all_timings[cat]['batch_download'],
                     sum(t['download'] + t['relative_potential'] + 
                         sum(sum(tf.values()) for tf in t['timeframes'].values())
                         for t in all_timings[cat]['symbols'].values()),
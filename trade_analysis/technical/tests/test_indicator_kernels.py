@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Tests for compiled indicator kernels against their pandas reference formulas."""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+TECH = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TECH / "indicators"))
+
+from kernels import (  # noqa: E402
+    _ema_bank_numpy, acc_dist_index, average_true_range, cci_last, divergence_code, divide_rows, ema_bank,
+    ewm_last, last_emas, macd_last, on_balance_volume, range_potential, true_range, wilder_rsi,
+)
+
+
+def _close(n: int, seed: int = 0) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, n))))
+
+
+class TestMacdLast(unittest.TestCase):
+    def _reference(self, close: pd.Series):
+        fast = close.ewm(span=12, min_periods=12, adjust=False).mean()
+        slow = close.ewm(span=26, min_periods=26, adjust=False).mean()
+        line = fast - slow
+        signal = line.ewm(span=9, min_periods=9, adjust=False).mean()
+        return line.iloc[-1], signal.iloc[-1], (line - signal).iloc[-1]
+
+    def test_matches_pandas_ewm(self):
+        close = _close(300)
+        got = macd_last(close.to_numpy())
+        for g, e in zip(got, self._reference(close)):
+            self.assertAlmostEqual(g, e, places=9)
+
+    def test_signal_nan_until_warmed_up(self):
+        close = _close(30)
+        line, signal, hist = macd_last(close.to_numpy())
+        self.assertFalse(np.isnan(line))
+        self.assertTrue(np.isnan(signal))
+        self.assertTrue(np.isnan(hist))
+
+    def test_too_short(self):
+        self.assertTrue(np.isnan(macd_last(_close(10).to_numpy())[0]))
+
+
+class TestEmaBank(unittest.TestCase):
+    def test_matches_pandas_ewm(self):
+        close = _close(200, seed=2)
+        periods = np.array([3.0, 15.0, 60.0])
+        got = ema_bank(close.to_numpy(), periods)
+        self.assertEqual(got.shape, (200, 3))
+        for j, p in enumerate(periods):
+            expected = close.ewm(span=p, adjust=False).mean().to_numpy()
+            np.testing.assert_allclose(got[:, j], expected, rtol=1e-12)
+
+    def test_numpy_fallback_matches_kernel(self):
+        close = _close(120, seed=3).to_numpy()
+        periods = np.array([3.0, 5.0, 8.0, 30.0, 60.0])
+        np.testing.assert_allclose(_ema_bank_numpy(close, periods), ema_bank(close, periods), rtol=1e-12)
+
+    def test_empty(self):
+        self.assertEqual(ema_bank(np.empty(0), np.array([3.0])).shape, (0, 1))
+        self.assertEqual(_ema_bank_numpy(np.empty(0), np.array([3.0])).shape, (0, 1))
+
+
+class TestEwmLast(unittest.TestCase):
+    def test_matches_pandas_ewm_exactly(self):
+        close = _close(300, seed=13)
+        close.iloc[[0, 40, 41, 250]] = np.nan
+        periods = np.array([50.0, 200.0, 3.0])
+        expected = [close.ewm(span=int(p), adjust=False).mean().iloc[-1] for p in periods]
+        np.testing.assert_array_equal(ewm_last(close.to_numpy(), periods), expected)
+
+    def test_all_nan_is_nan(self):
+        self.assertTrue(np.isnan(ewm_last(np.full(5, np.nan), np.array([3.0]))).all())
+
+
+class TestLastEmas(unittest.TestCase):
+    def test_matches_sma_seeded_ewm(self):
+        close = _close(150, seed=5)
+        periods = np.array([3.0, 15.0, 60.0])
+        got = last_emas(close.to_numpy(), periods)
+        for g, p in zip(got, periods):
+            p = int(p)
+            seeded = pd.concat([close.rolling(p, min_periods=p).mean()[:p], close[p:]])
+            self.assertAlmostEqual(g, seeded.ewm(span=p, adjust=False).mean().iloc[-1], places=9)
+
+    def test_short_lane_is_nan(self):
+        got = last_emas(_close(10).to_numpy(), np.array([3.0, 30.0]))
+        self.assertFalse(np.isnan(got[0]))
+        self.assertTrue(np.isnan(got[1]))
+
+
+class TestDivideRows(unittest.TestCase):
+    def test_matches_broadcast_division(self):
+        rng = np.random.default_rng(4)
+        values, divisor = rng.random((50, 4)) + 1, rng.random(50) + 1
+        np.testing.assert_array_equal(divide_rows(values, divisor), values / divisor[:, None])
+
+
+class TestDivergenceCode(unittest.TestCase):
+    # Peaks at bars 4 and 10, troughs at bars 7 and 13
+    PRICE = np.array([1, 2, 3, 4, 9, 4, 3, 1, 3, 4, 10, 4, 3, 2, 3, 4, 5, 6, 7, 8], dtype=np.float64)
+
+    def test_bearish_when_oscillator_peaks_lower(self):
+        osc = self.PRICE.copy()
+        osc[10] = 8.0
+        self.assertEqual(divergence_code(self.PRICE, osc), 1)
+
+    def test_bullish_when_oscillator_troughs_higher(self):
+        price = -self.PRICE
+        osc = price.copy()
+        osc[10] = -8.0
+        self.assertEqual(divergence_code(price, osc), -1)
+
+    def test_no_divergence_when_pivots_agree(self):
+        self.assertEqual(divergence_code(self.PRICE, self.PRICE), 0)
+        self.assertEqual(divergence_code(np.arange(20.0), np.arange(20.0)), 0)
+
+
+class TestTrueRange(unittest.TestCase):
+    def test_matches_concat_max(self):
+        close = _close(80, seed=8)
+        high, low = close * 1.015, close * 0.985
+        expected = pd.concat(
+            [high - low, (high - close.shift(1)).abs(), (low - close.shift(1)).abs()], axis=1
+        ).max(axis=1)
+        got = true_range(high.to_numpy(), low.to_numpy(), close.to_numpy())
+        self.assertEqual(got[0], high.iloc[0] - low.iloc[0])
+        np.testing.assert_array_equal(got, expected.to_numpy())
+
+
+class TestWilderRsi(unittest.TestCase):
+    def test_matches_ta_formula(self):
+        close = _close(200, seed=9).round(2)
+        diff = close.diff()
+        up = diff.where(diff > 0, 0.0).ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+        down = (-diff.where(diff < 0, 0.0)).ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+        expected = np.where(down == 0, 100, 100 - 100 / (1 + up / down))
+        np.testing.assert_allclose(wilder_rsi(close.to_numpy(), 14), expected, rtol=1e-12)
+
+    def test_no_losses_is_100(self):
+        got = wilder_rsi(np.arange(1.0, 21.0), 14)
+        self.assertTrue(np.isnan(got[12]))
+        self.assertEqual(got[-1], 100.0)
+
+
+class TestAverageTrueRange(unittest.TestCase):
+    def test_matches_ta_formula(self):
+        close = _close(100, seed=10)
+        high, low = close * 1.01, close * 0.99
+        tr = true_range(high.to_numpy(), low.to_numpy(), close.to_numpy())
+        expected = np.zeros(100)
+        expected[13] = tr[:14].mean()
+        for i in range(14, 100):
+            expected[i] = (expected[i - 1] * 13 + tr[i]) / 14.0
+        got = average_true_range(high.to_numpy(), low.to_numpy(), close.to_numpy(), 14)
+        np.testing.assert_allclose(got, expected, rtol=1e-12)
+
+    def test_short_input_is_zero(self):
+        flat = np.ones(5)
+        np.testing.assert_array_equal(average_true_range(flat, flat, flat, 14), np.zeros(5))
+
+
+class TestCciLast(unittest.TestCase):
+    def test_matches_rolling_formula(self):
+        close = _close(120, seed=11)
+        high, low = close * 1.02, close * 0.98
+        typical = (high + low + close) / 3.0
+        mad = typical.rolling(20).apply(lambda x: np.mean(np.abs(x - np.mean(x))), raw=True)
+        expected = ((typical - typical.rolling(20).mean()) / (0.015 * mad)).iloc[-1]
+        self.assertAlmostEqual(cci_last(high.to_numpy(), low.to_numpy(), close.to_numpy(), 20), expected, places=9)
+
+    def test_short_or_gapped_window_is_nan(self):
+        close = _close(30, seed=12).to_numpy()
+        self.assertTrue(np.isnan(cci_last(close[:10], close[:10], close[:10], 20)))
+        gapped = close.copy()
+        gapped[-3] = np.nan
+        self.assertTrue(np.isnan(cci_last(gapped, gapped, gapped, 20)))
+
+
+class TestVolumeIndicators(unittest.TestCase):
+    def setUp(self):
+        self.close = _close(60, seed=6).round(1)  # rounding leaves some unchanged closes
+        self.high, self.low = self.close * 1.02, self.close * 0.98
+        self.high.iloc[5] = self.low.iloc[5] = self.close.iloc[5]  # zero-range bar
+        self.volume = pd.Series(np.random.default_rng(7).integers(1, 1000, 60))
+
+    def test_obv_matches_ta_formula(self):
+        expected = pd.Series(np.where(self.close < self.close.shift(1), -self.volume, self.volume)).cumsum()
+        got = on_balance_volume(self.close.to_numpy(), self.volume.to_numpy())
+        self.assertEqual(got.dtype.kind, "i")
+        np.testing.assert_array_equal(got, expected.to_numpy())
+
+    def test_acc_dist_matches_ta_formula(self):
+        clv = ((self.close - self.low) - (self.high - self.close)) / (self.high - self.low)
+        expected = (clv.fillna(0.0) * self.volume).cumsum()
+        got = acc_dist_index(self.high.to_numpy(), self.low.to_numpy(), self.close.to_numpy(), self.volume.to_numpy())
+        np.testing.assert_allclose(got, expected.to_numpy(), rtol=1e-12)
+
+    def test_nan_volume_skipped_like_series_cumsum(self):
+        volume = np.array([1.0, np.nan, 2.0])
+        got = on_balance_volume(np.array([1.0, 2.0, 3.0]), volume)
+        np.testing.assert_array_equal(got, pd.Series(volume).cumsum().to_numpy())
+
+
+class TestRangePotential(unittest.TestCase):
+    def test_matches_tail_reductions(self):
+        close = _close(400, seed=1).to_numpy()
+        high, low = close * 1.01, close * 0.99
+        rh, rl, up, dn, pos = range_potential(high, low, close, 252)
+        self.assertEqual(rh, high[-252:].max())
+        self.assertEqual(rl, low[-252:].min())
+        self.assertAlmostEqual(up, (rh / close[-1] - 1) * 100)
+        self.assertAlmostEqual(dn, (close[-1] / rl - 1) * 100)
+        self.assertAlmostEqual(pos, (close[-1] - rl) / (rh - rl) * 100)
+
+    def test_flat_range_is_neutral(self):
+        flat = np.full(10, 5.0)
+        self.assertEqual(range_potential(flat, flat, flat, 10), (5.0, 5.0, 0.0, 0.0, 50.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
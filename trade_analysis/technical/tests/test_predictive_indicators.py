@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Tests for the fused predictive detector pass against the individual detectors."""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+TECH = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TECH / "indicators"))
+
+from predictive_indicators import (  # noqa: E402
+    PredictiveFeatures, detect_consolidation_base, detect_macd_divergence, detect_predictive_features,
+    detect_rsi_divergence, detect_volatility_compression, detect_volume_surge,
+)
+
+
+class TestDetectPredictiveFeatures(unittest.TestCase):
+    def _series(self, seed):
+        rng = np.random.default_rng(seed)
+        close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.004, 60))))
+        volume = pd.Series(rng.integers(100, 200, 60))
+        volume.iloc[-1] = 1000  # surge on the last bar
+        osc = pd.Series(rng.normal(50, 10, 60))
+        atr = pd.Series(np.linspace(2.0, 1.0, 60))
+        return close, volume, osc, atr
+
+    def test_matches_individual_detectors(self):
+        for seed in range(10):
+            close, volume, osc, atr = self._series(seed)
+            expected = PredictiveFeatures(
+                rsi_divergence=detect_rsi_divergence(close, osc),
+                macd_divergence=detect_macd_divergence(close, -osc),
+                volume_surge=detect_volume_surge(volume),
+                base_pattern=detect_consolidation_base(close),
+                volatility_compression=detect_volatility_compression(atr),
+            )
+            got = detect_predictive_features(close, rsi_values=osc, macd_line=-osc, volume=volume, atr_values=atr)
+            self.assertEqual(got, expected)
+        self.assertTrue(got.volume_surge)
+
+    def test_missing_inputs_detect_nothing(self):
+        close = self._series(0)[0]
+        got = detect_predictive_features(close)
+        self.assertIsNone(got.rsi_divergence)
+        self.assertFalse(got.volume_surge)
+        self.assertFalse(got.volatility_compression)
+        self.assertEqual(detect_predictive_features(close[:10]), PredictiveFeatures())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Tests for sharing OHLCV frames with worker processes via shared memory."""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+TECH = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TECH))
+
+import shared_frames  # noqa: E402
+from shared_frames import (  # noqa: E402
+    SharedFrameSpec, attach_frame, can_share, release_shared_frames, share_frame, shared_frame_dicts,
+)
+
+
+def _ohlcv(tz=None) -> pd.DataFrame:
+    idx = pd.date_range("2024-01-01", periods=6, freq="D", tz=tz, name="Date")
+    return pd.DataFrame(
+        {
+            "Open": np.linspace(1.0, 2.0, 6),
+            "Close": np.linspace(1.5, 2.5, 6),
+            "Volume": np.arange(6, dtype=np.int64) * 100,
+        },
+        index=idx,
+    )
+
+
+class TestSharedFrames(unittest.TestCase):
+    def test_round_trip_keeps_dtypes_and_tz(self):
+        df = _ohlcv(tz="America/New_York")
+        shared = attach_frame(share_frame(df))
+        pd.testing.assert_frame_equal(shared, df, check_freq=False)
+
+    def test_same_frame_is_shared_once(self):
+        df = _ohlcv()
+        self.assertEqual(share_frame(df).shm_name, share_frame(df).shm_name)
+
+    def test_release_only_given_specs(self):
+        kept, dropped = _ohlcv(), _ohlcv()
+        kept_spec, dropped_spec = share_frame(kept), share_frame(dropped)
+        release_shared_frames([dropped_spec])
+        self.assertIn(id(kept), shared_frames._OWNED)
+        self.assertNotIn(id(dropped), shared_frames._OWNED)
+        pd.testing.assert_frame_equal(attach_frame(kept_spec), kept, check_freq=False)
+        release_shared_frames([kept_spec])
+
+    def test_scoped_dicts_release_their_segments(self):
+        # process_category shares fresh gold/silver resamples per category; nothing may outlive the pool
+        release_shared_frames()
+        for _category in range(2):
+            gold_by_tf = {"1D": _ohlcv(), "1W": _ohlcv()}
+            with shared_frame_dicts(gold_by_tf, None, {"empty": pd.DataFrame()}) as (gold, silver, daily):
+                self.assertIsInstance(gold["1W"], SharedFrameSpec)
+                self.assertIsNone(silver)
+                self.assertTrue(daily["empty"].empty)
+                self.assertEqual(len(shared_frames._OWNED), 2)
+            self.assertEqual(shared_frames._OWNED, {})
+
+    def test_can_share(self):
+        self.assertTrue(can_share(_ohlcv()))
+        self.assertFalse(can_share(None))
+        self.assertFalse(can_share(pd.DataFrame()))
+        self.assertFalse(can_share(_ohlcv().reset_index(drop=True)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -37,16 +37,16 @@ def verify_scoring_components():
             "adx_strong_trend",
         ],
         "CCI": [
-            "CCIIndicator",
+            "cci_last",
             "cci_oversold_recovery",
             "cci_overbought",
         ],
         "OBV": [
-            "OnBalanceVolumeIndicator",
+            "on_balance_volume",
             "obv_trending_up",
         ],
         "A/D": [
-            "AccDistIndexIndicator",
+            "acc_dist_index",
             "acc_dist_trending_up",
         ],
         "MACD": [
@@ -109,9 +109,9 @@ def verify_imports():
     
     required_imports = [
         "ADXIndicator",
-        "CCIIndicator",
-        "OnBalanceVolumeIndicator",
-        "AccDistIndexIndicator",
+        "cci_last",
+        "on_balance_volume",
+        "acc_dist_index",
     ]
     
     all_passed = True